@@ -0,0 +1,419 @@
+"""
+Benchmark for the report pipeline on synthetic measurement folders.
+
+Generates one measurement folder per measurement type and strength test type (multi-page
+PDFs with the patient line and "4D average vom" text, UTF-16 INI files with values at the
+lines the report reads), builds a report for each with the batch mode of report_generator_v1
+and writes the stage timings from its run trace to a JSON results file.
+
+    python benchmark_reports.py --output results.json --repeat 3
+    python benchmark_reports.py --output new.json --compare results.json
+    python benchmark_reports.py --folders-only C:\\temp\\benchmark_folders
+
+Needs the same environment as the report generator (poppler, odfpy, Pillow, PyPDF2;
+LibreOffice only with --convert).
+"""
+import os
+import sys
+import json
+import platform
+import random
+import shutil
+import statistics
+import tempfile
+import time
+import zlib
+from datetime import datetime
+
+import report_generator_v1 as report
+
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+
+# Patient data written into the synthetic PDFs
+BENCHMARK_PATIENT = ("Max", "Mustermann", "01.02.1980")
+BENCHMARK_MEASUREMENT_DATE = "03.04.2024"
+
+# Values at the INI lines the report reads (see report.INI_FIELDS)
+BENCHMARK_INI_VALUES = {
+    "sva_axis": [55.2],
+    "beckenhochstand": [4.2],
+    "kyphosis_angle": [52.3],
+    "lordosis_angle": [41.0],
+    "surface_rotation_left": [-4.1],
+    "surface_rotation_right": [5.3],
+    "lateral_deviation_right": [3.2],
+    "lateral_deviation_left": [-2.7],
+    "scoliosis_angle": [8.5],
+}
+BENCHMARK_MOTION_VALUES = [3.1, -1.4, 7.6]
+
+# Answers for the batch mode; measurement and strength test type are set per case
+BENCHMARK_ANSWERS = {
+    'report_creator': "Benchmark",
+    'gender': "Female",
+    'academic_title': "Dr.",
+    'markers': ["ws"],
+    'sim_performed': "Ja",
+    'isg_right': "blockiert",
+    'isg_left': "Frei",
+    'leg_length_selected': "Ja",
+    'leg_length_texts': ["Beinlängendifferenz rechts 5 mm"],
+    'beinachsen_texts': ["Genu valgum beidseits"],
+    'ganganalyse_texts': ["Verkürzte Schrittlänge links"],
+    'therapie_texts': ["Einlagenversorgung", "Physiotherapie"],
+    'export_format': "ODT",
+}
+
+# PDFs with pedography heatmaps, which get a raster image on every page
+HEATMAP_PDFS = ("ios.pdf", "hp.pdf", "gehen.pdf")
+
+
+def benchmark_cases():
+    """Return the (measurement type, strength test type) pairs; IOS has no strength test"""
+    strength_test_types = report.BATCH_ANSWER_CHOICES['strength_test_type']
+    cases = [("IOS", None)]
+    for measurement_type in ("Statik", "Gehen", "Laufen"):
+        cases.extend((measurement_type, strength_test_type) for strength_test_type in strength_test_types)
+    return cases
+
+
+def layout_page_counts():
+    """Return {pdf name: pages} with the highest page any crop of the layout spec uses"""
+    page_counts = {}
+    for section in report.DEFAULT_SCREENSHOT_LAYOUT.values():
+        crop_lists = section['layouts'].values() if 'layouts' in section else [section['crops']]
+        for crops in crop_lists:
+            for crop in crops:
+                name = crop.get('pdf', section.get('pdf'))
+                if name == "4d average":
+                    name = "4d_average.pdf"
+                page_counts[name] = max(page_counts.get(name, 1), crop['page'])
+    return page_counts
+
+
+def pdf_text(x, y, size, text):
+    """Content stream operators for one line of Helvetica text"""
+    escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    return f"BT /F1 {size} Tf {x} {y} Td ({escaped}) Tj ET\n"
+
+
+def chart_content(rng):
+    """Content stream of a bar chart with grid lines and a curve, like the measurement charts"""
+    parts = ["0.8 0.8 0.8 RG 0.5 w\n"]
+    for i in range(11):
+        y = 200 + i * 40
+        parts.append(f"60 {y} m 540 {y} l S\n")
+    for i in range(12):
+        height = rng.uniform(40, 380)
+        red, green, blue = rng.random(), rng.random(), rng.random()
+        parts.append(f"{red:.2f} {green:.2f} {blue:.2f} rg {70 + i * 38} 200 28 {height:.1f} re f\n")
+    points = [(60 + i * 8, 400 + 120 * rng.uniform(-1, 1)) for i in range(61)]
+    parts.append("0 0 0.6 RG 1.5 w\n" + f"{points[0][0]} {points[0][1]:.1f} m\n")
+    parts.extend(f"{x} {y:.1f} l\n" for x, y in points[1:])
+    parts.append("S\n")
+    return "".join(parts)
+
+
+def heatmap_image(rng, width=240, height=180):
+    """Raw RGB pixels of a smooth, colourful heatmap (like a pedography pressure image)"""
+    from PIL import Image, ImageFilter
+
+    grid = Image.new('L', (width // 8, height // 8))
+    grid.putdata([rng.randint(0, 255) for _ in range(grid.width * grid.height)])
+    image = grid.resize((width, height), Image.BICUBIC).filter(ImageFilter.GaussianBlur(2))
+    palette = []
+    for value in range(256):
+        palette.extend((value, (value * 3) % 256, 255 - value))
+    image = image.convert('P')
+    image.putpalette(palette)
+    return image.convert('RGB').tobytes(), width, height
+
+
+def write_pdf(pdf_path, pages):
+    """
+    Write a minimal PDF. pages is a list of (content stream, image or None), where image is
+    (raw RGB bytes, width, height) drawn as /Im1 by the content stream.
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in below
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+    ]
+    page_ids = []
+    for content, image in pages:
+        resources = "/Font << /F1 3 0 R >>"
+        if image is not None:
+            pixels, width, height = image
+            data = zlib.compress(pixels)
+            objects.append(f"<< /Type /XObject /Subtype /Image /Width {width} /Height {height} "
+                           f"/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /FlateDecode "
+                           f"/Length {len(data)} >>\nstream\n".encode('latin-1') + data + b"\nendstream")
+            resources += f" /XObject << /Im1 {len(objects)} 0 R >>"
+        stream = content.encode('cp1252')
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode('latin-1') + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+                       f"/Resources << {resources} >> /Contents {content_id} 0 R >>".encode('latin-1'))
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode('latin-1')
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode('latin-1') + body + b"\nendobj\n"
+    xref = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode('latin-1')
+    output += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode('latin-1')
+    output += (f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+               .encode('latin-1'))
+    with open(pdf_path, 'wb') as f:
+        f.write(output)
+
+
+def synthetic_pdf(pdf_path, page_count, rng):
+    """Write a measurement PDF with the patient header on every page and a chart per page"""
+    first_name, last_name, dob = BENCHMARK_PATIENT
+    name = os.path.basename(pdf_path)
+    pages = []
+    for page in range(1, page_count + 1):
+        content = pdf_text(40, 800, 10, f"Name: {first_name} {last_name} (* {dob})")
+        content += pdf_text(40, 785, 10, f"4D average vom {BENCHMARK_MEASUREMENT_DATE}")
+        content += pdf_text(40, 760, 14, f"{name} - Seite {page}")
+        content += chart_content(rng)
+        image = None
+        if name in HEATMAP_PDFS:
+            image = heatmap_image(rng)
+            content += "q 240 0 0 180 300 560 cm /Im1 Do Q\n"
+        pages.append((content, image))
+    write_pdf(pdf_path, pages)
+
+
+def ini_number(value):
+    return f"{value:.2f}".replace('.', ',')
+
+
+def synthetic_ini(ini_path, kind, line_count=130):
+    """Write a UTF-16 INI file with the benchmark values at the lines of report.INI_FIELDS"""
+    values = BENCHMARK_INI_VALUES if kind == "4d average" else {
+        name: [value] for name, value in zip(("pelvic_drop_mean", "pelvic_drop_min", "pelvic_drop_max"),
+                                             BENCHMARK_MOTION_VALUES)}
+    lines = [[f"Parameter {number}", ini_number(number / 10), ini_number(number / 20)]
+             for number in range(1, line_count + 1)]
+    for name, line, column in report.INI_FIELDS[kind]:
+        row = lines[line - 1]
+        row[0] = name
+        while len(row) <= column:
+            row.append("")
+        row[column] = ini_number(values[name][0])
+    with open(ini_path, 'w', encoding='utf-16') as f:
+        f.write("\n".join("\t".join(row) for row in lines) + "\n")
+
+
+def create_measurement_folder(folder_path, measurement_type, seed=0):
+    """Create a synthetic measurement folder with every PDF and INI file the measurement type uses"""
+    os.makedirs(folder_path, exist_ok=True)
+    rng = random.Random(seed)
+    for name, page_count in sorted(layout_page_counts().items()):
+        synthetic_pdf(os.path.join(folder_path, name), page_count, rng)
+    _, last_name, _ = BENCHMARK_PATIENT
+    synthetic_ini(os.path.join(folder_path, f"{last_name} 4D average.ini"), "4d average")
+    if measurement_type in ["Gehen", "Laufen"]:
+        synthetic_ini(os.path.join(folder_path, f"{last_name} 4D motion.ini"), "4d motion")
+    return folder_path
+
+
+def case_name(measurement_type, strength_test_type):
+    return measurement_type if strength_test_type is None else f"{measurement_type} / {strength_test_type}"
+
+
+def reset_caches():
+    """Forget the in-process caches of the report module so every run starts cold"""
+    for name in ("_page_sizes", "_pdf_hashes", "_ini_records", "_folder_manifests"):
+        cache = getattr(report, name, None)
+        if cache is not None:
+            cache.clear()
+    report.close_pdf_documents()
+
+
+def use_benchmark_config(config_dir, screenshot_cache=False):
+    """
+    Point the report module at a copy of report_config.json with the settings a benchmark needs:
+    no screenshot cache (unless screenshot_cache), traces in config_dir, no configured or learned INI labels.
+    Returns the settings that were used.
+    """
+    config = report.load_config()
+    config.pop("ini_field_labels", None)
+    config["trace_enabled"] = True
+    config["trace_dir"] = os.path.join(config_dir, "traces")
+    config["chrome_trace"] = False
+    # Labels learned during the benchmark stay in config_dir
+    config["ini_labels_file"] = os.path.join(config_dir, "ini_labels.json")
+    if not screenshot_cache:
+        config["screenshot_cache_max_mb"] = 0
+    report.CONFIG_FILE_PATH = os.path.join(config_dir, "report_config.json")
+    report.save_config(config)
+    return config
+
+
+def run_case(folder_path, measurement_type, strength_test_type, convert=False):
+    """Build one report and return {'wall_s', 'stages_ms', 'odt_bytes', 'error'}"""
+    answers = dict(BENCHMARK_ANSWERS, measurement_type=measurement_type)
+    if strength_test_type is not None:
+        answers['strength_test_type'] = strength_test_type
+    if convert:
+        answers['export_format'] = "BOTH"
+    reset_caches()
+
+    start = time.perf_counter()
+    result = {'wall_s': None, 'stages_ms': {}, 'odt_bytes': None, 'error': None}
+    try:
+        odt_path, pdf_path, export_format, spans, targets = report.build_batch_report(folder_path, answers)
+        trace = report.RunTrace("benchmark")
+        trace.extend(spans)
+        if convert:
+            converter_pool = report.get_converter_pool()
+            if converter_pool is None:
+                raise RuntimeError("LibreOffice not found (needed for --convert)")
+            converter_pool.submit(odt_path, pdf_path, trace=trace).result()
+        result['odt_bytes'] = os.path.getsize(odt_path)
+        report.publish_report_files(targets)
+        result['wall_s'] = round(time.perf_counter() - start, 3)
+        result['stages_ms'] = trace.totals()
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    return result
+
+
+def median_result(runs):
+    """Combine repeated runs of a case into medians (failed runs are left out)"""
+    ok_runs = [run for run in runs if run['error'] is None]
+    if not ok_runs:
+        return {'runs': len(runs), 'error': runs[-1]['error']}
+    stages = sorted({stage for run in ok_runs for stage in run['stages_ms']})
+    return {
+        'runs': len(ok_runs),
+        'wall_s': round(statistics.median(run['wall_s'] for run in ok_runs), 3),
+        'stages_ms': {stage: round(statistics.median(run['stages_ms'].get(stage, 0) for run in ok_runs), 3)
+                      for stage in stages},
+        'odt_bytes': ok_runs[-1]['odt_bytes'],
+        'error': None if len(ok_runs) == len(runs) else f"{len(runs) - len(ok_runs)} runs failed",
+    }
+
+
+def environment_info():
+    versions = {}
+    for module_name in ("PIL", "odf", "pdf2image", "PyPDF2"):
+        try:
+            module = __import__(module_name)
+            versions[module_name] = getattr(module, "__version__", "unknown")
+        except ImportError:
+            versions[module_name] = None
+    try:
+        poppler = report.run_poppler("pdftoppm", ["-v"]).decode(errors='replace').strip() or "found"
+    except Exception as e:
+        poppler = f"not usable ({e})"
+    return {
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'modules': versions,
+        'poppler': poppler,
+    }
+
+
+def run_benchmark(work_dir, measurement_types=None, repeat=1, convert=False, screenshot_cache=False):
+    """Create the folders in work_dir, build every case repeat times and return the results dict"""
+    settings = use_benchmark_config(work_dir, screenshot_cache)
+    report.set_headless()
+    report.load_heavy_modules()
+
+    cases = [case for case in benchmark_cases() if not measurement_types or case[0] in measurement_types]
+    results = []
+    for number, (measurement_type, strength_test_type) in enumerate(cases, 1):
+        name = case_name(measurement_type, strength_test_type)
+        folder_path = os.path.join(work_dir, f"case_{number:02d}")
+        create_measurement_folder(folder_path, measurement_type, seed=number)
+        runs = []
+        for _ in range(repeat):
+            runs.append(run_case(folder_path, measurement_type, strength_test_type, convert))
+            print(f"{name}: {runs[-1]['wall_s']}s" if runs[-1]['error'] is None
+                  else f"{name}: FAILED {runs[-1]['error']}")
+        results.append(dict(median_result(runs), case=name))
+
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment_info(),
+        'settings': {key: settings.get(key) for key in ("render_mode", "image_encoding", "jpeg_quality",
+                                                        "output_dpi", "max_render_dpi", "screenshot_cache_max_mb")},
+        'repeat': repeat,
+        'convert': convert,
+        'cases': results,
+    }
+
+
+def compare_results(results, baseline):
+    """Print wall time and stage timings of results next to a baseline results file"""
+    baseline_cases = {case['case']: case for case in baseline['cases']}
+    for case in results['cases']:
+        old = baseline_cases.get(case['case'])
+        if old is None or case.get('error') or old.get('error'):
+            print(f"{case['case']}: not comparable")
+            continue
+        change = (case['wall_s'] - old['wall_s']) / old['wall_s'] * 100 if old['wall_s'] else 0
+        print(f"{case['case']}: {old['wall_s']:.2f}s -> {case['wall_s']:.2f}s ({change:+.0f}%)")
+        for stage in sorted(set(case['stages_ms']) | set(old['stages_ms'])):
+            old_ms = old['stages_ms'].get(stage, 0)
+            new_ms = case['stages_ms'].get(stage, 0)
+            print(f"    {stage:<16} {old_ms:9.1f} ms -> {new_ms:9.1f} ms")
+
+
+def main(argv):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the report pipeline on synthetic measurement folders")
+    parser.add_argument("--output", default="benchmark_results.json", help="results file (JSON)")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per case, the results are medians")
+    parser.add_argument("--types", default="", help="comma separated measurement types (default: all)")
+    parser.add_argument("--convert", action="store_true", help="also time the PDF conversion (needs LibreOffice)")
+    parser.add_argument("--cache", action="store_true", help="keep the screenshot cache enabled")
+    parser.add_argument("--work-dir", default=None, help="keep the folders and traces here instead of a temp folder")
+    parser.add_argument("--compare", default=None, help="results file of an earlier run to compare against")
+    parser.add_argument("--folders-only", metavar="DIR", default=None,
+                        help="only create the synthetic measurement folders in DIR")
+    args = parser.parse_args(argv)
+
+    measurement_types = [name.strip() for name in args.types.split(",") if name.strip()]
+    if args.folders_only:
+        for number, (measurement_type, strength_test_type) in enumerate(benchmark_cases(), 1):
+            if measurement_types and measurement_type not in measurement_types:
+                continue
+            folder_path = os.path.join(args.folders_only, f"case_{number:02d}")
+            create_measurement_folder(folder_path, measurement_type, seed=number)
+            print(f"{folder_path}: {case_name(measurement_type, strength_test_type)}")
+        return 0
+
+    work_dir = args.work_dir or tempfile.mkdtemp(prefix="ml_report_benchmark_")
+    os.makedirs(work_dir, exist_ok=True)
+    try:
+        results = run_benchmark(work_dir, measurement_types, max(1, args.repeat), args.convert, args.cache)
+    finally:
+        pool = report._converter_pool
+        if pool is not None:
+            pool.stop()
+        if not args.work_dir:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"Results written to {args.output}")
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare_results(results, json.load(f))
+    return 1 if any(case.get('error') for case in results['cases']) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -1,20 +1,31 @@
-import tkinter as tk
-from tkinter import filedialog, messagebox, simpledialog
 import os
 import subprocess
 import json
+import copy
+import math
+import multiprocessing
+import queue
 import re
-from odf.opendocument import OpenDocumentText
-from odf.draw import Frame, Image
-from odf.text import P, List, ListItem, PageNumber, Span
-from odf.table import Table, TableColumn, TableRow, TableCell
-from odf.style import Style, TableColumnProperties, ParagraphProperties, TextProperties, ListLevelProperties, PageLayout, PageLayoutProperties, MasterPage, Footer, FooterStyle, TabStops, TabStop, HeaderFooterProperties
-from odf.text import ListStyle, ListLevelStyleBullet
+import sys
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed, wait
+from contextlib import contextmanager
 from datetime import datetime
-from PIL import Image as PILImage, ImageTk
-from pdf2image import convert_from_path
 import tempfile
-import PyPDF2
+
+# odfpy, Pillow, pdf2image and PyPDF2 are imported inside the functions that use them,
+# so the main window appears before they are loaded (see load_heavy_modules)
+
+try:
+    import tkinter as tk
+    from tkinter import filedialog, messagebox, simpledialog
+except ImportError:
+    # The report pipeline works without Tk (batch mode, worker processes, Python builds without tkinter)
+    tk = filedialog = messagebox = simpledialog = None
+
+# Process start, for the time-to-first-window measurement
+_process_start = time.perf_counter()
 
 
 # Config file path for persistent settings
@@ -39,7 +50,414 @@ def save_config(config):
             json.dump(config, f, indent=2)
     except Exception as e:
         print(f"Error saving config: {e}")
-        messagebox.showerror("Config Error", f"Could not save configuration: {e}")
+        show_message("showerror", "Config Error", f"Could not save configuration: {e}")
+
+
+def get_setting(name, default=None):
+    """Return a single setting from report_config.json, or the default if it is not set"""
+    return load_config().get(name, default)
+
+
+
+# Modules only needed for creating reports and the coordinate finder
+HEAVY_MODULES = ["odf.opendocument", "PIL.Image", "pdf2image", "PyPDF2"]
+
+# Import durations in seconds of the modules in HEAVY_MODULES, filled by load_heavy_modules
+IMPORT_TIMINGS = {}
+
+
+def load_heavy_modules():
+    """
+    Import the modules in HEAVY_MODULES that are not loaded yet and record how long each took.
+    Returns True if anything was imported.
+    """
+    import importlib
+
+    imported = False
+    for name in HEAVY_MODULES:
+        if name in IMPORT_TIMINGS:
+            continue
+        start = time.perf_counter()
+        importlib.import_module(name)
+        IMPORT_TIMINGS[name] = time.perf_counter() - start
+        imported = True
+    return imported
+
+
+def record_startup_timings(event):
+    """
+    Print the time since process start and the import timings so far, and append them
+    as one JSON line to the file in the "startup_timing_log" setting (if set).
+    """
+    entry = {
+        'time': datetime.now().isoformat(timespec='seconds'),
+        'event': event,
+        'seconds_since_start': round(time.perf_counter() - _process_start, 3),
+        'frozen': bool(getattr(sys, 'frozen', False)),
+        'imports': {name: round(seconds, 3) for name, seconds in IMPORT_TIMINGS.items()},
+    }
+    print(f"Startup timing: {event} after {entry['seconds_since_start']:.2f}s, imports {entry['imports']}")
+    log_path = get_setting("startup_timing_log")
+    if log_path:
+        try:
+            with open(log_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+        except Exception as e:
+            print(f"Warning: Could not write startup timing log: {e}")
+
+
+# Timing spans of the report being created (see start_trace), None when nothing is traced
+_active_trace = None
+
+# Whether spans also record the memory of the process (setting "trace_memory", see start_trace)
+_trace_memory = True
+
+
+def process_memory():
+    """
+    Return (resident set size, peak resident set size) of this process in bytes.
+    Values that can not be read on this platform are None.
+    """
+    if sys.platform == "win32":
+        import ctypes
+        from ctypes import wintypes
+
+        class ProcessMemoryCounters(ctypes.Structure):
+            _fields_ = [("cb", wintypes.DWORD), ("PageFaultCount", wintypes.DWORD),
+                        ("PeakWorkingSetSize", ctypes.c_size_t), ("WorkingSetSize", ctypes.c_size_t),
+                        ("QuotaPeakPagedPoolUsage", ctypes.c_size_t), ("QuotaPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+                        ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+                        ("PagefileUsage", ctypes.c_size_t), ("PeakPagefileUsage", ctypes.c_size_t)]
+
+        try:
+            counters = ProcessMemoryCounters()
+            counters.cb = ctypes.sizeof(counters)
+            get_process = ctypes.windll.kernel32.GetCurrentProcess
+            get_process.restype = wintypes.HANDLE
+            get_info = ctypes.windll.psapi.GetProcessMemoryInfo
+            get_info.argtypes = [wintypes.HANDLE, ctypes.POINTER(ProcessMemoryCounters), wintypes.DWORD]
+            if get_info(get_process(), ctypes.byref(counters), counters.cb):
+                return counters.WorkingSetSize, counters.PeakWorkingSetSize
+        except Exception:
+            pass
+        return None, None
+
+    try:
+        # Linux: current and high-water resident size in kB
+        values = {}
+        with open("/proc/self/status", 'r') as f:
+            for line in f:
+                if line.startswith(("VmRSS:", "VmHWM:")):
+                    values[line.split(':')[0]] = int(line.split()[1]) * 1024
+        return values.get("VmRSS"), values.get("VmHWM")
+    except (OSError, ValueError):
+        pass
+    try:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and in kB elsewhere
+        return None, peak if sys.platform == "darwin" else peak * 1024
+    except Exception:
+        return None, None
+
+
+def memory_snapshot():
+    """Return the memory values recorded by spans: (rss, peak rss, traced Python bytes, traced Python peak)"""
+    import tracemalloc
+
+    rss, peak = process_memory()
+    if tracemalloc.is_tracing():
+        current, traced_peak = tracemalloc.get_traced_memory()
+        return rss, peak, current, traced_peak
+    return rss, peak, None, None
+
+
+def memory_args(start):
+    """
+    Span args for the memory at the end of a span started with memory_snapshot() start:
+    resident size, process high-water mark and how far the span raised it (in MB), plus the same
+    for Python allocations while tracemalloc runs. Image buffers of Pillow only show in the RSS values.
+    """
+    def mb(value):
+        return round(value / (1024 * 1024), 1)
+
+    rss, peak, current, traced_peak = memory_snapshot()
+    args = {}
+    if rss is not None:
+        args['rss_mb'] = mb(rss)
+    if peak is not None:
+        args['peak_rss_mb'] = mb(peak)
+        if start[1] is not None:
+            args['peak_rise_mb'] = mb(peak - start[1])
+    if current is not None and start[2] is not None:
+        args['py_mb'] = mb(current)
+        args['py_peak_rise_mb'] = mb(traced_peak - start[3])
+    return args
+
+
+class RunTrace:
+    """Timing spans of one report run, written as a JSON log (and optionally a Chrome trace).
+
+    Spans can be recorded from any thread. Worker processes record into their own RunTrace
+    and hand the spans back (see run_traced); span start times are wall clock microseconds,
+    so spans of all processes line up.
+    """
+    def __init__(self, name):
+        self.name = name
+        self.started = datetime.now().isoformat(timespec='seconds')
+        self.info = {}
+        self.spans = []
+        # Whether this trace started tracemalloc (and so stops it when it is finished)
+        self.started_tracemalloc = False
+        self._lock = threading.Lock()
+
+    def add(self, name, category, start_us, duration_ms, **args):
+        """Record a finished span"""
+        span = {
+            'name': name,
+            'category': category,
+            'start_us': start_us,
+            'duration_ms': round(duration_ms, 3),
+            'pid': os.getpid(),
+            'thread': threading.current_thread().name,
+            'args': args,
+        }
+        with self._lock:
+            self.spans.append(span)
+
+    def extend(self, spans):
+        """Add spans recorded by another process"""
+        with self._lock:
+            self.spans.extend(spans)
+
+    def totals(self):
+        """Return {category: total milliseconds} (nested spans are counted in each category)"""
+        totals = {}
+        for span in self.spans:
+            totals[span['category']] = round(totals.get(span['category'], 0) + span['duration_ms'], 3)
+        return totals
+
+    def memory_peaks(self):
+        """
+        Return {category: {"peak_rss_mb": highest process high-water mark at the end of its spans,
+        "raised_mb": how far its spans raised that mark in total}} for spans that recorded memory
+        """
+        peaks = {}
+        for span in self.spans:
+            if 'peak_rss_mb' not in span['args']:
+                continue
+            entry = peaks.setdefault(span['category'], {'peak_rss_mb': 0, 'raised_mb': 0})
+            entry['peak_rss_mb'] = max(entry['peak_rss_mb'], span['args']['peak_rss_mb'])
+            entry['raised_mb'] = round(entry['raised_mb'] + span['args'].get('peak_rise_mb', 0), 1)
+        return peaks
+
+    def to_dict(self):
+        return {
+            'name': self.name,
+            'started': self.started,
+            'info': self.info,
+            'totals_ms': self.totals(),
+            'memory': self.memory_peaks(),
+            'spans': sorted(self.spans, key=lambda span: span['start_us']),
+        }
+
+    def write(self, trace_dir=None):
+        """
+        Write the JSON log (and the Chrome trace if the "chrome_trace" setting is on) to trace_dir
+        (default: "trace_dir" setting, else a folder in the temp directory). Returns the log path.
+        The name ends in a random part, so traces written in the same second (e.g. of the folders
+        of a batch run) never replace each other.
+        """
+        import uuid
+
+        if trace_dir is None:
+            trace_dir = get_setting("trace_dir") or os.path.join(tempfile.gettempdir(), "ml_report_traces")
+        os.makedirs(trace_dir, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        log_path = os.path.join(trace_dir, f"{self.name}_{stamp}_{os.getpid()}_{uuid.uuid4().hex[:8]}.json")
+        with open(log_path, 'x', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=1, ensure_ascii=False)
+        if get_setting("chrome_trace", False):
+            export_chrome_trace(log_path)
+        return log_path
+
+
+def export_chrome_trace(log_path, chrome_path=None):
+    """
+    Convert a JSON log written by RunTrace.write into the Chrome trace event format
+    (open in chrome://tracing or ui.perfetto.dev). Returns the path of the trace file.
+    """
+    with open(log_path, 'r', encoding='utf-8') as f:
+        log = json.load(f)
+    if chrome_path is None:
+        chrome_path = os.path.splitext(log_path)[0] + ".chrome.json"
+    thread_ids = {}
+    events = []
+    for span in log['spans']:
+        tid = thread_ids.setdefault((span['pid'], span['thread']), len(thread_ids) + 1)
+        events.append({
+            'name': span['name'],
+            'cat': span['category'],
+            'ph': 'X',
+            'ts': span['start_us'],
+            'dur': round(span['duration_ms'] * 1000),
+            'pid': span['pid'],
+            'tid': tid,
+            'args': span['args'],
+        })
+    for (pid, thread), tid in thread_ids.items():
+        events.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': thread}})
+    with open(chrome_path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'otherData': {'report': log['name'], 'started': log['started']}}, f)
+    return chrome_path
+
+
+def configure_trace_memory():
+    """
+    Apply the memory settings of traces: "trace_memory" (default true) records the RSS values in every
+    span, "trace_python_memory" (default false, it slows down allocations) also starts tracemalloc.
+    Returns True if tracemalloc was started here (it was not already tracing, e.g. for a caller).
+    """
+    global _trace_memory
+    import tracemalloc
+
+    _trace_memory = bool(get_setting("trace_memory", True))
+    if _trace_memory and get_setting("trace_python_memory", False) and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        return True
+    return False
+
+
+def start_trace(name="report"):
+    """Start tracing a report run (unless the "trace_enabled" setting is off); returns the RunTrace or None"""
+    global _active_trace
+    _active_trace = RunTrace(name) if get_setting("trace_enabled", True) else None
+    if _active_trace is not None:
+        _active_trace.started_tracemalloc = configure_trace_memory()
+    return _active_trace
+
+
+def finish_trace(trace, write=True):
+    """Stop tracing and write the log of the trace from start_trace; returns the log path (None if not written)"""
+    global _active_trace
+    import tracemalloc
+
+    if _active_trace is trace:
+        _active_trace = None
+    # tracemalloc started by someone else (e.g. a benchmark harness) keeps running
+    if trace is not None and trace.started_tracemalloc:
+        trace.started_tracemalloc = False
+        tracemalloc.stop()
+    if trace is None or not trace.spans or not write:
+        return None
+    try:
+        log_path = trace.write()
+    except Exception as e:
+        print(f"Warning: Could not write the timing log: {e}")
+        return None
+    totals = ", ".join(f"{category} {ms / 1000:.2f}s" for category, ms in sorted(trace.totals().items()))
+    print(f"Timing log: {log_path} ({totals})")
+    peaks = trace.memory_peaks()
+    if peaks:
+        highest = max(peaks.items(), key=lambda item: (item[1]['raised_mb'], item[1]['peak_rss_mb']))
+        print(f"Peak memory: {max(entry['peak_rss_mb'] for entry in peaks.values()):.0f} MB "
+              f"(raised most by {highest[0]}: {highest[1]['raised_mb']:.0f} MB)")
+    return log_path
+
+
+@contextmanager
+def trace_span(name, category, **args):
+    """
+    Time a pipeline stage into the active trace. The yielded dict takes values found
+    during the stage (bytes, pixels, ...); without an active trace this costs nothing.
+    """
+    trace = _active_trace
+    if trace is None:
+        yield args
+        return
+    start_memory = memory_snapshot() if _trace_memory else None
+    start_us = time.time_ns() // 1000
+    start = time.perf_counter()
+    try:
+        yield args
+    except BaseException as e:
+        args['error'] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        if start_memory is not None:
+            args.update(memory_args(start_memory))
+        trace.add(name, category, start_us, duration_ms, **args)
+
+
+class TraceSections:
+    """Consecutive spans for the parts of a long function (e.g. the sections of create_report)"""
+    def __init__(self, category):
+        self.category = category
+        self._current = None
+
+    def start(self, name):
+        """End the current section and start the next one"""
+        self.finish()
+        if _active_trace is not None:
+            start_memory = memory_snapshot() if _trace_memory else None
+            self._current = (name, time.time_ns() // 1000, time.perf_counter(), start_memory)
+
+    def finish(self):
+        if self._current is not None and _active_trace is not None:
+            name, start_us, start, start_memory = self._current
+            duration_ms = (time.perf_counter() - start) * 1000
+            args = memory_args(start_memory) if start_memory is not None else {}
+            _active_trace.add(name, self.category, start_us, duration_ms, **args)
+        self._current = None
+
+
+def run_traced(function, *args):
+    """
+    Run function(*args) in a worker process under its own trace.
+    Returns (result, spans) so the parent can add the spans to its trace.
+    """
+    global _active_trace
+    _active_trace = RunTrace(function.__name__)
+    started_tracemalloc = configure_trace_memory()
+    try:
+        return function(*args), _active_trace.spans
+    finally:
+        import tracemalloc
+
+        _active_trace = None
+        if started_tracemalloc:
+            tracemalloc.stop()
+
+
+# Messages from worker threads, shown by the Tk main thread (see ProgressDialog)
+_worker_messages = queue.Queue()
+
+# Set in batch mode (and its worker processes), where messages are only printed
+_headless = False
+
+
+def set_headless(headless=True):
+    """Switch show_message to printing only, for runs without a Tk window"""
+    global _headless
+    _headless = headless
+
+
+def show_message(kind, title, message):
+    """
+    Show a messagebox of the given kind ("showinfo", "showwarning" or "showerror").
+    Tk may only be used from the main thread, so calls from worker threads are queued instead.
+    In headless mode (or without tkinter) the message is only printed.
+    """
+    if _headless or messagebox is None:
+        print(f"{title}: {message}")
+    elif threading.current_thread() is threading.main_thread():
+        getattr(messagebox, kind)(title, message)
+    else:
+        print(f"{title}: {message}")
+        _worker_messages.put((kind, title, message))
 
 
 def find_libreoffice():
@@ -80,627 +498,2715 @@ def find_libreoffice():
 
 
 
-def crop_pdf_screenshot(pdf_path):
+class ReportCancelled(Exception):
+    """Raised in a report build when the user pressed Cancel"""
+
+
+def convert_odt_to_pdf(odt_path, pdf_path, cancel_event=None):
+    """
+    Convert an ODT file to PDF with headless LibreOffice, on the next free converter of the pool.
+    The conversion is killed when cancel_event is set (raises ReportCancelled).
+    """
+    converter_pool = get_converter_pool()
+    if converter_pool is None:
+        raise FileNotFoundError(
+            "LibreOffice not found. Please install LibreOffice from https://www.libreoffice.org/download/download/"
+        )
+    converter_pool.convert(odt_path, pdf_path, cancel_event)
+
+
+def run_soffice_conversion(libreoffice_path, odt_path, pdf_path, profile_dir=None, cancel_event=None):
     """
-    Convert first page of PDF to high-quality image and crop using hardcoded coordinates.
-    Returns path to temporary cropped image file.
+    One-shot conversion: start soffice --convert-to pdf for a single file.
+    With profile_dir the process gets its own user profile, so several conversions can run at once.
+    The process is killed when cancel_event is set (raises ReportCancelled).
     """
+    import pathlib
+
+    command = [libreoffice_path, "--headless", "--convert-to", "pdf",
+               "--outdir", os.path.dirname(pdf_path) or ".", odt_path]
+    if profile_dir:
+        command.insert(1, f"-env:UserInstallation={pathlib.Path(profile_dir).as_uri()}")
+
+    # Use LibreOffice to convert ODT to PDF
+    process = subprocess.Popen(command)
+    while True:
+        try:
+            returncode = process.wait(timeout=0.2)
+            break
+        except subprocess.TimeoutExpired:
+            if cancel_event is not None and cancel_event.is_set():
+                process.kill()
+                process.wait()
+                raise ReportCancelled()
+    if returncode != 0:
+        raise subprocess.CalledProcessError(returncode, process.args)
+
+    # Rename if needed (LibreOffice uses original filename)
+    converted_pdf = os.path.join(
+        os.path.dirname(pdf_path) or ".",
+        os.path.basename(odt_path).replace(".odt", ".pdf")
+    )
+    if converted_pdf != pdf_path and os.path.exists(converted_pdf):
+        os.rename(converted_pdf, pdf_path)
+
+
+# UNO client run with LibreOffice's own Python (see find_libreoffice_python) when "uno" can not be
+# imported here, e.g. in the packaged EXE: python -c UNO_CONVERT_SCRIPT port odt_path pdf_path timeout
+UNO_CONVERT_SCRIPT = """
+import os, sys, time
+import uno
+from com.sun.star.beans import PropertyValue
+
+def properties(**values):
+    result = []
+    for name, value in values.items():
+        prop = PropertyValue()
+        prop.Name, prop.Value = name, value
+        result.append(prop)
+    return tuple(result)
+
+port, odt_path, pdf_path, timeout = sys.argv[1], sys.argv[2], sys.argv[3], float(sys.argv[4])
+local_context = uno.getComponentContext()
+resolver = local_context.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local_context)
+deadline = time.time() + timeout
+while True:
     try:
-        # Hardcoded crop coordinates as percentages
-        LEFT_PCT = 1.14
-        TOP_PCT = 24.58
-        RIGHT_PCT = 56.98
-        BOTTOM_PCT = 85.74
-
-        # Convert first page at 300 DPI for high quality
-        print("Converting PDF to high-quality image (300 DPI)...")
-        images = convert_from_path(pdf_path, dpi=300, first_page=1, last_page=1)
-        if not images:
-            return None
+        context = resolver.resolve(f"uno:socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext")
+        break
+    except Exception:
+        if time.time() > deadline:
+            sys.exit("LibreOffice server did not accept connections")
+        time.sleep(0.2)
+desktop = context.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", context)
+document = desktop.loadComponentFromURL(uno.systemPathToFileUrl(os.path.abspath(odt_path)), "_blank", 0,
+                                        properties(Hidden=True))
+try:
+    document.storeToURL(uno.systemPathToFileUrl(os.path.abspath(pdf_path)),
+                        properties(FilterName="writer_pdf_Export"))
+finally:
+    document.close(True)
+"""
 
-        image = images[0]
-        img_width, img_height = image.size
-        print(f"Full image size: {img_width}x{img_height} pixels at 300 DPI")
 
-        # Calculate crop coordinates from percentages
-        left = int((LEFT_PCT / 100) * img_width)
-        top = int((TOP_PCT / 100) * img_height)
-        right = int((RIGHT_PCT / 100) * img_width)
-        bottom = int((BOTTOM_PCT / 100) * img_height)
+def find_libreoffice_python(libreoffice_path):
+    """
+    Return the Python interpreter bundled with LibreOffice (program/python.exe on Windows), which
+    has the UNO bridge, or None if the installation has none (e.g. Linux packages use the system Python)
+    """
+    import shutil
 
-        print(f"Cropping to: ({left}, {top}, {right}, {bottom})")
+    soffice = shutil.which(libreoffice_path) or libreoffice_path
+    program_dir = os.path.dirname(os.path.realpath(soffice))
+    for name in ("python.exe", "python", "python3"):
+        candidate = os.path.join(program_dir, name)
+        if os.path.isfile(candidate):
+            return candidate
+    return None
 
-        # Crop the image
-        cropped_image = image.crop((left, top, right, bottom))
-        crop_width, crop_height = cropped_image.size
-        print(f"Cropped image size: {crop_width}x{crop_height} pixels")
 
-        # Save to temporary file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-        cropped_image.save(temp_file.name, 'PNG', quality=95)
-        print(f"Saved cropped image to: {temp_file.name}")
+class LibreOfficeServer:
+    """One headless LibreOffice instance kept running for PDF conversions.
 
-        return temp_file.name
+    soffice listens on a local socket and documents are converted through UNO, so the
+    startup and profile load are paid once instead of for every report. The instance uses
+    its own user profile (so an open LibreOffice window is not affected) and is restarted
+    automatically if it has died. Needs the LibreOffice Python bridge ("uno"): in this process
+    if it can be imported, else through LibreOffice's own Python (uno_python) running
+    UNO_CONVERT_SCRIPT for each conversion.
 
-    except Exception as e:
-        print(f"Error cropping PDF screenshot: {e}")
-        import traceback
-        traceback.print_exc()
-        return None
+    If the port is already taken (e.g. by a LibreOffice the user started with --accept), the
+    instance listens on a free port instead, so conversions never go to a process it did not start.
+    """
+    CONNECT_TIMEOUT = 30
+
+    def __init__(self, libreoffice_path, port=2002, uno_python=None):
+        self.libreoffice_path = libreoffice_path
+        self.port = port
+        self.uno_python = uno_python
+        self.profile_dir = os.path.join(tempfile.gettempdir(), f"motionlab_libreoffice_{port}")
+        self._process = None
+        self._desktop = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _free_port(port):
+        """Return port if nothing listens on it on 127.0.0.1, else a free port picked by the system"""
+        import socket
+
+        for candidate in (port, 0):
+            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+                try:
+                    probe.bind(("127.0.0.1", candidate))
+                except OSError:
+                    continue
+                return probe.getsockname()[1]
+        return port
+
+    def start(self):
+        """Start the soffice process if it is not running (returns immediately)"""
+        import pathlib
+
+        with self._lock:
+            if self._process is not None and self._process.poll() is None:
+                return
+            port = self._free_port(self.port)
+            if port != self.port:
+                print(f"Port {self.port} is in use, using port {port} for the LibreOffice server")
+                self.port = port
+            print(f"Starting LibreOffice server on port {self.port}...")
+            self._desktop = None
+            self._process = subprocess.Popen([
+                self.libreoffice_path, "--headless", "--invisible", "--nologo", "--norestore",
+                f"-env:UserInstallation={pathlib.Path(self.profile_dir).as_uri()}",
+                f"--accept=socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext"
+            ])
+
+    def stop(self):
+        """Shut the soffice process down (killed right away if it was never connected to)"""
+        with self._lock:
+            connected = self._desktop is not None
+            if connected:
+                try:
+                    self._desktop.terminate()
+                except Exception:
+                    pass
+                self._desktop = None
+            if self._process is not None and self._process.poll() is None:
+                if connected:
+                    try:
+                        self._process.wait(timeout=5)
+                    except subprocess.TimeoutExpired:
+                        pass
+                if self._process.poll() is None:
+                    # Never connected (e.g. still starting up) or did not quit in time
+                    self._process.kill()
+                    self._process.wait()
+            self._process = None
+
+    def _connect(self):
+        """Return the UNO desktop of the running instance, waiting until it accepts connections"""
+        import uno
+
+        if self._desktop is not None:
+            return self._desktop
+
+        local_context = uno.getComponentContext()
+        resolver = local_context.ServiceManager.createInstanceWithContext(
+            "com.sun.star.bridge.UnoUrlResolver", local_context)
+        deadline = time.time() + self.CONNECT_TIMEOUT
+        while True:
+            try:
+                context = resolver.resolve(
+                    f"uno:socket,host=127.0.0.1,port={self.port};urp;StarOffice.ComponentContext")
+                break
+            except Exception:
+                if self._process.poll() is not None:
+                    raise RuntimeError("LibreOffice server exited during startup")
+                if time.time() > deadline:
+                    raise RuntimeError("LibreOffice server did not accept connections")
+                time.sleep(0.2)
+        self._desktop = context.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", context)
+        return self._desktop
+
+    @staticmethod
+    def _properties(**values):
+        import uno
+
+        properties = []
+        for name, value in values.items():
+            prop = uno.createUnoStruct("com.sun.star.beans.PropertyValue")
+            prop.Name = name
+            prop.Value = value
+            properties.append(prop)
+        return tuple(properties)
+
+    def _convert_external(self, odt_path, pdf_path):
+        """Convert through LibreOffice's own Python, for when "uno" can not be imported here"""
+        import platform
+
+        startupinfo = None
+        if platform.system() == "Windows":
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+        result = subprocess.run([self.uno_python, "-c", UNO_CONVERT_SCRIPT, str(self.port),
+                                 os.path.abspath(odt_path), os.path.abspath(pdf_path), str(self.CONNECT_TIMEOUT)],
+                                stdout=subprocess.PIPE, stderr=subprocess.PIPE, startupinfo=startupinfo)
+        if result.returncode != 0:
+            message = result.stderr.decode(errors='replace').strip().splitlines()
+            raise RuntimeError(f"UNO conversion failed: {message[-1] if message else result.returncode}")
+
+    def _convert_once(self, odt_path, pdf_path):
+        self.start()
+        if self.uno_python:
+            with self._lock:
+                self._convert_external(odt_path, pdf_path)
+            return
 
+        import uno
+
+        with self._lock:
+            desktop = self._connect()
+            document = desktop.loadComponentFromURL(uno.systemPathToFileUrl(os.path.abspath(odt_path)),
+                                                    "_blank", 0, self._properties(Hidden=True))
+            try:
+                document.storeToURL(uno.systemPathToFileUrl(os.path.abspath(pdf_path)),
+                                    self._properties(FilterName="writer_pdf_Export"))
+            finally:
+                document.close(True)
+
+    def convert(self, odt_path, pdf_path, cancel_event=None):
+        """
+        Convert an ODT file to PDF, restarting the instance once if it has died.
+        If cancel_event is set the instance is killed (it is restarted for the next conversion).
+        """
+        done = threading.Event()
+
+        def kill_on_cancel():
+            while not done.is_set():
+                if cancel_event.wait(0.2):
+                    process = self._process
+                    if process is not None:
+                        process.kill()
+                    return
 
-def crop_vgl_screenshot(pdf_path):
+        if cancel_event is not None:
+            threading.Thread(target=kill_on_cancel, daemon=True).start()
+        try:
+            try:
+                self._convert_once(odt_path, pdf_path)
+            except Exception:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ReportCancelled()
+                if self._process is not None and self._process.poll() is None:
+                    raise
+                print("LibreOffice server has died, restarting it")
+                self._desktop = None
+                self._convert_once(odt_path, pdf_path)
+        finally:
+            done.set()
+        if cancel_event is not None and cancel_event.is_set():
+            raise ReportCancelled()
+
+
+class ConverterPool:
+    """Pool of LibreOffice converters so several ODT->PDF conversions can run at the same time.
+
+    Two soffice processes sharing a user profile block each other, so every converter
+    is a LibreOfficeServer with its own profile and port. Conversions wait in a queue
+    for the next free converter. Without the UNO bridge (use_server=False) every
+    conversion is a one-shot soffice call, still with the converter's own profile.
     """
-    Crop screenshot from vgl.pdf (leg length examination) using hardcoded coordinates.
-    Returns path to temporary cropped image file.
+    def __init__(self, libreoffice_path, size=1, base_port=2002, use_server=True, uno_python=None):
+        self.libreoffice_path = libreoffice_path
+        self.use_server = use_server
+        self.converters = [LibreOfficeServer(libreoffice_path, base_port + i, uno_python) for i in range(size)]
+        self._idle = queue.Queue()
+        for converter in self.converters:
+            self._idle.put(converter)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start all converter instances in the background"""
+        if self.use_server:
+            for converter in self.converters:
+                converter.start()
+
+    def stop(self):
+        """Shut all converter instances down"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+        for converter in self.converters:
+            converter.stop()
+
+    def convert(self, odt_path, pdf_path, cancel_event=None):
+        """Convert an ODT file to PDF on the next free converter, waiting for one if all are busy"""
+        while True:
+            try:
+                converter = self._idle.get(timeout=0.2)
+                break
+            except queue.Empty:
+                if cancel_event is not None and cancel_event.is_set():
+                    raise ReportCancelled()
+
+        try:
+            if self.use_server:
+                try:
+                    converter.convert(odt_path, pdf_path, cancel_event)
+                    return
+                except ReportCancelled:
+                    raise
+                except Exception as e:
+                    print(f"Warning: LibreOffice server conversion failed ({e}), using one-shot conversion")
+            # Separate profile from the converter's server, which may still be running
+            run_soffice_conversion(self.libreoffice_path, odt_path, pdf_path,
+                                   converter.profile_dir + "_oneshot", cancel_event)
+        finally:
+            self._idle.put(converter)
+
+    def submit(self, odt_path, pdf_path, cancel_event=None, trace=None):
+        """
+        Queue a conversion and return a Future; up to pool size conversions run in parallel.
+        The conversion is timed into trace (a RunTrace) if one is given.
+        """
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=len(self.converters))
+            if trace is None:
+                return self._executor.submit(self.convert, odt_path, pdf_path, cancel_event)
+            return self._executor.submit(self._convert_traced, trace, odt_path, pdf_path, cancel_event)
+
+    def _convert_traced(self, trace, odt_path, pdf_path, cancel_event):
+        start_us = time.time_ns() // 1000
+        start = time.perf_counter()
+        self.convert(odt_path, pdf_path, cancel_event)
+        trace.add("pdf conversion", "conversion", start_us, (time.perf_counter() - start) * 1000,
+                  odt_bytes=os.path.getsize(odt_path), bytes=os.path.getsize(pdf_path))
+
+
+_converter_pool = None
+_converter_pool_lock = threading.Lock()
+
+
+def get_converter_pool():
     """
-    try:
-        # Hardcoded crop coordinates as percentages (from user's coordinate finder)
-        LEFT_PCT = 2.17
-        TOP_PCT = 15.55
-        RIGHT_PCT = 59.09
-        BOTTOM_PCT = 90.09
-
-        # Convert first page at 300 DPI for high quality
-        print("Converting vgl.pdf to high-quality image (300 DPI)...")
-        images = convert_from_path(pdf_path, dpi=300, first_page=1, last_page=1)
-        if not images:
-            return None
+    Return the shared ConverterPool, or None if LibreOffice is not installed.
+    Settings in report_config.json: "converter_pool_size" (default 1), "libreoffice_port" (first
+    of the consecutive ports used by the pool, default 2002) and "libreoffice_server" (false
+    for one-shot conversions only). The server needs the Python UNO bridge, here or in the Python
+    bundled with LibreOffice; without either every conversion is a one-shot soffice run (with a warning).
+    """
+    global _converter_pool
+
+    with _converter_pool_lock:
+        if _converter_pool is None:
+            libreoffice_path = find_libreoffice()
+            if libreoffice_path is None:
+                return None
+            use_server = bool(get_setting("libreoffice_server", True))
+            uno_python = None
+            if use_server:
+                import importlib.util
+
+                # The UNO bridge is not in the packaged EXE or a plain Python, LibreOffice brings its own
+                if importlib.util.find_spec("uno") is None:
+                    uno_python = find_libreoffice_python(libreoffice_path)
+                    if uno_python is None:
+                        use_server = False
+                        print("Warning: The LibreOffice Python bridge (uno) was not found, every PDF conversion "
+                              "starts LibreOffice on its own (slower)")
+            import atexit
+
+            _converter_pool = ConverterPool(libreoffice_path, max(1, int(get_setting("converter_pool_size", 1))),
+                                            int(get_setting("libreoffice_port", 2002)), use_server, uno_python)
+            atexit.register(_converter_pool.stop)
+        return _converter_pool
+
+
+# Render resolution used for all screenshot crops
+RENDER_DPI = 300
+
+# Render modes: "page" rasterizes full pages once and crops them, "region" asks poppler for the crop rectangle only
+RENDER_MODES = ("page", "region")
+
+
+def run_poppler(command, args):
+    """Run a poppler command line tool and return its stdout (without a console window on Windows)"""
+    import platform
 
-        image = images[0]
-        img_width, img_height = image.size
-        print(f"Full image size: {img_width}x{img_height} pixels at 300 DPI")
+    startupinfo = None
+    if platform.system() == "Windows":
+        startupinfo = subprocess.STARTUPINFO()
+        startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
 
-        # Calculate crop coordinates from percentages
-        left = int((LEFT_PCT / 100) * img_width)
-        top = int((TOP_PCT / 100) * img_height)
-        right = int((RIGHT_PCT / 100) * img_width)
-        bottom = int((BOTTOM_PCT / 100) * img_height)
+    result = subprocess.run([command] + args, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                            startupinfo=startupinfo, check=True)
+    return result.stdout
 
-        print(f"Cropping vgl.pdf to: ({left}, {top}, {right}, {bottom})")
 
-        # Crop the image
-        cropped_image = image.crop((left, top, right, bottom))
-        crop_width, crop_height = cropped_image.size
-        print(f"Cropped vgl image size: {crop_width}x{crop_height} pixels")
+# PDF backends: "pdfium" parses each PDF once with pypdfium2 for page counts, sizes, text and rendering,
+# "poppler" (default) reads page counts, sizes and text with PyPDF2 and renders with pdftoppm; "auto" uses
+# pdfium when it is installed. pdfium is opt-in until its renderings are checked pixel for pixel against pdftoppm
+PDF_BACKENDS = ("auto", "pdfium", "poppler")
 
-        # Save to temporary file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-        cropped_image.save(temp_file.name, 'PNG', quality=95)
-        print(f"Saved cropped vgl image to: {temp_file.name}")
 
-        return temp_file.name
+# Whether pypdfium2 can be imported, None until get_pdf_backend checked it
+_pdfium_available = None
 
-    except Exception as e:
-        print(f"Error cropping vgl.pdf screenshot: {e}")
-        import traceback
-        traceback.print_exc()
-        return None
+
+def get_pdf_backend():
+    """Return the PDF backend in use: "pdfium" or "poppler" (setting "pdf_backend", default "poppler")"""
+    backend = get_setting("pdf_backend", "poppler")
+    if backend not in PDF_BACKENDS:
+        print(f"Warning: Unknown PDF backend '{backend}', using 'poppler'")
+        backend = "poppler"
+    if backend == "poppler":
+        return "poppler"
+    global _pdfium_available
+    if _pdfium_available is None:
+        import importlib.util
+
+        _pdfium_available = importlib.util.find_spec("pypdfium2") is not None
+    if not _pdfium_available:
+        if backend == "pdfium":
+            print("Warning: pypdfium2 is not installed, using poppler")
+        return "poppler"
+    return "pdfium"
+
+
+# pdfium is not thread-safe, not even for calls on different documents, so every call into it
+# holds this one lock: with the pdfium backend, threads (e.g. the preflight checks) read their
+# PDFs one after the other. Worker processes each have their own pdfium and lock.
+_pdfium_lock = threading.RLock()
 
 
-def crop_statik_screenshots(pdf_path):
+class PdfDocument:
+    """A PDF parsed once for a report run (see get_pdf_document).
+
+    With the pdfium backend the same parsed document serves page count, page sizes, text and
+    page renders; with poppler a PyPDF2 reader serves everything but rendering (pdftoppm).
     """
-    Crop all 7 screenshots from statik.pdf using hardcoded coordinates.
-    Returns list of paths to temporary cropped image files.
+    def __init__(self, path, backend):
+        self.path = path
+        self.backend = backend
+        stat = os.stat(path)
+        self.size, self.mtime_ns = stat.st_size, stat.st_mtime_ns
+        self._file = None
+        with trace_span("open pdf", "pdf parse", pdf=os.path.basename(path), backend=backend, bytes=self.size):
+            if backend == "pdfium":
+                import pypdfium2
+
+                self._lock = _pdfium_lock
+                with self._lock:
+                    self._document = pypdfium2.PdfDocument(path)
+            else:
+                import PyPDF2
+
+                self._lock = threading.RLock()
+                self._file = open(path, 'rb')
+                self._document = PyPDF2.PdfReader(self._file)
+
+    def _check_open(self):
+        if self._document is None:
+            raise ValueError(f"{os.path.basename(self.path)} has been closed")
+
+    def page_count(self):
+        with self._lock:
+            self._check_open()
+            return len(self._document) if self.backend == "pdfium" else len(self._document.pages)
+
+    def page_size(self, page):
+        """Return the (width, height) of a page (1-based) in points as it is rendered (swapped for rotated pages)"""
+        with self._lock:
+            self._check_open()
+            if self.backend == "pdfium":
+                pdf_page = self._document[page - 1]
+                try:
+                    # pdfium already applies the page rotation
+                    return pdf_page.get_size()
+                finally:
+                    pdf_page.close()
+            pdf_page = self._document.pages[page - 1]
+            width_pt = abs(float(pdf_page.mediabox.width))
+            height_pt = abs(float(pdf_page.mediabox.height))
+            if (pdf_page.rotation or 0) % 360 in (90, 270):
+                width_pt, height_pt = height_pt, width_pt
+            return width_pt, height_pt
+
+    def page_text(self, page, region=None):
+        """
+        Return the text of a page (1-based), or only of the text inside region (percent of the
+        page like a crop config). Rotated pages, and every page with PyPDF2 (which parses the whole
+        page to find the text of a region anyway), give the text of the whole page.
+        """
+        with self._lock:
+            self._check_open()
+            if self.backend != "pdfium":
+                return self._document.pages[page - 1].extract_text()
+            pdf_page = self._document[page - 1]
+            text_page = pdf_page.get_textpage()
+            try:
+                if region is None or pdf_page.get_rotation() % 360:
+                    return text_page.get_text_range()
+                left, bottom, right, top = pdf_page.get_mediabox()
+                width, height = right - left, top - bottom
+                return text_page.get_text_bounded(left=left + width * region['left'] / 100,
+                                                  bottom=top - height * region['bottom'] / 100,
+                                                  right=left + width * region['right'] / 100,
+                                                  top=top - height * region['top'] / 100)
+            finally:
+                text_page.close()
+                pdf_page.close()
+
+    def render(self, page, dpi=RENDER_DPI):
+        """Render a page (1-based) as an RGB PIL image, the same size as pdftoppm renders it (pdfium only)"""
+        if self.backend != "pdfium":
+            raise ValueError("Rendering needs the pdfium backend")
+        with self._lock:
+            self._check_open()
+            pdf_page = self._document[page - 1]
+            try:
+                bitmap = pdf_page.render(scale=dpi / 72.0)
+                try:
+                    # The BGR bitmap is converted, so the image does not share pdfium's buffer
+                    return bitmap.to_pil().convert('RGB')
+                finally:
+                    bitmap.close()
+            finally:
+                pdf_page.close()
+
+    def close(self):
+        with self._lock:
+            if self._document is not None and self.backend == "pdfium":
+                self._document.close()
+            self._document = None
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+class PdfRegistry:
+    """The PDFs opened during a report run, each parsed once and shared by every stage.
+
+    Documents are replaced when their file changes and closed with close() when the report is done.
+    Worker processes have their own registry.
+    """
+    def __init__(self):
+        self._documents = {}  # abs path -> PdfDocument
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def get(self, pdf_path):
+        """Return the PdfDocument of a file, opening it on first use"""
+        abs_path = os.path.abspath(pdf_path)
+        stat = os.stat(abs_path)
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked worker: the parent's handles are not ours to use
+                self._documents, self._pid = {}, os.getpid()
+            document = self._documents.get(abs_path)
+        if document is not None and (document.size, document.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            return document
+
+        # Opened outside the lock so several PDFs can be read at the same time
+        opened = PdfDocument(abs_path, get_pdf_backend())
+        with self._lock:
+            document = self._documents.get(abs_path)
+            if document is not None and (document.size, document.mtime_ns) == (opened.size, opened.mtime_ns):
+                stale = opened
+            else:
+                stale, document = document, opened
+                self._documents[abs_path] = opened
+        if stale is not None:
+            stale.close()
+        return document
+
+    def close(self, folder_path=None):
+        """Close all documents, or only the ones inside folder_path"""
+        prefix = os.path.join(os.path.abspath(folder_path), "") if folder_path else ""
+        with self._lock:
+            closing = [path for path in self._documents if path.startswith(prefix)]
+            documents = [self._documents.pop(path) for path in closing]
+        for document in documents:
+            document.close()
+
+
+_pdf_registry = PdfRegistry()
+
+
+def get_pdf_document(pdf_path):
+    """Return the parsed PDF from the registry of this process (see PdfRegistry)"""
+    return _pdf_registry.get(pdf_path)
+
+
+def close_pdf_documents(folder_path=None):
+    """Close the PDFs of the registry (only the ones inside folder_path if given)"""
+    _pdf_registry.close(folder_path)
+
+
+# Memo of PDF page sizes: (abs path, page) -> (size, mtime, (width_pt, height_pt))
+_page_sizes = {}
+_page_sizes_lock = threading.Lock()
+
+
+def get_page_size_points(pdf_path, page):
+    """
+    Return the (width, height) of a page in points as it is rendered (swapped for rotated pages).
+    Sizes are remembered per file as long as its size and mtime are unchanged.
+    """
+    abs_path = os.path.abspath(pdf_path)
+    stat = os.stat(abs_path)
+    with _page_sizes_lock:
+        cached = _page_sizes.get((abs_path, page))
+    if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+        return cached[2]
+
+    width_pt, height_pt = get_pdf_document(abs_path).page_size(page)
+
+    with _page_sizes_lock:
+        _page_sizes[(abs_path, page)] = (stat.st_size, stat.st_mtime_ns, (width_pt, height_pt))
+    return width_pt, height_pt
+
+
+def get_page_pixel_size(pdf_path, page, dpi=RENDER_DPI):
+    """
+    Return the (width, height) in pixels of a full-page pdftoppm render.
+    Uses the same formula as pdftoppm: ceil(media box size in points * dpi / 72).
+    """
+    width_pt, height_pt = get_page_size_points(pdf_path, page)
+    return math.ceil(width_pt * (dpi / 72.0)), math.ceil(height_pt * (dpi / 72.0))
+
+
+# Width of a screenshot frame in the report unless its crop config sets "width_cm"
+DEFAULT_FRAME_WIDTH_CM = 16.0
+
+# The resolution planner never renders below this
+MIN_RENDER_DPI = 72
+
+
+def plan_render_dpi(screenshots_config, pdf_path=None, output_dpi=None, max_dpi=None):
+    """
+    Plan the render resolution of every page used by a list of crop configs.
+
+    A crop shown width_cm wide in the report needs width_cm / 2.54 * output_dpi pixels across,
+    and it spans (right - left) % of the page width, so its page has to be rendered at
+    that pixel count divided by the crop width in inches. All pages of a PDF get the highest
+    DPI of its crops (capped to max_dpi and rounded up to whole DPI), so each page is still
+    rasterized once and all pages of a PDF are still rendered in one call.
+
+    output_dpi defaults to the "output_dpi" setting (300; e.g. 200 is enough for screen PDFs),
+    max_dpi to the "max_render_dpi" setting (RENDER_DPI).
+    Returns {(pdf_path, page): dpi}.
     """
+    if output_dpi is None:
+        output_dpi = get_setting("output_dpi", 300)
+    if max_dpi is None:
+        max_dpi = get_setting("max_render_dpi", RENDER_DPI)
+
+    page_dpis = {}
+    for config in screenshots_config:
+        config_pdf = config.get('pdf', pdf_path)
+        key = (config_pdf, config['page'])
+        try:
+            page_width_pt = get_page_size_points(config_pdf, config['page'])[0]
+            crop_width_in = (config['right'] - config['left']) / 100 * page_width_pt / 72.0
+            frame_width_in = config.get('width_cm', DEFAULT_FRAME_WIDTH_CM) / 2.54
+            needed_dpi = frame_width_in * output_dpi / crop_width_in
+        except Exception as e:
+            print(f"Warning: Could not plan render resolution for {config_pdf} page {config['page']} ({e})")
+            needed_dpi = max_dpi
+        needed_dpi = max(MIN_RENDER_DPI, min(max_dpi, math.ceil(needed_dpi)))
+        page_dpis[key] = max(page_dpis.get(key, 0), needed_dpi)
+
+    pdf_dpis = {}
+    for (config_pdf, _), page_dpi in page_dpis.items():
+        pdf_dpis[config_pdf] = max(pdf_dpis.get(config_pdf, 0), page_dpi)
+    return {key: pdf_dpis[key[0]] for key in page_dpis}
+
+
+def render_page_region(pdf_path, page, config, dpi=RENDER_DPI):
+    """
+    Render only the crop rectangle of a page using pdftoppm's -x/-y/-W/-H options.
+    The rectangle is computed from the full-page pixel size with crop_box_pixels, so the
+    result is pixel-identical to cropping a full-page render. pdfium has no such region render
+    (its cropped renders differ from the full page in antialiased edges), so with the pdfium
+    backend the full page is rendered and cropped.
+    """
+    from pdf2image.parsers import parse_buffer_to_ppm
+
+    img_width, img_height = get_page_pixel_size(pdf_path, page, dpi)
+    left, top, right, bottom = crop_box_pixels(config, img_width, img_height)
+    if get_pdf_backend() == "pdfium":
+        with trace_span("render region", "render", pdf=os.path.basename(pdf_path), page=page, dpi=dpi) as span:
+            image = get_pdf_document(pdf_path).render(page, dpi).crop((left, top, right, bottom))
+            span['pixels'] = image.width * image.height
+        return image
+
+    with trace_span("render region", "render", pdf=os.path.basename(pdf_path), page=page, dpi=dpi) as span:
+        output = run_poppler("pdftoppm", [
+            "-r", str(dpi), "-f", str(page), "-l", str(page),
+            "-x", str(left), "-y", str(top), "-W", str(right - left), "-H", str(bottom - top),
+            pdf_path
+        ])
+        images = parse_buffer_to_ppm(output)
+        span['bytes'] = len(output)
+        span['pixels'] = (right - left) * (bottom - top)
+    return images[0] if images else None
+
+
+def render_pdf_pages(pdf_path, first_page, last_page, dpi=RENDER_DPI):
+    """
+    Render a page range of a PDF with a single pdftoppm call.
+    Returns list of PIL images in page order (pdftoppm stops at the last page of the document).
+    """
+    from pdf2image.parsers import parse_buffer_to_ppm
+
+    output = run_poppler("pdftoppm", ["-r", str(dpi), "-f", str(first_page), "-l", str(last_page), pdf_path])
+    return parse_buffer_to_ppm(output)
+
+
+# Number of processes rendering at the same time that share the render memory budget (see extract_screenshots)
+_render_budget_share = 1
+
+
+def set_render_budget_share(processes):
+    """Split the render memory budget between this many processes (called in each worker process)"""
+    global _render_budget_share
+    _render_budget_share = max(1, int(processes))
+
+
+def get_render_memory_budget():
+    """
+    Return the bytes of rendered pages one PageRenderer may hold at a time: the "render_memory_budget_mb"
+    setting (default 512, 0 for no limit) divided between the processes rendering in parallel
+    """
+    budget_mb = float(get_setting("render_memory_budget_mb", 512) or 0)
+    return int(budget_mb * 1024 * 1024 / _render_budget_share)
+
+
+def estimate_page_bytes(pdf_path=None, page=1, dpi=RENDER_DPI):
+    """Return the memory of a full-page RGB render (of an A4 page without pdf_path or if the size can not be read)"""
     try:
-        # Hardcoded crop coordinates for all 7 screenshots
-        screenshots_config = [
-            {"page": 2, "left": 13.73, "top": 27.32, "right": 70.26, "bottom": 82.19},  # Screenshot 1
-            {"page": 5, "left": 11.97, "top": 28.12, "right": 70.31, "bottom": 84.85},  # Screenshot 2
-            {"page": 3, "left": 12.76, "top": 31.59, "right": 67.12, "bottom": 81.95},  # Screenshot 3
-            {"page": 4, "left": 13.50, "top": 32.72, "right": 66.55, "bottom": 83.00},  # Screenshot 4
-            {"page": 6, "left": 1.03, "top": 34.57, "right": 59.66, "bottom": 90.09},   # Screenshot 5
-            {"page": 6, "left": 1.65, "top": 15.07, "right": 92.25, "bottom": 34.57},   # Screenshot 6
-            {"page": 6, "left": 59.66, "top": 34.81, "right": 91.62, "bottom": 89.20},  # Screenshot 7
-        ]
+        width, height = get_page_pixel_size(pdf_path, page, dpi)
+    except Exception:
+        width, height = math.ceil(8.27 * dpi), math.ceil(11.69 * dpi)
+    return width * height * 3
 
-        screenshot_paths = []
 
-        for i, config in enumerate(screenshots_config, 1):
-            print(f"\nProcessing Screenshot {i} from page {config['page']}...")
+# While pdftoppm output is parsed, its PPM buffer and the decoded images are in memory together
+RENDER_BUFFER_FACTOR = 2
 
-            # Convert specific page at 300 DPI for high quality
-            images = convert_from_path(pdf_path, dpi=300, first_page=config['page'], last_page=config['page'])
-            if not images:
-                print(f"Warning: Could not convert page {config['page']}")
-                screenshot_paths.append(None)
+
+def limit_render_processes(processes, dpi=None):
+    """
+    Return how many of processes may render in parallel so that each one's share of the render
+    memory budget still holds one A4 page at dpi (default: "max_render_dpi" setting) while it is parsed
+    """
+    budget = float(get_setting("render_memory_budget_mb", 512) or 0) * 1024 * 1024
+    if not budget:
+        return processes
+    if dpi is None:
+        dpi = get_setting("max_render_dpi", RENDER_DPI)
+    fitting = max(1, int(budget // (estimate_page_bytes(dpi=dpi) * RENDER_BUFFER_FACTOR)))
+    if fitting < processes:
+        print(f"Memory budget: {fitting} instead of {processes} parallel render processes")
+    return min(processes, fitting)
+
+
+def init_render_worker(processes, headless=False):
+    """Initializer of worker processes that render: share the memory budget (and switch to headless)"""
+    set_render_budget_share(processes)
+    if headless:
+        set_headless()
+
+
+class PageRenderer:
+    """Shared page-render layer for the crop functions.
+
+    Every distinct (pdf_path, page, dpi) is rasterized at most once per report run.
+    Concurrent requests for the same page wait for the same render. Crop functions
+    reserve the pages they are going to use up front, and a page image is freed as
+    soon as its last reserved crop has been released.
+
+    Pages announced with plan() are rendered together: the first request for any page
+    of a PDF renders all planned pages of that PDF in one pdftoppm call.
+
+    Batches are kept within a memory budget (see get_render_memory_budget): planned
+    pages that do not fit next to the pages still held stay planned for a later batch.
+    A single page is always rendered, even if it alone exceeds the budget.
+
+    In "region" mode (setting "render_mode" in report_config.json) no full pages are
+    kept; every crop is rendered on its own as just the crop rectangle. Region mode needs
+    the poppler backend, with pdfium the renderer uses page mode (see render_page_region).
+
+    Once the optional cancel event is set, crop() raises CancelledError instead of rendering.
+    """
+    def __init__(self, mode=None, memory_budget=None, cancel=None):
+        if mode is None:
+            mode = get_setting("render_mode", "page")
+        if mode not in RENDER_MODES:
+            print(f"Warning: Unknown render mode '{mode}', using 'page'")
+            mode = "page"
+        if mode == "region" and get_pdf_backend() == "pdfium":
+            print("Warning: Render mode 'region' needs the poppler backend, using 'page'")
+            mode = "page"
+        self.mode = mode
+        # Bytes of rendered pages held at a time, 0 for no limit
+        self.memory_budget = get_render_memory_budget() if memory_budget is None else memory_budget
+        self._lock = threading.Lock()
+        self._pages = {}  # key -> Future holding the rendered PIL image (or None)
+        self._uses = {}   # key -> number of reserved crops not yet released
+        self._planned = {}  # (abs pdf path, dpi) -> pages to render in the next batch of that PDF
+        self._held = {}   # key -> estimated bytes of a rendered (or rendering) page
+        self.cancel = cancel
+
+    @staticmethod
+    def _key(pdf_path, page, dpi):
+        return (os.path.abspath(pdf_path), page, dpi)
+
+    def reserve(self, pdf_path, page, dpi=RENDER_DPI):
+        """Announce one upcoming crop from this page so the render is kept until it is released"""
+        key = self._key(pdf_path, page, dpi)
+        with self._lock:
+            self._uses[key] = self._uses.get(key, 0) + 1
+
+    @staticmethod
+    def _page_dpis(pages, dpi):
+        """(page, dpi) pairs of a pages_by_pdf value: a collection of pages at dpi or a {page: dpi} dict"""
+        if isinstance(pages, dict):
+            return pages.items()
+        return [(page, dpi) for page in pages]
+
+    def plan(self, pages_by_pdf, dpi=RENDER_DPI):
+        """
+        Announce the pages that will be needed from each PDF so they are rendered in one batch per PDF and DPI.
+        pages_by_pdf is {pdf_path: pages} (all at dpi) or {pdf_path: {page: dpi}} (see plan_render_dpi).
+        """
+        with self._lock:
+            for pdf_path, pages in pages_by_pdf.items():
+                for page, page_dpi in self._page_dpis(pages, dpi):
+                    self._planned.setdefault((os.path.abspath(pdf_path), page_dpi), set()).add(page)
+
+    def unplan(self, pages_by_pdf, dpi=RENDER_DPI):
+        """Withdraw planned pages (same format as plan) that turned out not to be needed (e.g. cached crops)"""
+        with self._lock:
+            for pdf_path, pages in pages_by_pdf.items():
+                for page, page_dpi in self._page_dpis(pages, dpi):
+                    planned = self._planned.get((os.path.abspath(pdf_path), page_dpi))
+                    if planned:
+                        planned.discard(page)
+
+    def held_bytes(self):
+        """Estimated memory of the page images rendered (or rendering) and not released yet"""
+        with self._lock:
+            return sum(self._held.values())
+
+    def _fit_budget(self, page, planned, page_bytes):
+        """
+        Return the pages of a batch for page: the planned pages nearest to it whose render range
+        (pdftoppm renders every page from the first to the last) fits next to the held pages
+        """
+        if not self.memory_budget:
+            return {page} | planned
+        available = self.memory_budget - sum(self._held.values())
+        batch_pages = {page}
+        for candidate in sorted(planned, key=lambda planned_page: (abs(planned_page - page), planned_page)):
+            pages = batch_pages | {candidate}
+            if (max(pages) - min(pages) + 1) * page_bytes * RENDER_BUFFER_FACTOR <= available:
+                batch_pages = pages
+        return batch_pages
+
+    def get_page(self, pdf_path, page, dpi=RENDER_DPI):
+        """Return the rendered page image, rendering it only on the first request"""
+        key = self._key(pdf_path, page, dpi)
+        batch = {}
+        with self._lock:
+            future = self._pages.get(key)
+        # Pages of one PDF are assumed to be the same size as the requested one
+        page_bytes = estimate_page_bytes(pdf_path, page, dpi) if future is None else 0
+        with self._lock:
+            future = self._pages.get(key)
+            if future is None:
+                # Render this page together with the planned pages of the same PDF that fit the memory budget;
+                # pages rendered earlier (e.g. for a previous section) may have been planned again
+                planned = {planned_page for planned_page in self._planned.pop((key[0], dpi), set())
+                           if planned_page != page and self._key(pdf_path, planned_page, dpi) not in self._pages}
+                batch_pages = self._fit_budget(page, planned, page_bytes)
+                if planned - batch_pages:
+                    self._planned[(key[0], dpi)] = planned - batch_pages
+                    print(f"Memory budget: rendering {os.path.basename(pdf_path)} pages {sorted(batch_pages)} now, "
+                          f"{sorted(planned - batch_pages)} later")
+                for batch_page in batch_pages:
+                    batch_key = self._key(pdf_path, batch_page, dpi)
+                    if batch_key not in self._pages:
+                        batch[batch_page] = self._pages[batch_key] = Future()
+                        self._held[batch_key] = page_bytes
+                future = self._pages[key]
+
+        if batch:
+            self._render_batch(pdf_path, batch, dpi)
+
+        return future.result()
+
+    def _render_batch(self, pdf_path, batch, dpi):
+        """Render the pages of batch ({page: Future}) with one pdftoppm call and resolve their futures"""
+        pages = sorted(batch)
+        first_page, last_page = pages[0], pages[-1]
+        if get_pdf_backend() == "pdfium":
+            # pdfium renders just the requested pages from the document parsed for this run
+            print(f"Rendering {os.path.basename(pdf_path)} pages {pages} ({dpi} DPI)...")
+            for page in pages:
+                try:
+                    with trace_span("render page", "render", pdf=os.path.basename(pdf_path), page=page,
+                                    dpi=dpi) as span:
+                        image = get_pdf_document(pdf_path).render(page, dpi)
+                        span['pixels'] = image.width * image.height
+                        span['held_mb'] = round(self.held_bytes() / (1024 * 1024), 1)
+                    batch[page].set_result(image)
+                except Exception as page_error:
+                    batch[page].set_exception(page_error)
+            return
+        try:
+            print(f"Converting {os.path.basename(pdf_path)} pages {pages} to high-quality images ({dpi} DPI)...")
+            with trace_span("render pages", "render", pdf=os.path.basename(pdf_path), pages=pages, dpi=dpi) as span:
+                images = render_pdf_pages(pdf_path, first_page, last_page, dpi)
+                span['pixels'] = sum(image.width * image.height for image in images)
+                span['held_mb'] = round(self.held_bytes() / (1024 * 1024), 1)
+        except Exception as e:
+            # Fall back to rendering page by page
+            from pdf2image import convert_from_path
+
+            print(f"Warning: Batch render of {os.path.basename(pdf_path)} failed ({e}), converting pages one by one")
+            for page in pages:
+                try:
+                    with trace_span("render page", "render", pdf=os.path.basename(pdf_path), page=page,
+                                    dpi=dpi) as span:
+                        images = convert_from_path(pdf_path, dpi=dpi, first_page=page, last_page=page)
+                        span['pixels'] = sum(image.width * image.height for image in images)
+                    batch[page].set_result(images[0] if images else None)
+                except Exception as page_error:
+                    batch[page].set_exception(page_error)
+            return
+
+        # Pages inside the range that nobody asked for are dropped right here
+        for page in pages:
+            index = page - first_page
+            batch[page].set_result(images[index] if index < len(images) else None)
+
+    def crop(self, pdf_path, config, dpi=RENDER_DPI):
+        """Return the region described by a percentage crop config, or None if the page could not be converted"""
+        if self.cancel is not None and self.cancel.is_set():
+            raise CancelledError("Screenshot extraction was cancelled")
+        if self.mode == "region":
+            try:
+                return render_page_region(pdf_path, config['page'], config, dpi)
+            except Exception as e:
+                # Fall back to the full-page render for this crop
+                print(f"Warning: Region render failed ({e}), rendering full page instead")
+
+        image = self.get_page(pdf_path, config['page'], dpi)
+        if image is None:
+            return None
+        img_width, img_height = image.size
+        return image.crop(crop_box_pixels(config, img_width, img_height))
+
+    def release(self, pdf_path, page, dpi=RENDER_DPI):
+        """Mark one crop from this page as done and free the page after the last one"""
+        key = self._key(pdf_path, page, dpi)
+        with self._lock:
+            remaining = self._uses.get(key, 0) - 1
+            if remaining > 0:
+                self._uses[key] = remaining
+            else:
+                self._uses.pop(key, None)
+                self._pages.pop(key, None)
+                self._held.pop(key, None)
+                # A page planned again before its last crop was released is not needed anymore
+                planned = self._planned.get((key[0], dpi))
+                if planned:
+                    planned.discard(page)
+
+
+class ScreenshotImage:
+    """A cropped screenshot kept in memory: the encoded image file plus its pixel size.
+
+    Screenshots go from the crop stage (also across worker processes) straight into the
+    ODT package, so no temporary image files are written or read again for their size.
+    """
+    def __init__(self, data, width, height, mediatype="image/png", encoding=None, baseline_bytes=None,
+                 width_cm=None):
+        self.data = data
+        self.width = width
+        self.height = height
+        # Frame width in the report from the crop's "width_cm" in the layout spec (None: DEFAULT_FRAME_WIDTH_CM)
+        self.width_cm = width_cm
+        self.mediatype = mediatype
+        # How encode_screenshot stored it ("palette-png", "png", "jpeg"; None if not known, e.g. from the cache)
+        self.encoding = encoding
+        # Size of the plain RGB PNG it replaces, if that was measured
+        self.baseline_bytes = baseline_bytes
+
+    @classmethod
+    def from_pil(cls, image):
+        """Encode a PIL image as PNG"""
+        import io
+
+        buffer = io.BytesIO()
+        image.save(buffer, 'PNG')
+        data = buffer.getvalue()
+        return cls(data, image.width, image.height, encoding="png", baseline_bytes=len(data))
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Wrap an encoded image file, reading only its header for the size and type"""
+        import io
+        from PIL import Image as PILImage
+
+        with PILImage.open(io.BytesIO(data)) as image:
+            return cls(data, image.width, image.height, PILImage.MIME.get(image.format, "image/png"))
+
+    @property
+    def size(self):
+        return self.width, self.height
+
+    def __repr__(self):
+        return f"<ScreenshotImage {self.width}x{self.height} {self.mediatype}, {len(self.data)} bytes>"
+
+
+# Image encodings for screenshots: "auto" picks per crop (see encode_screenshot), "png" is always RGB PNG
+IMAGE_ENCODINGS = ("auto", "png")
+
+
+def get_encoding_settings():
+    """
+    Return the screenshot encoding settings from report_config.json: "image_encoding" (default "auto"),
+    "jpeg_quality" (default 90), "jpeg_min_entropy" (default 6.0, crops below this stay lossless) and
+    "jpeg_min_saving" (default 0.25, JPEG must be at least this much smaller than the best PNG)
+    """
+    encoding = get_setting("image_encoding", "auto")
+    if encoding not in IMAGE_ENCODINGS:
+        print(f"Warning: Unknown image encoding '{encoding}', using 'auto'")
+        encoding = "auto"
+    return {
+        'encoding': encoding,
+        'jpeg_quality': int(get_setting("jpeg_quality", 90)),
+        'jpeg_min_entropy': float(get_setting("jpeg_min_entropy", 6.0)),
+        'jpeg_min_saving': float(get_setting("jpeg_min_saving", 0.25)),
+    }
+
+
+def encode_screenshot(image, settings=None):
+    """
+    Encode a cropped screenshot as the smallest suitable format:
+    - crops with at most 256 colours (flat charts) as lossless palette PNG,
+    - detailed crops (entropy >= jpeg_min_entropy, e.g. pedography heatmaps) as JPEG when that
+      saves at least jpeg_min_saving against the PNG,
+    - everything else as RGB PNG.
+    Returns a ScreenshotImage that records the chosen encoding and, where the RGB PNG was encoded
+    anyway (to compare against JPEG), the size it replaces.
+    """
+    import io
+    from PIL import Image as PILImage, ImageChops
+
+    if settings is None:
+        settings = get_encoding_settings()
+    with trace_span("encode", "encode", pixels=image.width * image.height) as span:
+        if image.mode != 'RGB':
+            image = image.convert('RGB')
+
+        def encode(img, image_format, **options):
+            buffer = io.BytesIO()
+            img.save(buffer, image_format, **options)
+            return buffer.getvalue()
+
+        best = None
+        png_data = None
+        if settings['encoding'] == "auto":
+            colors = image.getcolors(256)
+            if colors is not None:
+                # Median cut keeps every colour when there are no more of them than palette entries;
+                # the round trip is checked anyway, a palette that changes any pixel is not used
+                palette_image = image.quantize(len(colors), method=PILImage.Quantize.MEDIANCUT,
+                                               dither=PILImage.Dither.NONE)
+                if ImageChops.difference(palette_image.convert('RGB'), image).getbbox() is None:
+                    best = (encode(palette_image, 'PNG'), "image/png", "palette-png")
+            elif image.entropy() >= settings['jpeg_min_entropy']:
+                png_data = encode(image, 'PNG')
+                jpeg_data = encode(image, 'JPEG', quality=settings['jpeg_quality'], optimize=True)
+                if len(jpeg_data) <= len(png_data) * (1 - settings['jpeg_min_saving']):
+                    best = (jpeg_data, "image/jpeg", "jpeg")
+        if best is None:
+            if png_data is None:
+                png_data = encode(image, 'PNG')
+            best = (png_data, "image/png", "png")
+
+        data, mediatype, encoding = best
+        span['encoding'] = encoding
+        span['bytes'] = len(data)
+        if png_data is not None:
+            span['png_bytes'] = len(png_data)
+    return ScreenshotImage(data, image.width, image.height, mediatype, encoding,
+                           len(png_data) if png_data is not None else None)
+
+
+def summarize_screenshot_encoding(screenshots):
+    """
+    Print how the screenshots of an extraction result ({result key: image or image list}) were
+    encoded and how many bytes that saved against plain RGB PNG, where that was measured (JPEG
+    candidates; palette PNGs are not compared to save the extra encode). Returns (total bytes, saved bytes).
+    """
+    counts = {}
+    total_bytes = saved_bytes = 0
+    for value in screenshots.values():
+        for screenshot in (value if isinstance(value, list) else [value]):
+            if not isinstance(screenshot, ScreenshotImage):
                 continue
+            encoding = screenshot.encoding or "cached"
+            counts[encoding] = counts.get(encoding, 0) + 1
+            total_bytes += len(screenshot.data)
+            if screenshot.baseline_bytes:
+                saved_bytes += screenshot.baseline_bytes - len(screenshot.data)
+    summary = ", ".join(f"{count} {encoding}" for encoding, count in sorted(counts.items()))
+    print(f"Screenshot encoding: {summary or 'no screenshots'}; {total_bytes / 1024:.0f} KB total, "
+          f"{saved_bytes / 1024:.0f} KB saved against RGB PNG where measured")
+    return total_bytes, saved_bytes
 
-            image = images[0]
-            img_width, img_height = image.size
 
-            # Calculate crop coordinates from percentages
-            left = int((config['left'] / 100) * img_width)
-            top = int((config['top'] / 100) * img_height)
-            right = int((config['right'] / 100) * img_width)
-            bottom = int((config['bottom'] / 100) * img_height)
+def screenshot_available(screenshot):
+    """True for a ScreenshotImage or the path of an existing image file"""
+    if isinstance(screenshot, ScreenshotImage):
+        return True
+    return bool(screenshot) and os.path.exists(screenshot)
 
-            # Crop the image
-            cropped_image = image.crop((left, top, right, bottom))
-            crop_width, crop_height = cropped_image.size
-            print(f"Screenshot {i} cropped: {crop_width}x{crop_height} pixels")
 
-            # Save to temporary file
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-            cropped_image.save(temp_file.name, 'PNG', quality=95)
-            screenshot_paths.append(temp_file.name)
+def screenshot_frame_width(screenshot):
+    """Return the frame width in cm a screenshot is placed with in the report (see ScreenshotImage.width_cm)"""
+    return getattr(screenshot, 'width_cm', None) or DEFAULT_FRAME_WIDTH_CM
 
-        return screenshot_paths
 
-    except Exception as e:
-        print(f"Error cropping statik screenshots: {e}")
-        import traceback
-        traceback.print_exc()
-        return []
+def screenshot_size(screenshot):
+    """Return the (width, height) in pixels of a ScreenshotImage or image file"""
+    if isinstance(screenshot, ScreenshotImage):
+        return screenshot.size
+    from PIL import Image as PILImage
+
+    with PILImage.open(screenshot) as image:
+        return image.size
+
+
+def add_screenshot_picture(doc, screenshot):
+    """Add a ScreenshotImage (from memory) or image file to the ODT package and return its href"""
+    if isinstance(screenshot, ScreenshotImage):
+        import mimetypes
+        import uuid
+
+        extension = mimetypes.guess_extension(screenshot.mediatype) or ".png"
+        return doc.addPicture(f"Pictures/{uuid.uuid4().hex.upper()}{extension}", screenshot.mediatype,
+                              screenshot.data)
+    return doc.addPicture(screenshot)
+
+
+# Memo of PDF content hashes: abs path -> (size, mtime, sha256 hex digest)
+_pdf_hashes = {}
+_pdf_hashes_lock = threading.Lock()
+
+
+def get_pdf_hash(pdf_path):
+    """Return the SHA-256 of a PDF's content, hashing each file only once as long as size and mtime are unchanged"""
+    import hashlib
+
+    abs_path = os.path.abspath(pdf_path)
+    stat = os.stat(abs_path)
+    with _pdf_hashes_lock:
+        cached = _pdf_hashes.get(abs_path)
+    if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+        return cached[2]
+
+    digest = hashlib.sha256()
+    with open(abs_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    pdf_hash = digest.hexdigest()
+    with _pdf_hashes_lock:
+        _pdf_hashes[abs_path] = (stat.st_size, stat.st_mtime_ns, pdf_hash)
+    return pdf_hash
+
 
+class ScreenshotCache:
+    """Persistent on-disk cache of cropped screenshots.
 
-def crop_kraft_screenshots(pdf_path, strength_test_type="Torso + legs"):
+    Entries are keyed by the PDF content hash, page, crop rectangle, DPI, PDF backend, render mode
+    and encoding settings, so a regenerated report reuses the crops of unchanged PDFs no matter
+    where the folder lives. The cache is capped in size and evicts the least recently used entries
+    once the entries written add up to more than the cap.
+
+    Settings in report_config.json: "screenshot_cache_dir" (default: a folder in the
+    temp directory) and "screenshot_cache_max_mb" (default 512, 0 disables the cache).
     """
-    Crop screenshots from kraft.pdf using coordinates based on strength test type.
-    Returns list of paths to temporary cropped image files.
+    # Bump when the crop output changes so old entries are no longer used
+    VERSION = 2
+
+    def __init__(self, cache_dir=None, max_mb=None, encoding_settings=None):
+        if cache_dir is None:
+            cache_dir = get_setting("screenshot_cache_dir") or os.path.join(tempfile.gettempdir(),
+                                                                            "motionlab_screenshot_cache")
+        if max_mb is None:
+            max_mb = get_setting("screenshot_cache_max_mb", 512)
+        self.cache_dir = cache_dir
+        self.max_bytes = int(float(max_mb) * 1024 * 1024)
+        self.enabled = self.max_bytes > 0
+        # Settings that change the crop output, resolved once instead of on every get and put
+        self.encoding_settings = get_encoding_settings() if encoding_settings is None else encoding_settings
+        self.backend = get_pdf_backend()
+        # Bytes in the cache directory as last counted by evict() plus what this cache wrote since;
+        # None until the first put. Other processes writing to the same directory are only seen by evict().
+        self._size = None
+        self._size_lock = threading.Lock()
+        if self.enabled:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+            except Exception as e:
+                print(f"Warning: Screenshot cache disabled, could not create {self.cache_dir}: {e}")
+                self.enabled = False
+
+    def _entry_path(self, pdf_path, config, dpi, mode):
+        import hashlib
+
+        key = "|".join(str(part) for part in (
+            self.VERSION, get_pdf_hash(pdf_path), config['page'],
+            config['left'], config['top'], config['right'], config['bottom'], dpi, self.backend, mode,
+            *(self.encoding_settings[name] for name in sorted(self.encoding_settings))))
+        # Entries are PNG or JPEG files, the type is read from the data
+        return os.path.join(self.cache_dir, hashlib.sha256(key.encode('utf-8')).hexdigest() + ".img")
+
+    def get(self, pdf_path, config, dpi=RENDER_DPI, mode="page"):
+        """Return the cached crop (rendered in render mode) as ScreenshotImage, or None on a miss"""
+        if not self.enabled:
+            return None
+        try:
+            entry_path = self._entry_path(pdf_path, config, dpi, mode)
+            if not os.path.exists(entry_path):
+                return None
+            # Touch the entry so eviction sees it as recently used
+            os.utime(entry_path)
+            with open(entry_path, 'rb') as f:
+                return ScreenshotImage.from_bytes(f.read())
+        except Exception as e:
+            print(f"Warning: Could not read screenshot cache: {e}")
+            return None
+
+    def put(self, pdf_path, config, image, dpi=RENDER_DPI, mode="page"):
+        """Store a cropped screenshot (ScreenshotImage, rendered in render mode) in the cache"""
+        if not self.enabled:
+            return
+        try:
+            entry_path = self._entry_path(pdf_path, config, dpi, mode)
+            # Write under a temporary name first so concurrent workers never see half-written entries
+            partial_path = f"{entry_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(partial_path, 'wb') as f:
+                f.write(image.data)
+            os.replace(partial_path, entry_path)
+            # The directory is only scanned on the first put and when the running total passes the cap
+            with self._size_lock:
+                if self._size is not None and self._size + len(image.data) <= self.max_bytes:
+                    self._size += len(image.data)
+                    return
+                self._size = self.evict()
+        except Exception as e:
+            print(f"Warning: Could not write screenshot cache: {e}")
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits its size cap, return the bytes left"""
+        entries = []
+        total_size = 0
+        for entry in os.scandir(self.cache_dir):
+            # .png entries are from cache version 1
+            if entry.is_file() and entry.name.endswith((".img", ".png")):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total_size += stat.st_size
+
+        for mtime, size, path in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total_size -= size
+            except OSError:
+                pass
+        return total_size
+
+
+def crop_box_pixels(config, img_width, img_height):
+    """Convert the percentage coordinates of a crop config into a pixel box for image.crop"""
+    left = int((config['left'] / 100) * img_width)
+    top = int((config['top'] / 100) * img_height)
+    right = int((config['right'] / 100) * img_width)
+    bottom = int((config['bottom'] / 100) * img_height)
+    return left, top, right, bottom
+
+
+def crop_screenshots(screenshots_config, pdf_path=None, label="Screenshot", renderer=None, dpi=None,
+                     cache=None):
+    """
+    Crop screenshots described by percentage coordinates from PDF pages.
+    Each config entry needs "page", "left", "top", "right" and "bottom" and may name its own "pdf"
+    and the "width_cm" of its frame in the report.
+    Pages are rendered at the "dpi" of the crop config if it has one (set by plan_screenshot_tasks),
+    else at the resolution from plan_render_dpi, unless a fixed dpi is given.
+    Crops found in the ScreenshotCache are taken from there; the others are requested from the
+    (shared) PageRenderer, so each page is rasterized only once, and then added to the cache.
+    Returns list of ScreenshotImage (None where a page could not be converted).
     """
+    if renderer is None:
+        renderer = PageRenderer()
+    encoding_settings = get_encoding_settings()
+    if cache is None:
+        cache = ScreenshotCache(encoding_settings=encoding_settings)
+
+    if dpi is None:
+        page_dpis = plan_render_dpi([config for config in screenshots_config if 'dpi' not in config], pdf_path)
+        config_dpis = [config['dpi'] if 'dpi' in config else page_dpis[(config.get('pdf', pdf_path), config['page'])]
+                       for config in screenshots_config]
+    else:
+        config_dpis = [dpi] * len(screenshots_config)
+
+    # Look up cached crops first; their pages only need rendering if another crop misses
+    cached_images = [cache.get(config.get('pdf', pdf_path), config, config_dpi, renderer.mode)
+                     for config, config_dpi in zip(screenshots_config, config_dpis)]
+    cached_pages = {}
+    for config, config_dpi, cached_image in zip(screenshots_config, config_dpis, cached_images):
+        if cached_image:
+            cached_pages.setdefault(config.get('pdf', pdf_path), {})[config['page']] = config_dpi
+    renderer.unplan(cached_pages)
+
+    # Reserve all pages first so a page shared by several crops stays rendered until the last one,
+    # and plan them so all pages of one PDF are rendered in a single poppler call
+    pages_by_pdf = {}
+    for config, config_dpi, cached_image in zip(screenshots_config, config_dpis, cached_images):
+        if cached_image:
+            continue
+        config_pdf = config.get('pdf', pdf_path)
+        renderer.reserve(config_pdf, config['page'], config_dpi)
+        pages_by_pdf.setdefault(config_pdf, {})[config['page']] = config_dpi
+    renderer.plan(pages_by_pdf)
+
+    screenshots = []
+    released = 0
     try:
-        if strength_test_type == "Torso + legs + shoulders":
+        for i, (config, config_dpi) in enumerate(zip(screenshots_config, config_dpis), 1):
+            config_pdf = config.get('pdf', pdf_path)
+            if cached_images[i - 1]:
+                print(f"\n{label} {i} loaded from screenshot cache")
+                cached_images[i - 1].width_cm = config.get('width_cm', DEFAULT_FRAME_WIDTH_CM)
+                screenshots.append(cached_images[i - 1])
+                released += 1
+                continue
+
+            print(f"\nProcessing {label} {i} from {os.path.basename(config_pdf)} page {config['page']} ({config_dpi} DPI)...")
+
+            try:
+                with trace_span("crop", "crop", label=f"{label} {i}", pdf=os.path.basename(config_pdf),
+                                page=config['page'], dpi=config_dpi) as span:
+                    cropped_image = renderer.crop(config_pdf, config, config_dpi)
+                    if cropped_image is not None:
+                        span['pixels'] = cropped_image.width * cropped_image.height
+                if cropped_image is None:
+                    print(f"Warning: Could not convert page {config['page']} from {config_pdf}")
+                    screenshots.append(None)
+                    continue
+
+                crop_width, crop_height = cropped_image.size
+                print(f"{label} {i} cropped: {crop_width}x{crop_height} pixels")
+
+                # Encode in memory, it goes straight into the ODT package
+                screenshot = encode_screenshot(cropped_image, encoding_settings)
+                screenshot.width_cm = config.get('width_cm', DEFAULT_FRAME_WIDTH_CM)
+                baseline = (f" (RGB PNG {screenshot.baseline_bytes / 1024:.0f} KB)"
+                            if screenshot.baseline_bytes and screenshot.encoding != "png" else "")
+                print(f"{label} {i} encoded as {screenshot.encoding}: {len(screenshot.data) / 1024:.0f} KB{baseline}")
+                screenshots.append(screenshot)
+                cache.put(config_pdf, config, screenshot, config_dpi, renderer.mode)
+            finally:
+                renderer.release(config_pdf, config['page'], config_dpi)
+                released += 1
+    finally:
+        # Drop reservations that were never consumed (e.g. after an error) so pages are freed
+        for config, config_dpi, cached_image in zip(screenshots_config[released:], config_dpis[released:],
+                                                    cached_images[released:]):
+            if not cached_image:
+                renderer.release(config.get('pdf', pdf_path), config['page'], config_dpi)
+
+    return screenshots
+
+
+# Screenshot layout spec: every screenshot of the report as crop coordinates in percent of the page
+# (from the coordinate finder). Each section names its result key, the PDF it is cropped from
+# ("4d average" for the 4D average PDF found in the folder, crops may name their own "pdf"), the
+# measurement types it is used for (all if not given) and either "crops" or "layouts" selected by
+# a wizard answer ("layout_by") with a "default_layout". "when" limits a section to wizard answers.
+# "width_cm" is the frame width in the report where it is not DEFAULT_FRAME_WIDTH_CM.
+# Sections in screenshot_layout.json (written by the coordinate finder) replace the ones here.
+DEFAULT_SCREENSHOT_LAYOUT = {
+    # 4D average screenshot (page 1 of 4d_average.pdf, fallback statik.pdf)
+    "average": {
+        "result": "screenshot_path",
+        "label": "4D Average Screenshot",
+        "pdf": "4d average",
+        "single": True,
+        "crops": [
+            {"page": 1, "left": 1.14, "top": 24.58, "right": 56.98, "bottom": 85.74},
+        ],
+    },
+    # All 7 screenshots from statik.pdf
+    "statik": {
+        "result": "statik_screenshots",
+        "label": "Statik Screenshot",
+        "pdf": "statik.pdf",
+        "crops": [
+            {"page": 2, "left": 13.73, "top": 27.32, "right": 70.26, "bottom": 82.19},  # Screenshot 1
+            {"page": 5, "left": 11.97, "top": 28.12, "right": 70.31, "bottom": 84.85},  # Screenshot 2
+            {"page": 3, "left": 12.76, "top": 31.59, "right": 67.12, "bottom": 81.95},  # Screenshot 3
+            {"page": 4, "left": 13.50, "top": 32.72, "right": 66.55, "bottom": 83.00},  # Screenshot 4
+            {"page": 6, "left": 1.03, "top": 34.57, "right": 59.66, "bottom": 90.09},   # Screenshot 5
+            {"page": 6, "left": 1.65, "top": 15.07, "right": 92.25, "bottom": 34.57},   # Screenshot 6
+            {"page": 6, "left": 59.66, "top": 34.81, "right": 91.62, "bottom": 89.20, "width_cm": 8.0},  # Screenshot 7
+        ],
+    },
+    # 8 walking screenshots from gehen.pdf
+    "gehen": {
+        "result": "gehen_screenshots",
+        "label": "Gehen Screenshot",
+        "pdf": "gehen.pdf",
+        "measurement_types": ["Gehen"],
+        "crops": [
+            {"page": 1, "left": 33.05, "top": 16.20, "right": 90.48, "bottom": 86.87},  # Screenshot 1 (Dynamische Beckenanalyse)
+            {"page": 2, "left": 0.68, "top": 14.99, "right": 46.55, "bottom": 87.00},   # Screenshot 2 (Dynamische Wirbelsäulenanalyse)
+            {"page": 3, "left": 15.27, "top": 17.49, "right": 92.72, "bottom": 76.87},  # Screenshot 3 (Ganganalyse - page 3)
+            {"page": 5, "left": 13.73, "top": 18.69, "right": 92.08, "bottom": 80.82},  # Screenshot 4 (Ganganalyse - page 5)
+            {"page": 4, "left": 2.62, "top": 17.57, "right": 92.88, "bottom": 87.11},   # Screenshot 5 (Ganganalyse - page 4)
+            {"page": 6, "left": 1.82, "top": 22.24, "right": 93.56, "bottom": 96.37},   # Screenshot 6 (Ganganalyse - page 6)
+            {"page": 8, "left": 3.13, "top": 19.10, "right": 94.02, "bottom": 87.11},   # Screenshot 7 (Dynamische Pedografie - page 8)
+            {"page": 7, "left": 14.36, "top": 18.69, "right": 93.90, "bottom": 84.05},  # Screenshot 8 (Dynamische Pedografie - page 7)
+        ],
+    },
+    # 8 running screenshots: Screenshots 1-7 from hp.pdf, Screenshot 8 from ios.pdf
+    "laufen": {
+        "result": "gehen_screenshots",
+        "label": "Laufen Screenshot",
+        "measurement_types": ["Laufen"],
+        "crops": [
+            {"pdf": "hp.pdf", "page": 1, "left": 33.45, "top": 15.71, "right": 92.08, "bottom": 90.73},  # Screenshot 1
+            {"pdf": "hp.pdf", "page": 2, "left": 0.40, "top": 16.36, "right": 37.09, "bottom": 84.93},   # Screenshot 2
+            {"pdf": "hp.pdf", "page": 3, "left": 14.02, "top": 18.69, "right": 92.14, "bottom": 77.20},  # Screenshot 3
+            {"pdf": "hp.pdf", "page": 6, "left": 11.97, "top": 18.45, "right": 91.97, "bottom": 81.55},  # Screenshot 4
+            {"pdf": "hp.pdf", "page": 4, "left": 1.48, "top": 15.47, "right": 92.93, "bottom": 87.11},   # Screenshot 5
+            {"pdf": "hp.pdf", "page": 5, "left": 0.85, "top": 14.59, "right": 93.73, "bottom": 86.30},   # Screenshot 6
+            {"pdf": "hp.pdf", "page": 8, "left": 3.25, "top": 20.31, "right": 93.39, "bottom": 87.11},   # Screenshot 7
+            {"pdf": "ios.pdf", "page": 1, "left": 1.99, "top": 18.86, "right": 93.68, "bottom": 87.35},  # Screenshot 8
+        ],
+    },
+    # Dynamische Pedografie from pages 1 and 2 of ios.pdf (same coordinates as gehen screenshots 7 and 8)
+    "ios_pedografie": {
+        "result": "ios_pedografie_screenshots",
+        "label": "IOS Pedografie Screenshot",
+        "pdf": "ios.pdf",
+        "measurement_types": ["Statik", "IOS"],
+        "crops": [
+            {"page": 1, "left": 3.13, "top": 19.10, "right": 94.02, "bottom": 87.11},   # Screenshot 1 (same coords as gehen screenshot 7)
+            {"page": 2, "left": 14.36, "top": 18.69, "right": 93.90, "bottom": 84.05},  # Screenshot 2 (same coords as gehen screenshot 8)
+        ],
+    },
+    # kraft.pdf screenshots per strength test type (kraft.pdf is not used for IOS)
+    "kraft": {
+        "result": "kraft_screenshots",
+        "label": "Kraft Screenshot",
+        "pdf": "kraft.pdf",
+        "measurement_types": ["Statik", "Gehen", "Laufen"],
+        "layout_by": "strength_test_type",
+        "default_layout": "Torso + legs",
+        "layouts": {
             # 6 screenshots: main1, extra1, flat1, main2, extra2, flat2
-            screenshots_config = [
+            "Torso + legs + shoulders": [
                 {"page": 1, "left": 1.37, "top": 20.47, "right": 47.98, "bottom": 78.49},   # Screenshot 1 (rechts-links - main)
                 {"page": 1, "left": 47.69, "top": 20.31, "right": 93.73, "bottom": 41.18},  # Screenshot 2 (rechts-links - shoulders extra)
                 {"page": 1, "left": 8.09, "top": 81.47, "right": 82.68, "bottom": 89.36},   # Screenshot 3 (rechts-links - bottom flat)
                 {"page": 2, "left": 2.62, "top": 18.86, "right": 48.77, "bottom": 75.10},   # Screenshot 4 (antagonist - main)
                 {"page": 2, "left": 48.60, "top": 18.94, "right": 93.85, "bottom": 32.47},  # Screenshot 5 (antagonist - shoulders extra)
                 {"page": 2, "left": 11.00, "top": 80.74, "right": 78.01, "bottom": 89.20},  # Screenshot 6 (antagonist - bottom flat)
-            ]
-        elif strength_test_type == "Torso + shoulders":
+            ],
             # 4 screenshots: main1, flat1, main2, flat2
-            screenshots_config = [
+            "Torso + shoulders": [
                 {"page": 1, "left": 1.14, "top": 20.47, "right": 48.43, "bottom": 64.22},   # Screenshot 1 (rechts-links - main)
                 {"page": 1, "left": 8.09, "top": 81.47, "right": 82.68, "bottom": 89.36},   # Screenshot 2 (rechts-links - bottom flat)
                 {"page": 2, "left": 1.14, "top": 20.47, "right": 48.43, "bottom": 64.22},   # Screenshot 3 (antagonist - main)
                 {"page": 2, "left": 11.00, "top": 80.74, "right": 78.01, "bottom": 89.20},  # Screenshot 4 (antagonist - bottom flat)
-            ]
-        elif strength_test_type == "Legs + shoulders":
+            ],
             # 4 screenshots: main1, flat1, main2, flat2 (standard two-page layout)
-            screenshots_config = [
+            "Legs + shoulders": [
                 {"page": 1, "left": 1.11, "top": 21.11, "right": 48.83, "bottom": 78.97},   # Screenshot 1 (rechts-links - main)
                 {"page": 1, "left": 8.09, "top": 81.47, "right": 82.68, "bottom": 89.36},   # Screenshot 2 (rechts-links - bottom flat)
                 {"page": 2, "left": 1.65, "top": 18.37, "right": 49.46, "bottom": 55.92},   # Screenshot 3 (antagonist - main)
                 {"page": 2, "left": 11.00, "top": 80.74, "right": 78.01, "bottom": 89.20},  # Screenshot 4 (antagonist - bottom flat)
-            ]
-        elif strength_test_type == "Legs":
+            ],
             # 4 screenshots: main1 (smaller), flat1, main2 (smaller), flat2
             # Smaller main screenshots so both sections fit on one page
-            screenshots_config = [
+            "Legs": [
                 {"page": 1, "left": 0.68, "top": 20.87, "right": 49.46, "bottom": 57.45},   # Screenshot 1 (rechts-links - main)
                 {"page": 1, "left": 8.09, "top": 81.47, "right": 82.68, "bottom": 89.36},   # Screenshot 2 (rechts-links - bottom flat)
                 {"page": 2, "left": 1.77, "top": 19.10, "right": 49.00, "bottom": 42.47},   # Screenshot 3 (antagonist - main)
                 {"page": 2, "left": 11.00, "top": 80.74, "right": 78.01, "bottom": 89.20},  # Screenshot 4 (antagonist - bottom flat)
-            ]
-        else:
+            ],
             # Default: Torso + legs - 4 screenshots (original coordinates)
-            screenshots_config = [
+            "Torso + legs": [
                 {"page": 1, "left": 0.85, "top": 19.98, "right": 48.43, "bottom": 78.97},   # Screenshot 1 (Kraftanalyse rechts-links - centered)
                 {"page": 1, "left": 8.09, "top": 81.47, "right": 82.68, "bottom": 89.36},   # Screenshot 2 (Kraftanalyse rechts-links - bottom)
                 {"page": 2, "left": 2.28, "top": 18.45, "right": 48.95, "bottom": 76.87},   # Screenshot 3 (Kraftanalyse Antagonist-Agonist - centered)
                 {"page": 2, "left": 11.00, "top": 80.74, "right": 78.01, "bottom": 89.20},  # Screenshot 4 (Kraftanalyse Antagonist-Agonist - bottom)
-            ]
+            ],
+        },
+    },
+    # Leg length examination screenshot (vgl.pdf)
+    "vgl": {
+        "result": "vgl_screenshot",
+        "label": "Vgl Screenshot",
+        "pdf": "vgl.pdf",
+        "single": True,
+        "when": {"leg_length_selected": "Ja"},
+        "crops": [
+            {"page": 1, "left": 2.17, "top": 15.55, "right": 59.09, "bottom": 90.09},
+        ],
+    },
+}
+
+# Layout spec written by the coordinate finder, next to report_config.json
+SCREENSHOT_LAYOUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "screenshot_layout.json")
+
+
+def get_screenshot_layout_path():
+    """Return the path of the layout spec file ("screenshot_layout_file" setting, else SCREENSHOT_LAYOUT_PATH)"""
+    return get_setting("screenshot_layout_file") or SCREENSHOT_LAYOUT_PATH
+
+
+def validate_layout_section(name, section):
+    """Return a list of problems with a layout section (empty if it can be used)"""
+    problems = []
+    if not isinstance(section, dict):
+        return [f"{name}: section must be an object"]
+    if not section.get('result') or section['result'] not in SCREENSHOT_RESULT_DEFAULTS:
+        problems.append(f"{name}: unknown result key {section.get('result')!r}")
+    if 'layouts' in section:
+        crop_lists = list(section['layouts'].items()) if isinstance(section['layouts'], dict) else []
+        if not crop_lists:
+            problems.append(f"{name}: 'layouts' must be an object of crop lists")
+        elif section.get('default_layout') not in section['layouts']:
+            problems.append(f"{name}: default_layout {section.get('default_layout')!r} is not in 'layouts'")
+    else:
+        crop_lists = [("crops", section.get('crops'))]
+    for crops_name, crops in crop_lists:
+        if not isinstance(crops, list) or not crops:
+            problems.append(f"{name}/{crops_name}: needs a list of crops")
+            continue
+        for i, crop in enumerate(crops, 1):
+            try:
+                valid = (int(crop['page']) >= 1
+                         and 0 <= float(crop['left']) < float(crop['right']) <= 100
+                         and 0 <= float(crop['top']) < float(crop['bottom']) <= 100)
+            except (KeyError, TypeError, ValueError):
+                valid = False
+            if not valid:
+                problems.append(f"{name}/{crops_name} crop {i}: needs page >= 1 and 0 <= left < right <= 100, "
+                                f"0 <= top < bottom <= 100")
+            elif not crop.get('pdf', section.get('pdf')):
+                problems.append(f"{name}/{crops_name} crop {i}: no pdf for the section or the crop")
+    return problems
+
+
+def load_screenshot_layout(layout_path=None):
+    """
+    Return the screenshot layout spec: DEFAULT_SCREENSHOT_LAYOUT with the sections from the layout
+    spec file replacing the built-in ones. Invalid sections are reported and the built-in one is used.
+    """
+    layout = copy.deepcopy(DEFAULT_SCREENSHOT_LAYOUT)
+    if layout_path is None:
+        layout_path = get_screenshot_layout_path()
+    if not os.path.exists(layout_path):
+        return layout
+    try:
+        with open(layout_path, 'r', encoding='utf-8') as f:
+            sections = json.load(f).get('sections', {})
+    except Exception as e:
+        print(f"Error loading screenshot layout {layout_path}: {e}")
+        return layout
+    for name, section in sections.items():
+        problems = validate_layout_section(name, section)
+        if problems:
+            print(f"Warning: Ignoring layout section '{name}' from {layout_path}:")
+            for problem in problems:
+                print(f"  {problem}")
+            continue
+        layout[name] = section
+    return layout
+
+
+def save_screenshot_layout(layout, layout_path=None):
+    """Write the complete layout spec to the layout spec file"""
+    if layout_path is None:
+        layout_path = get_screenshot_layout_path()
+    temp_path = layout_path + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({'sections': layout}, f, indent=2, ensure_ascii=False)
+    os.replace(temp_path, layout_path)
+
+
+def layout_section_crops(section, answers=None):
+    """Return (layout name or None, crop list) of a section for the wizard answers"""
+    if 'layouts' not in section:
+        return None, section['crops']
+    layout_name = (answers or {}).get(section['layout_by']) or section['default_layout']
+    if layout_name not in section['layouts']:
+        layout_name = section['default_layout']
+    return layout_name, section['layouts'][layout_name]
+
+
+def update_layout_crop(section_name, index, coordinates, page=None, layout_name=None, layout_path=None):
+    """
+    Store coordinates from the coordinate finder ({'left_pct', 'top_pct', 'right_pct', 'bottom_pct'})
+    as crop number index (1-based) of a layout section and save the layout spec file.
+    Raises ValueError for an unknown section, layout or crop number.
+    """
+    layout = load_screenshot_layout(layout_path)
+    if section_name not in layout:
+        raise ValueError(f"Unknown layout section '{section_name}' (known: {', '.join(layout)})")
+    section = layout[section_name]
+    if 'layouts' in section:
+        if layout_name is None:
+            layout_name = section['default_layout']
+        if layout_name not in section['layouts']:
+            raise ValueError(f"Unknown layout '{layout_name}' in section '{section_name}'")
+        crops = section['layouts'][layout_name]
+    else:
+        crops = section['crops']
+    if not 1 <= index <= len(crops):
+        raise ValueError(f"Section '{section_name}' has crops 1 to {len(crops)}, not {index}")
+    crop = crops[index - 1]
+    for side in ("left", "top", "right", "bottom"):
+        crop[side] = round(coordinates[f"{side}_pct"], 2)
+    if page is not None:
+        crop['page'] = page
+    save_screenshot_layout(layout, layout_path)
+    print(f"Saved {section_name} crop {index} to {layout_path or get_screenshot_layout_path()}")
+
+
+def parse_layout_target(target):
+    """Parse a crop reference like "statik 3" or "kraft/Legs 2" into (section, layout name or None, index)"""
+    name, _, index = target.strip().rpartition(" ")
+    section_name, _, layout_name = name.strip().partition("/")
+    if not section_name or not index.isdigit():
+        raise ValueError(f"Expected 'section number' or 'section/layout number', got '{target}'")
+    return section_name.strip(), layout_name.strip() or None, int(index)
+
+
+# Result of every extraction task when its PDF is missing from the folder
+SCREENSHOT_RESULT_DEFAULTS = {
+    'screenshot_path': None,
+    'statik_screenshots': [],
+    'gehen_screenshots': [],
+    'ios_pedografie_screenshots': [],
+    'kraft_screenshots': [],
+    'vgl_screenshot': None,
+}
+
+
+def run_screenshot_job(job, renderer=None):
+    """
+    Crop the screenshots of one layout section (a job from plan_screenshot_tasks).
+    Returns the ScreenshotImage for single-screenshot sections (None on failure),
+    else the list of ScreenshotImage.
+    """
+    try:
+        screenshots = crop_screenshots(job['crops'], None, job['label'], renderer)
+        return screenshots[0] if job['single'] else screenshots
+
+    except CancelledError:
+        raise
+    except Exception as e:
+        print(f"Error cropping {job['section']} screenshots: {e}")
+        import traceback
+        traceback.print_exc()
+        return None if job['single'] else []
+    finally:
+        if renderer is None:
+            # Job in a worker process (one at a time): its PDFs are not used after it
+            close_pdf_documents()
+
+
+def plan_screenshot_tasks(folder_path, average_pdf_path, measurement_type, strength_test_type="Torso + legs",
+                          leg_length_selected=None, layout=None):
+    """
+    Build the screenshot extraction tasks for a measurement folder from the screenshot layout spec.
+    Returns list of (result key, run_screenshot_job, (job,)); sections whose PDFs are missing from
+    the folder get no task.
+    """
+    with trace_span("plan screenshots", "folder scan", measurement_type=measurement_type) as span:
+        if layout is None:
+            layout = load_screenshot_layout()
+        manifest = get_folder_manifest(folder_path)
+        answers = {
+            'measurement_type': measurement_type,
+            'strength_test_type': strength_test_type,
+            'leg_length_selected': leg_length_selected,
+        }
+
+        tasks = []
+        for name, section in layout.items():
+            if measurement_type not in section.get('measurement_types', [measurement_type]):
+                continue
+            if any(answers.get(key) != value for key, value in section.get('when', {}).items()):
+                continue
+            layout_name, crops = layout_section_crops(section, answers)
+
+            job_crops = []
+            missing = []
+            for crop in crops:
+                pdf_name = crop.get('pdf', section.get('pdf'))
+                pdf_path = average_pdf_path if pdf_name == "4d average" else manifest.path(pdf_name)
+                if not pdf_path:
+                    if pdf_name not in missing:
+                        missing.append(pdf_name)
+                    continue
+                job_crops.append(dict(crop, pdf=pdf_path))
+            if missing:
+                for pdf_name in missing:
+                    print(f"Warning: {pdf_name} not found in folder")
+                # The report places the screenshots of a section by position, so it is all or nothing
+                continue
+            for pdf_path in dict.fromkeys(crop['pdf'] for crop in job_crops):
+                print(f"Found {os.path.basename(pdf_path)}: {pdf_path}")
+
+            job = {
+                'section': name,
+                'layout': layout_name,
+                'label': section.get('label', f"{name} Screenshot"),
+                'single': bool(section.get('single')),
+                'crops': job_crops,
+            }
+            tasks.append((section['result'], run_screenshot_job, (job,)))
+
+        # Resolutions are planned over all sections, so a PDF cropped by several sections
+        # (e.g. statik.pdf as fallback average PDF) is rendered at one DPI
+        crops = [crop for _, _, (job,) in tasks for crop in job['crops']]
+        page_dpis = plan_render_dpi(crops)
+        for crop in crops:
+            crop['dpi'] = page_dpis[(crop['pdf'], crop['page'])]
+        span['tasks'] = len(tasks)
+    return tasks
+
+
+def collect_render_pages(tasks):
+    """
+    Collect every page the screenshot tasks from plan_screenshot_tasks will crop, over all sections,
+    so each page is rendered once (at the resolution planned for its PDF) in one poppler call per PDF.
+    Returns dict {pdf_path: {page number: dpi}}.
+    """
+    pages_by_pdf = {}
+    for _, _, (job,) in tasks:
+        for crop in job['crops']:
+            pages_by_pdf.setdefault(crop['pdf'], {})[crop['page']] = crop['dpi']
+    return pages_by_pdf
+
+
+def group_screenshot_tasks(tasks):
+    """
+    Group the tasks from plan_screenshot_tasks so that tasks cropping from the same PDF are in one
+    group (e.g. the average section and statik when statik.pdf is the fallback average PDF).
+    Returns list of task lists in task order.
+    """
+    groups = []  # (set of PDFs, tasks)
+    for task in tasks:
+        pdfs = {crop['pdf'] for crop in task[2][0]['crops']}
+        merged = [group for group in groups if group[0] & pdfs]
+        group = (pdfs, [])
+        for other in merged:
+            groups.remove(other)
+            group[0].update(other[0])
+            group[1].extend(other[1])
+        group[1].append(task)
+        groups.append(group)
+    order = {id(task): index for index, task in enumerate(tasks)}
+    return [sorted(group_tasks, key=lambda task: order[id(task)]) for _, group_tasks in groups]
+
+
+def run_screenshot_group(tasks, pages_by_pdf):
+    """
+    Run a group of tasks (see group_screenshot_tasks) in a worker process on one PageRenderer
+    planned with pages_by_pdf, so each of their pages is rasterized once. Returns the results in task order.
+    """
+    renderer = PageRenderer()
+    renderer.plan(pages_by_pdf)
+    try:
+        return [crop_function(*args, renderer=renderer) for _, crop_function, args in tasks]
+    finally:
+        # The group's PDFs are not used after it
+        close_pdf_documents()
 
-        screenshot_paths = []
 
-        for i, config in enumerate(screenshots_config, 1):
-            print(f"\nProcessing Kraft Screenshot {i} from page {config['page']}...")
+def expected_screenshot_counts(tasks):
+    """Return {result key: (number of crops, label)} for the tasks from plan_screenshot_tasks"""
+    return {key: (len(job['crops']), job['label']) for key, _, (job,) in tasks}
 
-            # Convert specific page at 300 DPI for high quality
-            images = convert_from_path(pdf_path, dpi=300, first_page=config['page'], last_page=config['page'])
-            if not images:
-                print(f"Warning: Could not convert page {config['page']}")
-                screenshot_paths.append(None)
-                continue
 
-            image = images[0]
-            img_width, img_height = image.size
+def extract_screenshots(tasks, pages_by_pdf=None, max_workers=None, cancel=None):
+    """
+    Run the screenshot extraction tasks from plan_screenshot_tasks concurrently in worker processes.
+    Tasks that crop from the same PDF go to the same worker (see group_screenshot_tasks), so every
+    page is rasterized by exactly one worker, each worker with its own PageRenderer.
+    max_workers defaults to the "extraction_workers" setting, else the number of CPU cores, and is
+    lowered where the workers' shares of the render memory budget would not hold a page;
+    with one worker the tasks run in this process on a shared renderer planned with pages_by_pdf.
+    Setting the optional cancel event stops the extraction: tasks not started yet are dropped and
+    CancelledError is raised (worker processes finish the task they are on, but are not waited for).
+    Returns dict {result key: ScreenshotImage or list of them} with every key of SCREENSHOT_RESULT_DEFAULTS.
+    """
+    results = {key: (list(value) if isinstance(value, list) else value)
+               for key, value in SCREENSHOT_RESULT_DEFAULTS.items()}
+    if max_workers is None:
+        max_workers = get_setting("extraction_workers") or os.cpu_count() or 1
+    groups = group_screenshot_tasks(tasks)
+    max_workers = max(1, min(int(max_workers), len(groups)))
+    if max_workers > 1:
+        dpis = [page_dpi for pages in (pages_by_pdf or {}).values()
+                for _, page_dpi in PageRenderer._page_dpis(pages, RENDER_DPI)]
+        max_workers = limit_render_processes(max_workers, max(dpis, default=None))
+
+    def check_cancelled():
+        if cancel is not None and cancel.is_set():
+            raise CancelledError("Screenshot extraction was cancelled")
+
+    pending = list(tasks)
+    if max_workers > 1:
+        executor = None
+        try:
+            trace = _active_trace
+            executor = ProcessPoolExecutor(max_workers=max_workers, initializer=init_render_worker,
+                                           initargs=(max_workers,))
+            futures = []
+            for group in groups:
+                group_pdfs = {crop['pdf'] for _, _, (job,) in group for crop in job['crops']}
+                if pages_by_pdf:
+                    group_pages = {pdf: pages for pdf, pages in pages_by_pdf.items() if pdf in group_pdfs}
+                else:
+                    group_pages = collect_render_pages(group)
+                if trace is None:
+                    futures.append((group, executor.submit(run_screenshot_group, group, group_pages)))
+                else:
+                    # Workers record their spans into their own trace and hand them back
+                    futures.append((group, executor.submit(run_traced, run_screenshot_group, group, group_pages)))
+            for group, future in futures:
+                # Wait in short steps so a cancel is noticed while a worker is still busy
+                while not wait([future], timeout=0.2).done:
+                    check_cancelled()
+                if trace is None:
+                    group_results = future.result()
+                else:
+                    group_results, spans = future.result()
+                    trace.extend(spans)
+                for (key, _, _), result in zip(group, group_results):
+                    results[key] = result
+                pending = [task for task in pending if all(task is not done for done in group)]
+            return results
+        except CancelledError:
+            raise
+        except Exception as e:
+            # e.g. broken pool or no process support; finish the remaining tasks here
+            print(f"Warning: Parallel screenshot extraction failed ({e}), continuing in this process")
+        finally:
+            if executor is not None:
+                cancelled = cancel is not None and cancel.is_set()
+                executor.shutdown(wait=not cancelled, cancel_futures=cancelled)
+
+    renderer = PageRenderer(cancel=cancel)
+    if pages_by_pdf:
+        renderer.plan(pages_by_pdf)
+    for key, crop_function, args in pending:
+        check_cancelled()
+        results[key] = crop_function(*args, renderer=renderer)
+    return results
+
+
+def release_screenshots(screenshots):
+    """Drop the in-memory screenshots of an extraction result ({result key: image or image list})"""
+    for key, value in SCREENSHOT_RESULT_DEFAULTS.items():
+        if key in screenshots:
+            screenshots[key] = list(value) if isinstance(value, list) else value
+
+
+class ScreenshotExtraction:
+    """Screenshot extraction running in a background thread.
+
+    Started as soon as the measurement folder is known, so rendering overlaps with the
+    remaining wizard dialogs; result() waits for whatever is not finished yet.
+    cancel() stops an extraction that is no longer needed, join() waits until it has stopped.
+    """
+    def __init__(self, tasks, pages_by_pdf=None):
+        self.tasks = tasks
+        self._future = Future()
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(tasks, pages_by_pdf), daemon=True)
+        self._thread.start()
+
+    def _run(self, tasks, pages_by_pdf):
+        try:
+            self._future.set_result(extract_screenshots(tasks, pages_by_pdf, cancel=self._cancel))
+        except CancelledError as e:
+            print("Screenshot extraction cancelled")
+            self._future.set_exception(e)
+        except Exception as e:
+            print(f"Error extracting screenshots: {e}")
+            import traceback
+            traceback.print_exc()
+            self._future.set_exception(e)
+
+    def done(self):
+        return self._future.done()
 
-            # Calculate crop coordinates from percentages
-            left = int((config['left'] / 100) * img_width)
-            top = int((config['top'] / 100) * img_height)
-            right = int((config['right'] / 100) * img_width)
-            bottom = int((config['bottom'] / 100) * img_height)
+    def cancel(self):
+        """Stop the extraction after the page being rendered in this process"""
+        self._cancel.set()
 
-            # Crop the image
-            cropped_image = image.crop((left, top, right, bottom))
-            crop_width, crop_height = cropped_image.size
-            print(f"Kraft Screenshot {i} cropped: {crop_width}x{crop_height} pixels")
+    def join(self, timeout=None):
+        """Wait until the extraction thread has finished (or stopped after cancel())"""
+        self._thread.join(timeout)
 
-            # Save to temporary file
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-            cropped_image.save(temp_file.name, 'PNG', quality=95)
-            screenshot_paths.append(temp_file.name)
+    def result(self, timeout=None):
+        """Wait for the extraction and return its result dict (see extract_screenshots)"""
+        return self._future.result(timeout)
 
-        return screenshot_paths
 
-    except Exception as e:
-        print(f"Error cropping kraft screenshots: {e}")
-        import traceback
-        traceback.print_exc()
-        return []
+# INI kinds of a measurement folder, matched as part of the file name (role "<kind> ini")
+FOLDER_INI_KINDS = ("4d average", "4d motion")
 
+# PDFs of a measurement folder with their own role (the file name); the layout spec names them the same way
+FOLDER_PDF_NAMES = ("4d_average.pdf", "statik.pdf", "gehen.pdf", "hp.pdf", "ios.pdf", "kraft.pdf", "vgl.pdf")
 
-def crop_laufen_screenshots(hp_pdf_path, ios_pdf_path):
-    """
-    Crop 8 screenshots from hp.pdf and ios.pdf using hardcoded coordinates.
-    Returns list of paths to temporary cropped image files.
-    Screenshots 1-7 from hp.pdf, Screenshot 8 from ios.pdf
+# The PDF for the 4D average screenshot and patient info (role "average pdf"), in order of preference
+AVERAGE_PDF_NAMES = ("4d_average.pdf", "statik.pdf")
+
+
+def folder_file_role(filename):
+    """Return the role of a file in a measurement folder (e.g. "statik.pdf", "4d motion ini") or None"""
+    name = filename.lower()
+    if name in FOLDER_PDF_NAMES:
+        return name
+    if name.endswith('.ini'):
+        for kind in FOLDER_INI_KINDS:
+            if kind in name:
+                return f"{kind} ini"
+    return None
+
+
+class FolderManifest:
+    """The files of a measurement folder, listed with a single os.scandir pass.
+
+    Every file is recorded with its role (see folder_file_role), size and mtime; on Windows
+    these come with the directory listing, so a folder on a network share costs one round
+    trip instead of one per probed file. PDF page counts are read on first use and kept.
     """
-    try:
-        # Hardcoded crop coordinates for 8 screenshots
-        # Screenshots 1-7 from hp.pdf, Screenshot 8 from ios.pdf
-        screenshots_config = [
-            {"pdf": hp_pdf_path, "page": 1, "left": 33.45, "top": 15.71, "right": 92.08, "bottom": 90.73},  # Screenshot 1
-            {"pdf": hp_pdf_path, "page": 2, "left": 0.40, "top": 16.36, "right": 37.09, "bottom": 84.93},   # Screenshot 2
-            {"pdf": hp_pdf_path, "page": 3, "left": 14.02, "top": 18.69, "right": 92.14, "bottom": 77.20},  # Screenshot 3
-            {"pdf": hp_pdf_path, "page": 6, "left": 11.97, "top": 18.45, "right": 91.97, "bottom": 81.55},  # Screenshot 4
-            {"pdf": hp_pdf_path, "page": 4, "left": 1.48, "top": 15.47, "right": 92.93, "bottom": 87.11},   # Screenshot 5
-            {"pdf": hp_pdf_path, "page": 5, "left": 0.85, "top": 14.59, "right": 93.73, "bottom": 86.30},   # Screenshot 6
-            {"pdf": hp_pdf_path, "page": 8, "left": 3.25, "top": 20.31, "right": 93.39, "bottom": 87.11},   # Screenshot 7
-            {"pdf": ios_pdf_path, "page": 1, "left": 1.99, "top": 18.86, "right": 93.68, "bottom": 87.35},  # Screenshot 8
-        ]
+    def __init__(self, folder_path, entries):
+        self.folder_path = folder_path
+        self.entries = entries  # dicts with name, path, role, size, mtime_ns, pages (None until read)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def scan(cls, folder_path):
+        """List folder_path once; raises OSError if it can not be read"""
+        entries = []
+        with trace_span("scan folder", "folder scan") as span:
+            with os.scandir(folder_path) as listing:
+                for entry in listing:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                    entries.append({
+                        'name': entry.name,
+                        'path': os.path.join(folder_path, entry.name),
+                        'role': folder_file_role(entry.name),
+                        'size': stat.st_size,
+                        'mtime_ns': stat.st_mtime_ns,
+                        'pages': None,
+                    })
+            span['entries'] = len(entries)
+        return cls(folder_path, entries)
+
+    def find(self, role):
+        """
+        Return the entry of a role, or None: a PDF name from FOLDER_PDF_NAMES, "<kind> ini" (the first
+        matching file) or "average pdf" (the first of AVERAGE_PDF_NAMES that is there)
+        """
+        if role == "average pdf":
+            return next((entry for entry in map(self.find, AVERAGE_PDF_NAMES) if entry), None)
+        return next((entry for entry in self.entries if entry['role'] == role or entry['name'].lower() == role),
+                    None)
+
+    def path(self, role):
+        """Return the path of the file with this role, or None"""
+        entry = self.find(role)
+        return entry['path'] if entry else None
+
+    def page_count(self, role):
+        """Return the number of pages of the PDF with this role (None if it is missing or unreadable)"""
+        entry = self.find(role)
+        if entry is None:
+            return None
+        with self._lock:
+            if entry['pages'] is not None:
+                return entry['pages']
+        try:
+            pages = get_pdf_document(entry['path']).page_count()
+        except Exception as e:
+            print(f"Warning: Could not read the page count of {entry['name']}: {e}")
+            return None
+        with self._lock:
+            entry['pages'] = pages
+        return pages
 
-        screenshot_paths = []
+    def missing(self, needed):
+        """Return the items of needed_folder_files that are not in the folder"""
+        return [item for item in needed if self.find(item['role']) is None]
 
-        for i, config in enumerate(screenshots_config, 1):
-            print(f"\nProcessing Laufen Screenshot {i} from {config['pdf']} page {config['page']}...")
 
-            # Convert specific page at 300 DPI for high quality
-            images = convert_from_path(config['pdf'], dpi=300, first_page=config['page'], last_page=config['page'])
-            if not images:
-                print(f"Warning: Could not convert page {config['page']} from {config['pdf']}")
-                screenshot_paths.append(None)
-                continue
+# Manifests of the folders scanned in this process: abs folder path -> FolderManifest
+_folder_manifests = {}
+_folder_manifests_lock = threading.Lock()
 
-            image = images[0]
-            img_width, img_height = image.size
 
-            # Calculate crop coordinates from percentages
-            left = int((config['left'] / 100) * img_width)
-            top = int((config['top'] / 100) * img_height)
-            right = int((config['right'] / 100) * img_width)
-            bottom = int((config['bottom'] / 100) * img_height)
+def scan_measurement_folder(folder_path):
+    """Scan a measurement folder (again) and keep its manifest for the later steps"""
+    manifest = FolderManifest.scan(folder_path)
+    with _folder_manifests_lock:
+        _folder_manifests[os.path.abspath(folder_path)] = manifest
+    return manifest
 
-            # Crop the image
-            cropped_image = image.crop((left, top, right, bottom))
-            crop_width, crop_height = cropped_image.size
-            print(f"Laufen Screenshot {i} cropped: {crop_width}x{crop_height} pixels")
 
-            # Save to temporary file
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-            cropped_image.save(temp_file.name, 'PNG', quality=95)
-            screenshot_paths.append(temp_file.name)
+def get_folder_manifest(folder_path):
+    """Return the manifest of a measurement folder, scanning it only if it has not been scanned yet"""
+    with _folder_manifests_lock:
+        manifest = _folder_manifests.get(os.path.abspath(folder_path))
+    return manifest or scan_measurement_folder(folder_path)
 
-        return screenshot_paths
 
-    except Exception as e:
-        print(f"Error cropping laufen screenshots: {e}")
-        import traceback
-        traceback.print_exc()
-        return []
+# File system types of network shares in /proc/mounts
+NETWORK_FILESYSTEMS = ("cifs", "smb3", "smbfs", "nfs", "nfs4", "afpfs", "fuse.sshfs")
+
+
+def is_network_path(path):
+    """Return True if path is on a network share (UNC path or mapped network drive, on Linux a network mount)"""
+    abs_path = os.path.abspath(path)
+    if sys.platform == "win32":
+        if abs_path.startswith("\\\\"):
+            return True
+        try:
+            import ctypes
+
+            # DRIVE_REMOTE
+            return ctypes.windll.kernel32.GetDriveTypeW(os.path.splitdrive(abs_path)[0] + "\\") == 4
+        except Exception:
+            return False
+    # The file system of the longest mount point containing the path
+    mount_point, fs_type = "", ""
+    try:
+        with open("/proc/mounts", 'r') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) < 3:
+                    continue
+                point = parts[1].replace("\\040", " ")
+                if (abs_path == point or abs_path.startswith(point.rstrip("/") + "/")) and len(point) > len(mount_point):
+                    mount_point, fs_type = point, parts[2]
+    except OSError:
+        return False
+    return fs_type in NETWORK_FILESYSTEMS
+
+
+def get_staging_dir():
+    """Local folder for staged measurement folders: "staging_dir" setting, else a folder in the temp directory"""
+    return get_setting("staging_dir") or os.path.join(tempfile.gettempdir(), "ml_report_staging")
 
 
-def crop_ios_pedografie_screenshots(pdf_path):
+def stage_measurement_folder(folder_path, manifest=None, evict=True):
     """
-    Crop 2 screenshots from ios.pdf for Dynamische Pedografie section.
-    Uses same coordinates as gehen screenshots 7 and 8 (pages 7 and 8).
-    Returns list of paths to temporary cropped image files.
+    Copy the files of a measurement folder that have a role (PDFs and INIs) to a local staging folder in
+    one sequential pass, so poppler and the parsers read local files instead of the network share.
+    Files whose size and mtime are unchanged since they were last staged are not copied again.
+    Setting "staging": "auto" (default, only folders on network shares), true (always) or false.
+    With evict the other staged folders are then trimmed to the size cap (see evict_staging); batch
+    runs pass evict=False and evict from the parent process, where no worker is still reading a folder.
+    Returns the manifest of the local copy (its folder_path is the folder to work in), or the manifest
+    of folder_path itself if the folder is not staged or staging fails.
     """
-    try:
-        # Same coordinates as gehen screenshots 7 and 8, but from pages 1 and 2 of ios.pdf
-        screenshots_config = [
-            {"page": 1, "left": 3.13, "top": 19.10, "right": 94.02, "bottom": 87.11},   # Screenshot 1 (same coords as gehen screenshot 7)
-            {"page": 2, "left": 14.36, "top": 18.69, "right": 93.90, "bottom": 84.05},  # Screenshot 2 (same coords as gehen screenshot 8)
-        ]
+    import hashlib
+    import shutil
 
-        screenshot_paths = []
+    if manifest is None:
+        manifest = get_folder_manifest(folder_path)
+    mode = get_setting("staging", "auto")
+    if not mode or (mode == "auto" and not is_network_path(folder_path)):
+        return manifest
 
-        for i, config in enumerate(screenshots_config, 1):
-            print(f"\nProcessing IOS Pedografie Screenshot {i} from page {config['page']}...")
+    stage_dir = os.path.join(get_staging_dir(),
+                             hashlib.sha256(os.path.abspath(folder_path).encode('utf-8')).hexdigest()[:16])
+    files_dir = os.path.join(stage_dir, "files")
+    index_path = os.path.join(stage_dir, "index.json")
+    try:
+        with trace_span("stage folder", "staging") as span:
+            os.makedirs(files_dir, exist_ok=True)
+            os.makedirs(os.path.join(stage_dir, "output"), exist_ok=True)
+            try:
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    # file name -> [size, mtime_ns] of the source file it was copied from
+                    index = json.load(f)
+            except (OSError, ValueError):
+                index = {}
+
+            entries = []
+            copied_bytes = 0
+            for entry in manifest.entries:
+                if entry['role'] is None:
+                    continue
+                local_path = os.path.join(files_dir, entry['name'])
+                source = [entry['size'], entry['mtime_ns']]
+                if index.get(entry['name']) != source or not os.path.exists(local_path):
+                    partial_path = f"{local_path}.{os.getpid()}.partial"
+                    shutil.copyfile(entry['path'], partial_path)
+                    os.replace(partial_path, local_path)
+                    index[entry['name']] = source
+                    copied_bytes += entry['size']
+                entries.append(dict(entry, path=local_path))
+
+            # Files that are no longer in the measurement folder
+            names = {entry['name'] for entry in entries}
+            for name in [name for name in index if name not in names]:
+                try:
+                    os.remove(os.path.join(files_dir, name))
+                except OSError:
+                    pass
+                del index[name]
+
+            partial_index = f"{index_path}.{os.getpid()}.partial"
+            with open(partial_index, 'w', encoding='utf-8') as f:
+                json.dump(index, f)
+            os.replace(partial_index, index_path)
+            span['files'] = len(entries)
+            span['copied_bytes'] = copied_bytes
+    except OSError as e:
+        print(f"Warning: Could not stage {folder_path} ({e}), reading it directly")
+        return manifest
+
+    print(f"Staged {folder_path} to {files_dir} ({copied_bytes / (1024 * 1024):.1f} MB copied)")
+    # From here on the local copies are used, do not keep the files on the share open
+    close_pdf_documents(folder_path)
+    staged = FolderManifest(files_dir, entries)
+    with _folder_manifests_lock:
+        _folder_manifests[os.path.abspath(files_dir)] = staged
+    if evict:
+        evict_staging(keep=stage_dir)
+    return staged
+
+
+def evict_staging(keep=None):
+    """Delete the least recently staged folders until the staging folder fits "staging_max_mb" (default 2048)"""
+    import shutil
 
-            # Convert specific page at 300 DPI for high quality
-            images = convert_from_path(pdf_path, dpi=300, first_page=config['page'], last_page=config['page'])
-            if not images:
-                print(f"Warning: Could not convert page {config['page']}")
-                screenshot_paths.append(None)
+    staging_dir = get_staging_dir()
+    max_bytes = float(get_setting("staging_max_mb", 2048)) * 1024 * 1024
+    stages = []
+    total_size = 0
+    try:
+        for stage in os.scandir(staging_dir):
+            if not stage.is_dir():
                 continue
+            size = 0
+            files_dir = os.path.join(stage.path, "files")
+            if os.path.isdir(files_dir):
+                size = sum(entry.stat().st_size for entry in os.scandir(files_dir) if entry.is_file())
+            index_path = os.path.join(stage.path, "index.json")
+            last_used = os.path.getmtime(index_path) if os.path.exists(index_path) else 0
+            stages.append((last_used, size, stage.path))
+            total_size += size
+    except OSError:
+        return
 
-            image = images[0]
-            img_width, img_height = image.size
+    for last_used, size, path in sorted(stages):
+        if total_size <= max_bytes:
+            break
+        if path == keep:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        total_size -= size
 
-            # Calculate crop coordinates from percentages
-            left = int((config['left'] / 100) * img_width)
-            top = int((config['top'] / 100) * img_height)
-            right = int((config['right'] / 100) * img_width)
-            bottom = int((config['bottom'] / 100) * img_height)
 
-            # Crop the image
-            cropped_image = image.crop((left, top, right, bottom))
-            crop_width, crop_height = cropped_image.size
-            print(f"IOS Pedografie Screenshot {i} cropped: {crop_width}x{crop_height} pixels")
+def staging_output_path(data, path):
+    """Local path a report file is written to before publish_report_file, or path itself if the folder is not staged"""
+    if path is None or not data.get('work_folder'):
+        return path
+    return os.path.join(os.path.dirname(data['work_folder']), "output", os.path.basename(path))
 
-            # Save to temporary file
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-            cropped_image.save(temp_file.name, 'PNG', quality=95)
-            screenshot_paths.append(temp_file.name)
 
-        return screenshot_paths
+def publish_report_files(targets):
+    """Publish the report files of {local path: final path} that exist (see publish_report_file)"""
+    for local_path, final_path in targets.items():
+        if local_path and os.path.exists(local_path):
+            publish_report_file(local_path, final_path)
+
+
+def publish_report_file(local_path, final_path):
+    """
+    Move a report file written in the staging folder to its place in the measurement folder.
+    It is copied under a temporary name next to final_path and then renamed, so a half-written
+    report never shows up on the share.
+    """
+    import shutil
+
+    if local_path == final_path:
+        return
+    partial_path = os.path.join(os.path.dirname(final_path), f".{os.path.basename(final_path)}.{os.getpid()}.partial")
+    with trace_span("publish", "save", file=os.path.basename(final_path), bytes=os.path.getsize(local_path)):
+        try:
+            shutil.copyfile(local_path, partial_path)
+            os.replace(partial_path, final_path)
+        except Exception:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+            raise
+    os.remove(local_path)
 
-    except Exception as e:
-        print(f"Error cropping ios pedografie screenshots: {e}")
-        import traceback
-        traceback.print_exc()
-        return []
 
+# Why a file only needed for some wizard answers is needed (by the "when" key of its layout section)
+FOLDER_FILE_NOTES = {"leg_length_selected": "for leg length examination"}
 
-def crop_gehen_screenshots(pdf_path):
+
+def needed_folder_files(measurement_type, leg_length_selected=None, layout=None):
     """
-    Crop 8 screenshots from gehen.pdf using hardcoded coordinates.
-    Returns list of paths to temporary cropped image files.
+    Return the files a measurement folder needs for a measurement type as dicts with role (see
+    FolderManifest.find), label (for the Needed Files dialog), required and blocking (no report without it).
+    The PDFs come from the screenshot layout spec. Files of sections that depend on an answer are
+    optional while leg_length_selected is not known (None), else required or left out.
     """
-    try:
-        # Hardcoded crop coordinates for 8 screenshots
-        screenshots_config = [
-            {"page": 1, "left": 33.05, "top": 16.20, "right": 90.48, "bottom": 86.87},  # Screenshot 1 (Dynamische Beckenanalyse)
-            {"page": 2, "left": 0.68, "top": 14.99, "right": 46.55, "bottom": 87.00},   # Screenshot 2 (Dynamische Wirbelsäulenanalyse)
-            {"page": 3, "left": 15.27, "top": 17.49, "right": 92.72, "bottom": 76.87},  # Screenshot 3 (Ganganalyse - page 3)
-            {"page": 5, "left": 13.73, "top": 18.69, "right": 92.08, "bottom": 80.82},  # Screenshot 4 (Ganganalyse - page 5)
-            {"page": 4, "left": 2.62, "top": 17.57, "right": 92.88, "bottom": 87.11},   # Screenshot 5 (Ganganalyse - page 4)
-            {"page": 6, "left": 1.82, "top": 22.24, "right": 93.56, "bottom": 96.37},   # Screenshot 6 (Ganganalyse - page 6)
-            {"page": 8, "left": 3.13, "top": 19.10, "right": 94.02, "bottom": 87.11},   # Screenshot 7 (Dynamische Pedografie - page 8)
-            {"page": 7, "left": 14.36, "top": 18.69, "right": 93.90, "bottom": 84.05},  # Screenshot 8 (Dynamische Pedografie - page 7)
-        ]
+    if layout is None:
+        layout = load_screenshot_layout()
+    answers = {'measurement_type': measurement_type, 'leg_length_selected': leg_length_selected}
+
+    needed = [{'role': "average pdf", 'label': "4d_average.pdf  (fallback: statik.pdf)",
+               'required': True, 'blocking': True}]
+    pdf_items = {}
+    for section in layout.values():
+        if measurement_type not in section.get('measurement_types', [measurement_type]):
+            continue
+        when = section.get('when', {})
+        if leg_length_selected is not None and any(answers.get(key) != value for key, value in when.items()):
+            continue
+        crop_lists = list(section['layouts'].values()) if 'layouts' in section else [section['crops']]
+        for crops in crop_lists:
+            for crop in crops:
+                pdf_name = crop.get('pdf', section.get('pdf'))
+                if pdf_name == "4d average" or pdf_name in pdf_items:
+                    continue
+                label = pdf_name
+                if when and leg_length_selected is None:
+                    notes = ", ".join(FOLDER_FILE_NOTES.get(key, f"if {key} is {value}") for key, value in when.items())
+                    label = f"{pdf_name}  (optional - {notes})"
+                # Files the user asked for with an answer stop the report, others only lose their screenshots
+                pdf_items[pdf_name] = {'role': pdf_name, 'label': label,
+                                       'required': not when or leg_length_selected is not None,
+                                       'blocking': bool(when) and leg_length_selected is not None}
+
+    optional = [item for item in pdf_items.values() if not item['required']]
+    needed.extend(item for item in pdf_items.values() if item['required'])
+    needed.append({'role': "4d average ini", 'label': ".ini file containing '4D average'",
+                   'required': True, 'blocking': True})
+    if measurement_type in ["Gehen", "Laufen"]:
+        needed.append({'role': "4d motion ini", 'label': ".ini file containing '4D motion'",
+                       'required': True, 'blocking': False})
+    return needed + optional
+
+
+def needed_pdf_pages(measurement_type, strength_test_type="Torso + legs", leg_length_selected=None, layout=None):
+    """
+    Return {role: highest page number} of the PDFs the screenshot layout crops for these answers
+    (role "average pdf" for the 4D average PDF, else the PDF name)
+    """
+    if layout is None:
+        layout = load_screenshot_layout()
+    answers = {
+        'measurement_type': measurement_type,
+        'strength_test_type': strength_test_type,
+        'leg_length_selected': leg_length_selected,
+    }
+    pages = {}
+    for section in layout.values():
+        if measurement_type not in section.get('measurement_types', [measurement_type]):
+            continue
+        if any(answers.get(key) != value for key, value in section.get('when', {}).items()):
+            continue
+        for crop in layout_section_crops(section, answers)[1]:
+            pdf_name = crop.get('pdf', section.get('pdf'))
+            role = "average pdf" if pdf_name == "4d average" else pdf_name
+            pages[role] = max(pages.get(role, 0), crop['page'])
+    return pages
+
+
+def needed_ini_lines(kind):
+    """Return (highest line number read by line, field name) for an INI kind; fields with a known label do not count"""
+    labels = get_setting("ini_field_labels", {}).get(kind, {})
+    lines = [(line, name) for name, line, _ in INI_FIELDS.get(kind, []) if not labels.get(name)]
+    return max(lines, default=(0, None))
+
+
+def count_ini_lines(ini_path, limit):
+    """Count the lines of a measurement INI file (UTF-16), reading no further than line limit"""
+    count = 0
+    with open(ini_path, 'r', encoding='utf-16') as f:
+        for _ in f:
+            count += 1
+            if count >= limit:
+                break
+    return count
+
+
+def preflight_measurement_folder(folder_path, measurement_type, strength_test_type="Torso + legs",
+                                 leg_length_selected=None, manifest=None, max_workers=8):
+    """
+    Check a measurement folder before anything is rendered: every needed file is there, every PDF has
+    the highest page its crops need (page counts only, read from the PDF trailers) and the INI files
+    have the lines the fields are read from (read up to that line). Files are checked in parallel
+    threads; with the pdfium backend the page counts are still read one PDF at a time (see _pdfium_lock).
+    Returns a list of issues as dicts with file, message and blocking (no report can be created).
+    """
+    with trace_span("preflight", "folder scan", measurement_type=measurement_type) as span:
+        if manifest is None:
+            manifest = get_folder_manifest(folder_path)
+        needed = needed_folder_files(measurement_type, leg_length_selected)
+        blocking_roles = {item['role'] for item in needed if item['blocking']}
+        issues = [{'file': item['label'], 'message': "not found", 'blocking': item['blocking']}
+                  for item in manifest.missing(needed)]
+
+        def check_pdf(role, last_page):
+            pages = manifest.page_count(role)
+            name = manifest.find(role)['name']
+            if pages is None:
+                return {'file': name, 'message': "could not be read", 'blocking': role in blocking_roles}
+            if pages < last_page:
+                return {'file': name, 'message': f"has {pages} pages, page {last_page} is needed",
+                        'blocking': role in blocking_roles}
+            return None
 
-        screenshot_paths = []
+        def check_ini(kind):
+            ini_path = manifest.path(f"{kind} ini")
+            last_line, field = needed_ini_lines(kind)
+            try:
+                lines = count_ini_lines(ini_path, last_line)
+            except Exception as e:
+                return {'file': os.path.basename(ini_path), 'message': f"could not be read ({e})",
+                        'blocking': f"{kind} ini" in blocking_roles}
+            if lines < last_line:
+                return {'file': os.path.basename(ini_path),
+                        'message': f"has {lines} lines, line {last_line} ({field}) is needed", 'blocking': False}
+            return None
 
-        for i, config in enumerate(screenshots_config, 1):
-            print(f"\nProcessing Gehen Screenshot {i} from page {config['page']}...")
+        checks = [(check_pdf, (role, last_page)) for role, last_page in
+                  needed_pdf_pages(measurement_type, strength_test_type, leg_length_selected).items()
+                  if manifest.find(role) is not None]
+        checks += [(check_ini, (kind,)) for kind in FOLDER_INI_KINDS
+                   if manifest.find(f"{kind} ini") is not None and needed_ini_lines(kind)[0]]
+        if checks:
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(checks)))) as executor:
+                futures = [executor.submit(check, *args) for check, args in checks]
+                issues.extend(issue for issue in (future.result() for future in futures) if issue)
+        span['checks'] = len(checks)
+        span['issues'] = len(issues)
+    return issues
+
+
+def format_preflight_issues(issues):
+    """One line per preflight issue for messages and the console"""
+    return "\n".join(f"  • {issue['file']}: {issue['message']}" for issue in issues)
+
+
+def report_save_path(folder_path, patient_name, export_format):
+    """Return the report path "<YYYY-MM-DD> Motionlab Report <last name>.odt/.pdf" inside the measurement folder"""
+    # Extract last name (patient_name is in "Nachname, Vorname" format)
+    if ',' in patient_name:
+        last_name = patient_name.split(',')[0].strip()
+    else:
+        last_name = patient_name.strip()
 
-            # Convert specific page at 300 DPI for high quality
-            images = convert_from_path(pdf_path, dpi=300, first_page=config['page'], last_page=config['page'])
-            if not images:
-                print(f"Warning: Could not convert page {config['page']}")
-                screenshot_paths.append(None)
-                continue
+    date_iso = datetime.now().strftime("%Y-%m-%d")
+    base_filename = f"{date_iso} Motionlab Report {last_name}"
+    extension = ".odt" if export_format == "ODT" else ".pdf"
+    return os.path.join(folder_path, base_filename + extension)
 
-            image = images[0]
-            img_width, img_height = image.size
 
-            # Calculate crop coordinates from percentages
-            left = int((config['left'] / 100) * img_width)
-            top = int((config['top'] / 100) * img_height)
-            right = int((config['right'] / 100) * img_width)
-            bottom = int((config['bottom'] / 100) * img_height)
+# Header band of page 1 with the patient name and measurement date, in percent of the page like a crop
+DEFAULT_PATIENT_INFO_REGION = {"left": 0, "top": 0, "right": 100, "bottom": 25}
 
-            # Crop the image
-            cropped_image = image.crop((left, top, right, bottom))
-            crop_width, crop_height = cropped_image.size
-            print(f"Gehen Screenshot {i} cropped: {crop_width}x{crop_height} pixels")
 
-            # Save to temporary file
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-            cropped_image.save(temp_file.name, 'PNG', quality=95)
-            screenshot_paths.append(temp_file.name)
+def parse_patient_info(text):
+    """
+    Find the patient name, date of birth and measurement date in page text.
+    Returns (patient_name, patient_dob, measurement_date), None for what is not found.
+    """
+    patient_name = None
+    patient_dob = None
+    measurement_date = None
+
+    # Extract name and DOB from "Name: First Last (* DD.MM.YYYY)"
+    name_pattern = r"Name:\s*([^(]+)\s*\(\*\s*(\d{2}\.\d{2}\.\d{4})\)"
+    name_match = re.search(name_pattern, text)
+    if name_match:
+        full_name = name_match.group(1).strip()
+        patient_dob = name_match.group(2).strip()
+
+        # Convert "First Last" to "Last, First"
+        name_parts = full_name.split()
+        if len(name_parts) >= 2:
+            first_name = name_parts[0]
+            last_name = " ".join(name_parts[1:])
+            patient_name = f"{last_name}, {first_name}"
+        else:
+            patient_name = full_name
 
-        return screenshot_paths
+    # Extract measurement date from "4D average vom DD.MM.YYYY"
+    date_pattern = r"4D average vom\s*(\d{2}\.\d{2}\.\d{4})"
+    date_match = re.search(date_pattern, text, re.IGNORECASE)
+    if date_match:
+        measurement_date = date_match.group(1).strip()
 
-    except Exception as e:
-        print(f"Error cropping gehen screenshots: {e}")
-        import traceback
-        traceback.print_exc()
-        return []
+    return patient_name, patient_dob, measurement_date
 
 
 def extract_patient_info_from_pdf(pdf_path):
     """
     Extract patient name, date of birth, and measurement date from PDF.
+    With the pdfium backend only the text in the header band of page 1 is read (setting
+    "patient_info_region", percent of the page like a crop, default DEFAULT_PATIENT_INFO_REGION, null
+    for the whole page); if anything is not found there, the whole page is read. PyPDF2 always reads
+    the whole page once.
     Returns (patient_name, patient_dob, measurement_date) as strings.
     Patient name is returned as "Last name, First name" format.
     """
     try:
-        with open(pdf_path, 'rb') as f:
-            reader = PyPDF2.PdfReader(f)
-            if len(reader.pages) == 0:
+        document = get_pdf_document(pdf_path)
+        with trace_span("patient info", "text extraction", pdf=os.path.basename(pdf_path)) as span:
+            if document.page_count() == 0:
                 return None, None, None
 
-            # Get text from first page
-            page = reader.pages[0]
-            text = page.extract_text()
+            region = get_setting("patient_info_region", DEFAULT_PATIENT_INFO_REGION)
+            if region and document.backend == "pdfium":
+                text = document.page_text(1, region)
+                info = parse_patient_info(text or "")
+                span['mode'] = "header"
+                span['chars'] = len(text or "")
+                if all(info):
+                    return info
+                print("Patient info not found in the header of the PDF, reading the whole first page")
 
+            # Get text from first page
+            text = document.page_text(1)
+            span['mode'] = "full page"
+            span['chars'] = len(text or "")
             if not text:
                 return None, None, None
-
-            patient_name = None
-            patient_dob = None
-            measurement_date = None
-
-            # Extract name and DOB from "Name: First Last (* DD.MM.YYYY)"
-            name_pattern = r"Name:\s*([^(]+)\s*\(\*\s*(\d{2}\.\d{2}\.\d{4})\)"
-            name_match = re.search(name_pattern, text)
-            if name_match:
-                full_name = name_match.group(1).strip()
-                patient_dob = name_match.group(2).strip()
-
-                # Convert "First Last" to "Last, First"
-                name_parts = full_name.split()
-                if len(name_parts) >= 2:
-                    first_name = name_parts[0]
-                    last_name = " ".join(name_parts[1:])
-                    patient_name = f"{last_name}, {first_name}"
-                else:
-                    patient_name = full_name
-
-            # Extract measurement date from "4D average vom DD.MM.YYYY"
-            date_pattern = r"4D average vom\s*(\d{2}\.\d{2}\.\d{4})"
-            date_match = re.search(date_pattern, text, re.IGNORECASE)
-            if date_match:
-                measurement_date = date_match.group(1).strip()
-
-            return patient_name, patient_dob, measurement_date
+            return parse_patient_info(text)
 
     except Exception as e:
         print(f"Error extracting patient info from PDF: {e}")
         return None, None, None
 
 
-def parse_ini_file(ini_path):
-    """Parse the .ini file and extract kyphosis, lordosis, and scoliosis data"""
+# Named values of the measurement INI files: (field, line number, value column), per INI kind
+# (the FOLDER_INI_KINDS). The line numbers are where the fields are in the current software
+# version; fields with a known label (setting "ini_field_labels", else a label learned from an
+# earlier file, see remember_ini_labels) are looked up by that label instead.
+INI_FIELDS = {
+    "4d average": [
+        ("sva_axis", 8, 1),
+        ("beckenhochstand", 11, 1),
+        ("kyphosis_angle", 25, 1),
+        ("lordosis_angle", 28, 1),
+        ("surface_rotation_left", 34, 1),
+        ("surface_rotation_right", 35, 1),
+        ("lateral_deviation_right", 40, 1),
+        ("lateral_deviation_left", 41, 1),
+        ("scoliosis_angle", 119, 1),
+    ],
+    "4d motion": [
+        ("pelvic_drop_mean", 11, 1),
+        ("pelvic_drop_min", 11, 2),
+        ("pelvic_drop_max", 11, 3),
+    ],
+}
+
+# Parsed INI files by (path, kind): (mtime_ns, size, IniRecord)
+_ini_records = {}
+
+# Labels learned from the INI files read (see remember_ini_labels), next to report_config.json
+INI_LABELS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ini_labels.json")
+
+
+def get_ini_labels_path():
+    """Return the path of the learned INI labels file ("ini_labels_file" setting, else INI_LABELS_PATH)"""
+    return get_setting("ini_labels_file") or INI_LABELS_PATH
+
+
+def load_learned_ini_labels():
+    """Return the learned INI labels {kind: {field: label}} (empty if there are none or the file is unreadable)"""
+    path = get_ini_labels_path()
+    if not os.path.exists(path):
+        return {}
     try:
-        with open(ini_path, 'r', encoding='utf-16') as f:
-            lines = f.readlines()
-
-        kyphosis_angle = None
-        lordosis_angle = None
-        scoliosis_angle = None
-        surface_rotation_left = None
-        surface_rotation_right = None
-        lateral_deviation_left = None
-        lateral_deviation_right = None
-        sva_axis = None
-        beckenhochstand = None
-
-        # Line 8 for SVA axis (index 7)
-        if len(lines) > 7:
-            parts = lines[7].split('\t')
-            if len(parts) >= 2:
-                value_str = parts[1].strip().replace(',', '.')
-                try:
-                    sva_axis = float(value_str)
-                except ValueError:
-                    pass
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"Warning: Could not read learned INI labels from {path}: {e}")
+        return {}
 
-        # Line 11 for Beckenhochstand (index 10)
-        if len(lines) > 10:
-            parts = lines[10].split('\t')
-            if len(parts) >= 2:
-                value_str = parts[1].strip().replace(',', '.')
-                try:
-                    beckenhochstand = float(value_str)
-                except ValueError:
-                    pass
 
-        # Line 25 for kyphosis (index 24)
-        if len(lines) > 24:
-            parts = lines[24].split('\t')
-            if len(parts) >= 2:
-                value_str = parts[1].strip().replace(',', '.')
-                try:
-                    kyphosis_angle = float(value_str)
-                except ValueError:
-                    pass
+def normalize_ini_label(label):
+    """Label text as used for lookups: case and whitespace do not matter"""
+    return " ".join(label.split()).casefold()
 
-        # Line 28 for lordosis (index 27)
-        if len(lines) > 27:
-            parts = lines[27].split('\t')
-            if len(parts) >= 2:
-                value_str = parts[1].strip().replace(',', '.')
-                try:
-                    lordosis_angle = float(value_str)
-                except ValueError:
-                    pass
 
-        # Line 119 for scoliosis (index 118)
-        if len(lines) > 118:
-            parts = lines[118].split('\t')
-            if len(parts) >= 2:
-                value_str = parts[1].strip().replace(',', '.')
-                try:
-                    scoliosis_angle = float(value_str)
-                except ValueError:
-                    pass
+def parse_ini_value(text):
+    """Return a number for values like "12,5" (German decimal comma), else the stripped text"""
+    text = text.strip()
+    try:
+        return float(text.replace(',', '.'))
+    except ValueError:
+        return text
 
-        # Line 34 for surface rotation left (index 33)
-        if len(lines) > 33:
-            parts = lines[33].split('\t')
-            if len(parts) >= 2:
-                value_str = parts[1].strip().replace(',', '.')
-                try:
-                    surface_rotation_left = float(value_str)
-                except ValueError:
-                    pass
 
-        # Line 35 for surface rotation right (index 34)
-        if len(lines) > 34:
-            parts = lines[34].split('\t')
-            if len(parts) >= 2:
-                value_str = parts[1].strip().replace(',', '.')
-                try:
-                    surface_rotation_right = float(value_str)
-                except ValueError:
-                    pass
+class IniRecord:
+    """Values of a measurement INI file: one tab separated row per line, label first.
 
-        # Line 40 for lateral deviation right (index 39)
-        if len(lines) > 39:
-            parts = lines[39].split('\t')
-            if len(parts) >= 2:
-                value_str = parts[1].strip().replace(',', '.')
-                try:
-                    lateral_deviation_right = float(value_str)
-                except ValueError:
-                    pass
+    All rows are kept (rows, indexed by label with row/value); the named fields of
+    INI_FIELDS are resolved once and available as attributes (None if not a number).
+    """
+    def __init__(self, path, kind, rows, error=None):
+        self.path = path
+        self.kind = kind
+        self.rows = rows
+        self.error = error
+        self.warnings = []
+        # Labels of the rows the fields were read from by line number, see remember_ini_labels
+        self.line_labels = {}
+        self._by_label = {}
+        self._label_counts = {}
+        for index, (label, _) in enumerate(rows):
+            key = normalize_ini_label(label)
+            self._by_label.setdefault(key, index)
+            self._label_counts[key] = self._label_counts.get(key, 0) + 1
+        self.fields = self._resolve_fields()
+
+    def _resolve_fields(self):
+        # Configured labels win over learned ones
+        labels = dict(load_learned_ini_labels().get(self.kind, {}))
+        labels.update(get_setting("ini_field_labels", {}).get(self.kind, {}))
+        fields = {}
+        for name, line, column in INI_FIELDS.get(self.kind, []):
+            index = None
+            if labels.get(name):
+                index = self._by_label.get(normalize_ini_label(labels[name]))
+                if index is None and self.rows:
+                    self.warnings.append(f"Label '{labels[name]}' for {name} not found in "
+                                         f"{os.path.basename(self.path)}, using line {line}")
+            if index is None and line <= len(self.rows):
+                index = line - 1
+                label = self.rows[index][0]
+                if label and self._label_counts[normalize_ini_label(label)] == 1:
+                    self.line_labels[name] = label
+            value = None
+            if index is not None:
+                values = self.rows[index][1]
+                if len(values) >= column and isinstance(values[column - 1], float):
+                    value = values[column - 1]
+            fields[name] = value
+        return fields
+
+    def __getattr__(self, name):
+        fields = self.__dict__.get('fields', {})
+        if name in fields:
+            return fields[name]
+        raise AttributeError(name)
+
+    def row(self, label):
+        """Return the values of the first row with this label (None if there is none)"""
+        index = self._by_label.get(normalize_ini_label(label))
+        return None if index is None else self.rows[index][1]
+
+    def value(self, label, column=1):
+        """Return the value in a column (1 = first value after the label) of a labelled row"""
+        values = self.row(label)
+        if values is None or len(values) < column:
+            return None
+        return values[column - 1]
 
-        # Line 41 for lateral deviation left (index 40)
-        if len(lines) > 40:
-            parts = lines[40].split('\t')
-            if len(parts) >= 2:
-                value_str = parts[1].strip().replace(',', '.')
-                try:
-                    lateral_deviation_left = float(value_str)
-                except ValueError:
-                    pass
+    def __repr__(self):
+        return f"<IniRecord {os.path.basename(self.path)} ({self.kind}), {len(self.rows)} rows>"
 
-        return (kyphosis_angle, lordosis_angle, scoliosis_angle,
-                surface_rotation_left, surface_rotation_right,
-                lateral_deviation_left, lateral_deviation_right, sva_axis, beckenhochstand)
+
+def read_ini_record(ini_path, kind="4d average"):
+    """
+    Read a measurement INI file (UTF-16) in one pass into an IniRecord.
+    Records are cached by path and modification time, so the wizard and create_report share one parse.
+    A file that cannot be read gives a record without rows and with error set (not cached).
+    """
+    try:
+        stat = os.stat(ini_path)
+        cached = _ini_records.get((ini_path, kind))
+        if cached and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        rows = []
+        with trace_span("ini parse", "ini parse", ini=os.path.basename(ini_path), kind=kind,
+                        bytes=stat.st_size) as span, open(ini_path, 'r', encoding='utf-16') as f:
+            for line in f:
+                label, *values = line.rstrip('\r\n').split('\t')
+                rows.append((label.strip(), [parse_ini_value(value) for value in values]))
+            span['rows'] = len(rows)
     except Exception as e:
-        messagebox.showerror("Error", f"Error parsing INI file: {e}")
-        return None, None, None, None, None, None, None, None, None
+        print(f"Error parsing INI file {ini_path}: {e}")
+        return IniRecord(ini_path, kind, [], error=str(e))
 
+    record = IniRecord(ini_path, kind, rows)
+    for warning in record.warnings:
+        print(f"Warning: {warning}")
+    _ini_records[(ini_path, kind)] = (stat.st_mtime_ns, stat.st_size, record)
+    return record
 
-def parse_motion_ini_file(ini_path):
-    """Parse the 4D motion .ini file and extract pelvic drop mean, min and max values"""
+
+def remember_ini_labels(record):
+    """
+    Store the labels of fields that were read by line number in the learned INI labels file
+    (see get_ini_labels_path; report_config.json is not changed), so later files are read by
+    label even if a software update inserts lines. Delete the file to forget them.
+    Only labels that occur once in the file are stored; configured and learned labels are kept.
+    """
+    if not record.line_labels:
+        return
+    configured = get_setting("ini_field_labels", {}).get(record.kind, {})
+    learned = load_learned_ini_labels()
+    labels = learned.setdefault(record.kind, {})
+    new_labels = {name: label for name, label in record.line_labels.items()
+                  if not labels.get(name) and not configured.get(name) and record.fields.get(name) is not None}
+    if not new_labels:
+        return
+    labels.update(new_labels)
+    path = get_ini_labels_path()
     try:
-        with open(ini_path, 'r', encoding='utf-16') as f:
-            lines = f.readlines()
-
-        pelvic_drop_mean = None
-        pelvic_drop_min = None
-        pelvic_drop_max = None
-
-        # Line 11 (index 10) for pelvic drop mean (column 2), min (column 3) and max (column 4)
-        if len(lines) > 10:
-            parts = lines[10].split('\t')
-            # Column 2 (index 1) for mean
-            if len(parts) >= 2:
-                value_str = parts[1].strip().replace(',', '.')
-                try:
-                    pelvic_drop_mean = float(value_str)
-                except ValueError:
-                    pass
-            # Column 3 (index 2) for min
-            if len(parts) >= 3:
-                value_str = parts[2].strip().replace(',', '.')
-                try:
-                    pelvic_drop_min = float(value_str)
-                except ValueError:
-                    pass
-            # Column 4 (index 3) for max
-            if len(parts) >= 4:
-                value_str = parts[3].strip().replace(',', '.')
-                try:
-                    pelvic_drop_max = float(value_str)
-                except ValueError:
-                    pass
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(learned, f, indent=2, ensure_ascii=False)
+    except OSError as e:
+        print(f"Warning: Could not save learned INI labels to {path}: {e}")
+        return
+    print(f"Learned INI labels from {os.path.basename(record.path)} saved to {path}: "
+          + ", ".join(f"{name} = '{label}'" for name, label in new_labels.items()))
 
-        return pelvic_drop_mean, pelvic_drop_min, pelvic_drop_max
-    except Exception as e:
-        print(f"Error parsing motion INI file: {e}")
-        return None, None, None
+
+def parse_ini_file(ini_path):
+    """Parse the .ini file and extract kyphosis, lordosis, and scoliosis data (all None if it cannot be read)"""
+    record = read_ini_record(ini_path, "4d average")
+    return (record.kyphosis_angle, record.lordosis_angle, record.scoliosis_angle,
+            record.surface_rotation_left, record.surface_rotation_right,
+            record.lateral_deviation_left, record.lateral_deviation_right, record.sva_axis, record.beckenhochstand)
+
+
+def parse_motion_ini_file(ini_path):
+    """Parse the 4D motion .ini file and extract pelvic drop mean, min and max values"""
+    record = read_ini_record(ini_path, "4d motion")
+    return record.pelvic_drop_mean, record.pelvic_drop_min, record.pelvic_drop_max
 
 
 def calculate_pelvic_drop_sentence(beckenhochstand, motion_mean, motion_min, motion_max):
@@ -926,6 +3432,22 @@ def create_report(patient_full_title, patient_name, patient_dob, report_creator,
                   screenshot_path=None, statik_screenshots=None, pelvic_drop_sentence=None, gehen_screenshots=None, kraft_screenshots=None,
                   beinachsen_texts=None, ganganalyse_texts=None, therapie_texts=None, measurement_type="Gehen", ios_pedografie_screenshots=None,
                   measurement_date=None, leg_length_texts=None, vgl_screenshot=None, strength_test_type="Torso + legs"):
+    """
+    Build the report and save it as ODT to odt_path.
+    Returns a list of warning messages for problems that did not stop the report (e.g. a missing logo).
+    """
+    from odf.opendocument import OpenDocumentText
+    from odf.draw import Frame, Image
+    from odf.text import P, List, ListItem, PageNumber, Span
+    from odf.table import Table, TableColumn, TableRow, TableCell
+    from odf.style import Style, TableColumnProperties, ParagraphProperties, TextProperties, ListLevelProperties, PageLayout, PageLayoutProperties, MasterPage, Footer, FooterStyle, TabStops, TabStop, HeaderFooterProperties
+    from odf.text import ListStyle, ListLevelStyleBullet
+    from PIL import Image as PILImage
+
+    warnings = []
+    # Time the parts of the document for the run trace
+    sections = TraceSections("create_report")
+    sections.start("styles")
     doc = OpenDocumentText()
 
     # Create page layout for first page (no footer)
@@ -1074,6 +3596,7 @@ def create_report(patient_full_title, patient_name, patient_dob, report_creator,
     first_page_style = Style(name="FirstPageStyle", family="paragraph", masterpagename="First")
     doc.styles.addElement(first_page_style)
 
+    sections.start("title page")
     # Add invisible paragraph to establish First master page (no footer on page 1)
     doc.text.addElement(P(text="", stylename="FirstPageContentStyle"))
 
@@ -1133,13 +3656,13 @@ def create_report(patient_full_title, patient_name, patient_dob, report_creator,
                 doc.text.addElement(centered_p_for_logo)
             else:
                 doc.text.addElement(P(text=f"Error adding second logo: {second_logo_path}"))
-                messagebox.showwarning("Second Logo Error", f"Could not embed second logo from {second_logo_path}")
+                warnings.append(f"Second Logo Error: Could not embed second logo from {second_logo_path}")
         except FileNotFoundError:
             doc.text.addElement(P(text=f"Second logo file not found: {second_logo_path}"))
-            messagebox.showerror("Second Logo Error", f"Second logo file not found at: {second_logo_path}")
+            warnings.append(f"Second Logo Error: Second logo file not found at: {second_logo_path}")
         except Exception as e:
             doc.text.addElement(P(text=f"Error adding second logo: {e}"))
-            messagebox.showerror("Second Logo Error", f"An error occurred while adding the second logo: {e}")
+            warnings.append(f"Second Logo Error: An error occurred while adding the second logo: {e}")
 
     # Add spacing before bottom logos to push them closer to page bottom
     for _ in range(9):
@@ -1192,13 +3715,13 @@ def create_report(patient_full_title, patient_name, patient_dob, report_creator,
                 left_logo_cell.addElement(logo_p)
             else:
                 left_logo_cell.addElement(P(text=f"Logo error: {logo_path}"))
-                messagebox.showwarning("Logo Error", f"Could not embed logo from {logo_path}")
+                warnings.append(f"Logo Error: Could not embed logo from {logo_path}")
         except FileNotFoundError:
             left_logo_cell.addElement(P(text=f"Logo file not found: {logo_path}"))
-            messagebox.showerror("Logo Error", f"Logo file not found at: {logo_path}")
+            warnings.append(f"Logo Error: Logo file not found at: {logo_path}")
         except Exception as e:
             left_logo_cell.addElement(P(text=f"Error adding logo: {e}"))
-            messagebox.showerror("Logo Error", f"An error occurred while adding the logo: {e}")
+            warnings.append(f"Logo Error: An error occurred while adding the logo: {e}")
     else:
         left_logo_cell.addElement(P(text=""))
 
@@ -1239,13 +3762,13 @@ def create_report(patient_full_title, patient_name, patient_dob, report_creator,
                 right_logo_cell.addElement(logo_p)
             else:
                 right_logo_cell.addElement(P(text=f"Logo 4 error: {logo_4_path}"))
-                messagebox.showwarning("Logo 4 Error", f"Could not embed logo 4 from {logo_4_path}")
+                warnings.append(f"Logo 4 Error: Could not embed logo 4 from {logo_4_path}")
         except FileNotFoundError:
             right_logo_cell.addElement(P(text=f"Logo 4 file not found: {logo_4_path}"))
-            messagebox.showerror("Logo 4 Error", f"Logo 4 file not found at: {logo_4_path}")
+            warnings.append(f"Logo 4 Error: Logo 4 file not found at: {logo_4_path}")
         except Exception as e:
             right_logo_cell.addElement(P(text=f"Error adding logo 4: {e}"))
-            messagebox.showerror("Logo 4 Error", f"An error occurred while adding logo 4: {e}")
+            warnings.append(f"Logo 4 Error: An error occurred while adding logo 4: {e}")
     else:
         right_logo_cell.addElement(P(text=""))
 
@@ -1253,6 +3776,7 @@ def create_report(patient_full_title, patient_name, patient_dob, report_creator,
     bottom_logos_table.addElement(bottom_logos_row)
     doc.text.addElement(bottom_logos_table)
 
+    sections.start("background")
     # Second Page Content - Hintergrund heading with page break
     doc.text.addElement(P(text="Hintergrund", stylename="HeadingWithBreakStyle"))
 
@@ -1271,13 +3795,20 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
     for segment in text_segments:
         doc.text.addElement(P(text=segment.strip(), stylename="BackgroundTextStyle"))
 
+    sections.start("static analysis")
     # Third Page Content - Static Analysis
     doc.text.addElement(P(text="Statische Analyse", stylename="HeadingPageBreakStyle"))
     doc.text.addElement(P(text=""))
 
-    # Parse INI file and generate analysis
-    (kyphosis_angle, lordosis_angle, scoliosis_angle,
-     surf_rot_left, surf_rot_right, lat_dev_left, lat_dev_right, sva_axis, beckenhochstand) = parse_ini_file(ini_path)
+    # Parse INI file and generate analysis (usually already parsed and cached by the wizard)
+    ini_record = read_ini_record(ini_path, "4d average")
+    warnings.extend(f"INI Warning: {warning}" for warning in ini_record.warnings)
+    kyphosis_angle = ini_record.kyphosis_angle
+    lordosis_angle = ini_record.lordosis_angle
+    scoliosis_angle = ini_record.scoliosis_angle
+    surf_rot_left, surf_rot_right = ini_record.surface_rotation_left, ini_record.surface_rotation_right
+    lat_dev_left, lat_dev_right = ini_record.lateral_deviation_left, ini_record.lateral_deviation_right
+    sva_axis = ini_record.sva_axis
 
     if kyphosis_angle is not None and lordosis_angle is not None and scoliosis_angle is not None:
         # Create bullet list
@@ -1324,18 +3855,18 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
 
         doc.text.addElement(bullet_list)
 
+        sections.start("4d average screenshot")
         # Add screenshot below bullet list if available
-        if screenshot_path and os.path.exists(screenshot_path):
+        if screenshot_available(screenshot_path):
             try:
                 # Add spacing before screenshot
                 doc.text.addElement(P(text=""))
 
                 # Get screenshot dimensions
-                with PILImage.open(screenshot_path) as screenshot_img:
-                    screenshot_width_px, screenshot_height_px = screenshot_img.size
+                screenshot_width_px, screenshot_height_px = screenshot_size(screenshot_path)
 
-                # Set image width to 16cm and calculate height maintaining aspect ratio
-                screenshot_frame_width_cm = 16.0
+                # Frame width from the layout spec, height maintaining the aspect ratio
+                screenshot_frame_width_cm = screenshot_frame_width(screenshot_path)
                 if screenshot_width_px > 0:
                     aspect_ratio = screenshot_height_px / screenshot_width_px
                 else:
@@ -1351,7 +3882,7 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                     height=f"{screenshot_frame_height_cm}cm",
                     anchortype="paragraph"
                 )
-                screenshot_href = doc.addPicture(screenshot_path)
+                screenshot_href = add_screenshot_picture(doc, screenshot_path)
                 if screenshot_href:
                     screenshot_frame.addElement(Image(href=screenshot_href))
                     centered_p_screenshot.addElement(screenshot_frame)
@@ -1365,8 +3896,9 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                 import traceback
                 traceback.print_exc()
 
+        sections.start("leg length")
         # Add leg length examination page (conditional)
-        if leg_length_texts and vgl_screenshot and os.path.exists(vgl_screenshot):
+        if leg_length_texts and screenshot_available(vgl_screenshot):
             # Page break with heading
             doc.text.addElement(P(text="Messergebnis Beinlängendifferenz", stylename="HeadingPageBreakStyle"))
 
@@ -1389,11 +3921,10 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
 
             # Add vgl screenshot (centered)
             try:
-                with PILImage.open(vgl_screenshot) as vgl_img:
-                    vgl_width_px, vgl_height_px = vgl_img.size
+                vgl_width_px, vgl_height_px = screenshot_size(vgl_screenshot)
 
-                # Set image width to 16cm and calculate height maintaining aspect ratio
-                vgl_frame_width_cm = 16.0
+                # Frame width from the layout spec, height maintaining the aspect ratio
+                vgl_frame_width_cm = screenshot_frame_width(vgl_screenshot)
                 if vgl_width_px > 0:
                     vgl_aspect_ratio = vgl_height_px / vgl_width_px
                 else:
@@ -1409,7 +3940,7 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                     height=f"{vgl_frame_height_cm}cm",
                     anchortype="paragraph"
                 )
-                vgl_href = doc.addPicture(vgl_screenshot)
+                vgl_href = add_screenshot_picture(doc, vgl_screenshot)
                 if vgl_href:
                     vgl_frame.addElement(Image(href=vgl_href))
                     centered_p_vgl.addElement(vgl_frame)
@@ -1423,6 +3954,7 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                 import traceback
                 traceback.print_exc()
 
+        sections.start("statik screenshots")
         # Add new section: Statische Beinachsen- und Haltungsanalyse
         if statik_screenshots and len(statik_screenshots) >= 7:
             # Page break before new section
@@ -1440,12 +3972,11 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
 
             # Add Screenshots 1 and 2 (16cm width, centered) - at the bottom
             for screenshot_idx in [0, 1]:  # Screenshots 1 and 2
-                if statik_screenshots[screenshot_idx] and os.path.exists(statik_screenshots[screenshot_idx]):
+                if screenshot_available(statik_screenshots[screenshot_idx]):
                     try:
-                        with PILImage.open(statik_screenshots[screenshot_idx]) as img:
-                            img_width_px, img_height_px = img.size
+                        img_width_px, img_height_px = screenshot_size(statik_screenshots[screenshot_idx])
 
-                        frame_width_cm = 16.0
+                        frame_width_cm = screenshot_frame_width(statik_screenshots[screenshot_idx])
                         aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1
                         frame_height_cm = frame_width_cm * aspect_ratio
 
@@ -1456,7 +3987,7 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                             height=f"{frame_height_cm}cm",
                             anchortype="paragraph"
                         )
-                        href = doc.addPicture(statik_screenshots[screenshot_idx])
+                        href = add_screenshot_picture(doc, statik_screenshots[screenshot_idx])
                         if href:
                             frame.addElement(Image(href=href))
                             centered_p.addElement(frame)
@@ -1471,12 +4002,11 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
 
             # Add Screenshots 3 and 4 (16cm width, centered)
             for screenshot_idx in [2, 3]:  # Screenshots 3 and 4
-                if statik_screenshots[screenshot_idx] and os.path.exists(statik_screenshots[screenshot_idx]):
+                if screenshot_available(statik_screenshots[screenshot_idx]):
                     try:
-                        with PILImage.open(statik_screenshots[screenshot_idx]) as img:
-                            img_width_px, img_height_px = img.size
+                        img_width_px, img_height_px = screenshot_size(statik_screenshots[screenshot_idx])
 
-                        frame_width_cm = 16.0
+                        frame_width_cm = screenshot_frame_width(statik_screenshots[screenshot_idx])
                         aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1
                         frame_height_cm = frame_width_cm * aspect_ratio
 
@@ -1487,7 +4017,7 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                             height=f"{frame_height_cm}cm",
                             anchortype="paragraph"
                         )
-                        href = doc.addPicture(statik_screenshots[screenshot_idx])
+                        href = add_screenshot_picture(doc, statik_screenshots[screenshot_idx])
                         if href:
                             frame.addElement(Image(href=href))
                             centered_p.addElement(frame)
@@ -1501,14 +4031,12 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
             doc.text.addElement(P(text="Statische Pedobarografie", stylename="HeadingPageBreakStyle"))
 
             # Add Screenshots 5, 6, 7 (16cm, 16cm, 8cm width, centered)
-            screenshot_widths = [16.0, 16.0, 8.0]  # Widths for screenshots 5, 6, 7
-            for i, screenshot_idx in enumerate([4, 5, 6]):  # Screenshots 5, 6, 7
-                if statik_screenshots[screenshot_idx] and os.path.exists(statik_screenshots[screenshot_idx]):
+            for screenshot_idx in [4, 5, 6]:  # Screenshots 5, 6, 7
+                if screenshot_available(statik_screenshots[screenshot_idx]):
                     try:
-                        with PILImage.open(statik_screenshots[screenshot_idx]) as img:
-                            img_width_px, img_height_px = img.size
+                        img_width_px, img_height_px = screenshot_size(statik_screenshots[screenshot_idx])
 
-                        frame_width_cm = screenshot_widths[i]
+                        frame_width_cm = screenshot_frame_width(statik_screenshots[screenshot_idx])
                         aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1
                         frame_height_cm = frame_width_cm * aspect_ratio
 
@@ -1519,17 +4047,18 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                             height=f"{frame_height_cm}cm",
                             anchortype="paragraph"
                         )
-                        href = doc.addPicture(statik_screenshots[screenshot_idx])
+                        href = add_screenshot_picture(doc, statik_screenshots[screenshot_idx])
                         if href:
                             frame.addElement(Image(href=href))
                             centered_p.addElement(frame)
                             doc.text.addElement(centered_p)
-                            if i < 2:  # Add spacing after first two images
+                            if screenshot_idx < 6:  # Add spacing after first two images
                                 doc.text.addElement(P(text=""))
                             print(f"Statik Screenshot {screenshot_idx + 1} inserted: {frame_width_cm}cm x {frame_height_cm:.2f}cm")
                     except Exception as e:
                         print(f"Error adding statik screenshot {screenshot_idx + 1}: {e}")
 
+        sections.start("pelvic analysis")
         # Add new section: Dynamische Beckenanalyse (only for Gehen/Laufen)
         if measurement_type in ["Gehen", "Laufen"] and pelvic_drop_sentence:
             # Page break before new section
@@ -1544,18 +4073,17 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
             doc.text.addElement(pelvic_bullet_list)
 
             # Add gehen screenshot 1 below pelvic drop sentence (if available)
-            if gehen_screenshots and len(gehen_screenshots) >= 1 and gehen_screenshots[0] and os.path.exists(gehen_screenshots[0]):
+            if gehen_screenshots and len(gehen_screenshots) >= 1 and screenshot_available(gehen_screenshots[0]):
                 try:
                     # Add 2 empty lines as spacing
                     doc.text.addElement(P(text=""))
                     doc.text.addElement(P(text=""))
 
                     # Get screenshot dimensions
-                    with PILImage.open(gehen_screenshots[0]) as img:
-                        img_width_px, img_height_px = img.size
+                    img_width_px, img_height_px = screenshot_size(gehen_screenshots[0])
 
-                    # Set width to 16cm and calculate height maintaining aspect ratio
-                    frame_width_cm = 16.0
+                    # Frame width from the layout spec, height maintaining the aspect ratio
+                    frame_width_cm = screenshot_frame_width(gehen_screenshots[0])
                     aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1
                     frame_height_cm = frame_width_cm * aspect_ratio
 
@@ -1567,7 +4095,7 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                         height=f"{frame_height_cm}cm",
                         anchortype="paragraph"
                     )
-                    href = doc.addPicture(gehen_screenshots[0])
+                    href = add_screenshot_picture(doc, gehen_screenshots[0])
                     if href:
                         frame.addElement(Image(href=href))
                         centered_p.addElement(frame)
@@ -1577,18 +4105,18 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                 except Exception as e:
                     print(f"Error adding gehen screenshot 1: {e}")
 
+        sections.start("spine analysis")
         # Add new section: Dynamische Wirbelsäulenanalyse with gehen screenshot 2 (only for Gehen/Laufen)
-        if measurement_type in ["Gehen", "Laufen"] and gehen_screenshots and len(gehen_screenshots) >= 2 and gehen_screenshots[1] and os.path.exists(gehen_screenshots[1]):
+        if measurement_type in ["Gehen", "Laufen"] and gehen_screenshots and len(gehen_screenshots) >= 2 and screenshot_available(gehen_screenshots[1]):
             try:
                 # Page break with heading
                 doc.text.addElement(P(text="Dynamische Wirbelsäulenanalyse", stylename="HeadingPageBreakStyle"))
 
                 # Get screenshot dimensions
-                with PILImage.open(gehen_screenshots[1]) as img:
-                    img_width_px, img_height_px = img.size
+                img_width_px, img_height_px = screenshot_size(gehen_screenshots[1])
 
-                # Set width to 16cm and calculate height maintaining aspect ratio
-                frame_width_cm = 16.0
+                # Frame width from the layout spec, height maintaining the aspect ratio
+                frame_width_cm = screenshot_frame_width(gehen_screenshots[1])
                 aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1
                 frame_height_cm = frame_width_cm * aspect_ratio
 
@@ -1600,7 +4128,7 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                     height=f"{frame_height_cm}cm",
                     anchortype="paragraph"
                 )
-                href = doc.addPicture(gehen_screenshots[1])
+                href = add_screenshot_picture(doc, gehen_screenshots[1])
                 if href:
                     frame.addElement(Image(href=href))
                     centered_p.addElement(frame)
@@ -1610,6 +4138,7 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
             except Exception as e:
                 print(f"Error adding gehen screenshot 2: {e}")
 
+        sections.start("gait analysis")
         # Add new section: Ganganalyse (only for Gehen/Laufen)
         if measurement_type in ["Gehen", "Laufen"] and gehen_screenshots and len(gehen_screenshots) >= 6:
             # Page break with heading - use "Laufanalyse" for Laufen, "Ganganalyse" for Gehen
@@ -1629,12 +4158,11 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
 
             # Add Screenshots 3 and 4 (indices 2 and 3) directly underneath each other
             for screenshot_idx in [2, 3]:  # Screenshots 3 and 4
-                if gehen_screenshots[screenshot_idx] and os.path.exists(gehen_screenshots[screenshot_idx]):
+                if screenshot_available(gehen_screenshots[screenshot_idx]):
                     try:
-                        with PILImage.open(gehen_screenshots[screenshot_idx]) as img:
-                            img_width_px, img_height_px = img.size
+                        img_width_px, img_height_px = screenshot_size(gehen_screenshots[screenshot_idx])
 
-                        frame_width_cm = 16.0
+                        frame_width_cm = screenshot_frame_width(gehen_screenshots[screenshot_idx])
                         aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1
                         frame_height_cm = frame_width_cm * aspect_ratio
 
@@ -1645,7 +4173,7 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                             height=f"{frame_height_cm}cm",
                             anchortype="paragraph"
                         )
-                        href = doc.addPicture(gehen_screenshots[screenshot_idx])
+                        href = add_screenshot_picture(doc, gehen_screenshots[screenshot_idx])
                         if href:
                             frame.addElement(Image(href=href))
                             centered_p.addElement(frame)
@@ -1659,12 +4187,11 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
 
             # Add Screenshots 5 and 6 (indices 4 and 5) directly underneath each other
             for screenshot_idx in [4, 5]:  # Screenshots 5 and 6
-                if gehen_screenshots[screenshot_idx] and os.path.exists(gehen_screenshots[screenshot_idx]):
+                if screenshot_available(gehen_screenshots[screenshot_idx]):
                     try:
-                        with PILImage.open(gehen_screenshots[screenshot_idx]) as img:
-                            img_width_px, img_height_px = img.size
+                        img_width_px, img_height_px = screenshot_size(gehen_screenshots[screenshot_idx])
 
-                        frame_width_cm = 16.0
+                        frame_width_cm = screenshot_frame_width(gehen_screenshots[screenshot_idx])
                         aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1
                         frame_height_cm = frame_width_cm * aspect_ratio
 
@@ -1675,7 +4202,7 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                             height=f"{frame_height_cm}cm",
                             anchortype="paragraph"
                         )
-                        href = doc.addPicture(gehen_screenshots[screenshot_idx])
+                        href = add_screenshot_picture(doc, gehen_screenshots[screenshot_idx])
                         if href:
                             frame.addElement(Image(href=href))
                             centered_p.addElement(frame)
@@ -1684,6 +4211,7 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                     except Exception as e:
                         print(f"Error adding gehen screenshot {screenshot_idx + 1}: {e}")
 
+        sections.start("pedography")
         # Add new section: Dynamische Pedografie
         # For Gehen/Laufen: use gehen_screenshots (indices 6 and 7)
         # For Statik/IOS: use ios_pedografie_screenshots (indices 0 and 1)
@@ -1701,12 +4229,11 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                 doc.text.addElement(P(text=""))
 
             # Add Screenshot 7 (index 6)
-            if gehen_screenshots[6] and os.path.exists(gehen_screenshots[6]):
+            if screenshot_available(gehen_screenshots[6]):
                 try:
-                    with PILImage.open(gehen_screenshots[6]) as img:
-                        img_width_px, img_height_px = img.size
+                    img_width_px, img_height_px = screenshot_size(gehen_screenshots[6])
 
-                    frame_width_cm = 16.0
+                    frame_width_cm = screenshot_frame_width(gehen_screenshots[6])
                     aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1
                     frame_height_cm = frame_width_cm * aspect_ratio
 
@@ -1717,7 +4244,7 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                         height=f"{frame_height_cm}cm",
                         anchortype="paragraph"
                     )
-                    href = doc.addPicture(gehen_screenshots[6])
+                    href = add_screenshot_picture(doc, gehen_screenshots[6])
                     if href:
                         frame.addElement(Image(href=href))
                         centered_p.addElement(frame)
@@ -1736,12 +4263,11 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                 doc.text.addElement(P(text=""))
 
             # Add Screenshot 8 (index 7)
-            if gehen_screenshots[7] and os.path.exists(gehen_screenshots[7]):
+            if screenshot_available(gehen_screenshots[7]):
                 try:
-                    with PILImage.open(gehen_screenshots[7]) as img:
-                        img_width_px, img_height_px = img.size
+                    img_width_px, img_height_px = screenshot_size(gehen_screenshots[7])
 
-                    frame_width_cm = 16.0
+                    frame_width_cm = screenshot_frame_width(gehen_screenshots[7])
                     aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1
                     frame_height_cm = frame_width_cm * aspect_ratio
 
@@ -1752,7 +4278,7 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                         height=f"{frame_height_cm}cm",
                         anchortype="paragraph"
                     )
-                    href = doc.addPicture(gehen_screenshots[7])
+                    href = add_screenshot_picture(doc, gehen_screenshots[7])
                     if href:
                         frame.addElement(Image(href=href))
                         centered_p.addElement(frame)
@@ -1770,12 +4296,11 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
             doc.text.addElement(P(text=""))
 
             # Add Screenshot 1 (index 0) from ios.pdf
-            if ios_pedografie_screenshots[0] and os.path.exists(ios_pedografie_screenshots[0]):
+            if screenshot_available(ios_pedografie_screenshots[0]):
                 try:
-                    with PILImage.open(ios_pedografie_screenshots[0]) as img:
-                        img_width_px, img_height_px = img.size
+                    img_width_px, img_height_px = screenshot_size(ios_pedografie_screenshots[0])
 
-                    frame_width_cm = 16.0
+                    frame_width_cm = screenshot_frame_width(ios_pedografie_screenshots[0])
                     aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1
                     frame_height_cm = frame_width_cm * aspect_ratio
 
@@ -1786,7 +4311,7 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                         height=f"{frame_height_cm}cm",
                         anchortype="paragraph"
                     )
-                    href = doc.addPicture(ios_pedografie_screenshots[0])
+                    href = add_screenshot_picture(doc, ios_pedografie_screenshots[0])
                     if href:
                         frame.addElement(Image(href=href))
                         centered_p.addElement(frame)
@@ -1800,12 +4325,11 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
             doc.text.addElement(P(text=""))
 
             # Add Screenshot 2 (index 1) from ios.pdf
-            if ios_pedografie_screenshots[1] and os.path.exists(ios_pedografie_screenshots[1]):
+            if screenshot_available(ios_pedografie_screenshots[1]):
                 try:
-                    with PILImage.open(ios_pedografie_screenshots[1]) as img:
-                        img_width_px, img_height_px = img.size
+                    img_width_px, img_height_px = screenshot_size(ios_pedografie_screenshots[1])
 
-                    frame_width_cm = 16.0
+                    frame_width_cm = screenshot_frame_width(ios_pedografie_screenshots[1])
                     aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1
                     frame_height_cm = frame_width_cm * aspect_ratio
 
@@ -1816,7 +4340,7 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                         height=f"{frame_height_cm}cm",
                         anchortype="paragraph"
                     )
-                    href = doc.addPicture(ios_pedografie_screenshots[1])
+                    href = add_screenshot_picture(doc, ios_pedografie_screenshots[1])
                     if href:
                         frame.addElement(Image(href=href))
                         centered_p.addElement(frame)
@@ -1825,6 +4349,7 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                 except Exception as e:
                     print(f"Error adding ios pedografie screenshot 2: {e}")
 
+        sections.start("strength analysis")
         # Add new section: Kraftanalyse Vergleich rechts - links
         # Layout depends on strength_test_type:
         # "Torso + legs" / "Torso + shoulders": indices [0]=main, [1]=flat, [2]=main, [3]=flat
@@ -1836,16 +4361,15 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                 doc.text.addElement(P(text=""))
 
                 # Main screenshot (index 0)
-                if kraft_screenshots[0] and os.path.exists(kraft_screenshots[0]):
+                if screenshot_available(kraft_screenshots[0]):
                     try:
-                        with PILImage.open(kraft_screenshots[0]) as img:
-                            img_width_px, img_height_px = img.size
-                        frame_width_cm = 16.0
+                        img_width_px, img_height_px = screenshot_size(kraft_screenshots[0])
+                        frame_width_cm = screenshot_frame_width(kraft_screenshots[0])
                         aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1
                         frame_height_cm = frame_width_cm * aspect_ratio
                         centered_p = P(stylename="CenterParagraph")
                         frame = Frame(name="KraftScreenshot1", width=f"{frame_width_cm}cm", height=f"{frame_height_cm}cm", anchortype="paragraph")
-                        href = doc.addPicture(kraft_screenshots[0])
+                        href = add_screenshot_picture(doc, kraft_screenshots[0])
                         if href:
                             frame.addElement(Image(href=href))
                             centered_p.addElement(frame)
@@ -1855,16 +4379,15 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                         print(f"Error adding kraft screenshot 1: {e}")
 
                 # Extra shoulders screenshot (index 1) - directly underneath
-                if kraft_screenshots[1] and os.path.exists(kraft_screenshots[1]):
+                if screenshot_available(kraft_screenshots[1]):
                     try:
-                        with PILImage.open(kraft_screenshots[1]) as img:
-                            img_width_px, img_height_px = img.size
-                        frame_width_cm = 16.0
+                        img_width_px, img_height_px = screenshot_size(kraft_screenshots[1])
+                        frame_width_cm = screenshot_frame_width(kraft_screenshots[1])
                         aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1
                         frame_height_cm = frame_width_cm * aspect_ratio
                         centered_p = P(stylename="CenterParagraph")
                         frame = Frame(name="KraftScreenshot2", width=f"{frame_width_cm}cm", height=f"{frame_height_cm}cm", anchortype="paragraph")
-                        href = doc.addPicture(kraft_screenshots[1])
+                        href = add_screenshot_picture(doc, kraft_screenshots[1])
                         if href:
                             frame.addElement(Image(href=href))
                             centered_p.addElement(frame)
@@ -1874,16 +4397,15 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                         print(f"Error adding kraft screenshot 2: {e}")
 
                 # Flat bottom screenshot (index 2) - no spacing, fits directly under extra
-                if kraft_screenshots[2] and os.path.exists(kraft_screenshots[2]):
+                if screenshot_available(kraft_screenshots[2]):
                     try:
-                        with PILImage.open(kraft_screenshots[2]) as img:
-                            img_width_px, img_height_px = img.size
-                        frame_width_cm = 16.0
+                        img_width_px, img_height_px = screenshot_size(kraft_screenshots[2])
+                        frame_width_cm = screenshot_frame_width(kraft_screenshots[2])
                         aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1
                         frame_height_cm = frame_width_cm * aspect_ratio
                         centered_p = P(stylename="CenterParagraph")
                         frame = Frame(name="KraftScreenshot3", width=f"{frame_width_cm}cm", height=f"{frame_height_cm}cm", anchortype="paragraph")
-                        href = doc.addPicture(kraft_screenshots[2])
+                        href = add_screenshot_picture(doc, kraft_screenshots[2])
                         if href:
                             frame.addElement(Image(href=href))
                             centered_p.addElement(frame)
@@ -1898,16 +4420,15 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                 doc.text.addElement(P(text=""))
 
                 # Main screenshot (index 3)
-                if kraft_screenshots[3] and os.path.exists(kraft_screenshots[3]):
+                if screenshot_available(kraft_screenshots[3]):
                     try:
-                        with PILImage.open(kraft_screenshots[3]) as img:
-                            img_width_px, img_height_px = img.size
-                        frame_width_cm = 16.0
+                        img_width_px, img_height_px = screenshot_size(kraft_screenshots[3])
+                        frame_width_cm = screenshot_frame_width(kraft_screenshots[3])
                         aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1
                         frame_height_cm = frame_width_cm * aspect_ratio
                         centered_p = P(stylename="CenterParagraph")
                         frame = Frame(name="KraftScreenshot4", width=f"{frame_width_cm}cm", height=f"{frame_height_cm}cm", anchortype="paragraph")
-                        href = doc.addPicture(kraft_screenshots[3])
+                        href = add_screenshot_picture(doc, kraft_screenshots[3])
                         if href:
                             frame.addElement(Image(href=href))
                             centered_p.addElement(frame)
@@ -1917,16 +4438,15 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                         print(f"Error adding kraft screenshot 4: {e}")
 
                 # Extra shoulders screenshot (index 4) - directly underneath
-                if kraft_screenshots[4] and os.path.exists(kraft_screenshots[4]):
+                if screenshot_available(kraft_screenshots[4]):
                     try:
-                        with PILImage.open(kraft_screenshots[4]) as img:
-                            img_width_px, img_height_px = img.size
-                        frame_width_cm = 16.0
+                        img_width_px, img_height_px = screenshot_size(kraft_screenshots[4])
+                        frame_width_cm = screenshot_frame_width(kraft_screenshots[4])
                         aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1
                         frame_height_cm = frame_width_cm * aspect_ratio
                         centered_p = P(stylename="CenterParagraph")
                         frame = Frame(name="KraftScreenshot5", width=f"{frame_width_cm}cm", height=f"{frame_height_cm}cm", anchortype="paragraph")
-                        href = doc.addPicture(kraft_screenshots[4])
+                        href = add_screenshot_picture(doc, kraft_screenshots[4])
                         if href:
                             frame.addElement(Image(href=href))
                             centered_p.addElement(frame)
@@ -1936,16 +4456,15 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                         print(f"Error adding kraft screenshot 5: {e}")
 
                 # Flat bottom screenshot (index 5) - no spacing, fits directly under extra
-                if kraft_screenshots[5] and os.path.exists(kraft_screenshots[5]):
+                if screenshot_available(kraft_screenshots[5]):
                     try:
-                        with PILImage.open(kraft_screenshots[5]) as img:
-                            img_width_px, img_height_px = img.size
-                        frame_width_cm = 16.0
+                        img_width_px, img_height_px = screenshot_size(kraft_screenshots[5])
+                        frame_width_cm = screenshot_frame_width(kraft_screenshots[5])
                         aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1
                         frame_height_cm = frame_width_cm * aspect_ratio
                         centered_p = P(stylename="CenterParagraph")
                         frame = Frame(name="KraftScreenshot6", width=f"{frame_width_cm}cm", height=f"{frame_height_cm}cm", anchortype="paragraph")
-                        href = doc.addPicture(kraft_screenshots[5])
+                        href = add_screenshot_picture(doc, kraft_screenshots[5])
                         if href:
                             frame.addElement(Image(href=href))
                             centered_p.addElement(frame)
@@ -1961,16 +4480,15 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                 doc.text.addElement(P(text=""))
 
                 # Main screenshot (index 0)
-                if kraft_screenshots[0] and os.path.exists(kraft_screenshots[0]):
+                if screenshot_available(kraft_screenshots[0]):
                     try:
-                        with PILImage.open(kraft_screenshots[0]) as img:
-                            img_width_px, img_height_px = img.size
-                        frame_width_cm = 16.0
+                        img_width_px, img_height_px = screenshot_size(kraft_screenshots[0])
+                        frame_width_cm = screenshot_frame_width(kraft_screenshots[0])
                         aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1
                         frame_height_cm = frame_width_cm * aspect_ratio
                         centered_p = P(stylename="CenterParagraph")
                         frame = Frame(name="KraftScreenshot1", width=f"{frame_width_cm}cm", height=f"{frame_height_cm}cm", anchortype="paragraph")
-                        href = doc.addPicture(kraft_screenshots[0])
+                        href = add_screenshot_picture(doc, kraft_screenshots[0])
                         if href:
                             frame.addElement(Image(href=href))
                             centered_p.addElement(frame)
@@ -1980,16 +4498,15 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                         print(f"Error adding kraft screenshot 1: {e}")
 
                 # Flat bottom screenshot (index 1)
-                if kraft_screenshots[1] and os.path.exists(kraft_screenshots[1]):
+                if screenshot_available(kraft_screenshots[1]):
                     try:
-                        with PILImage.open(kraft_screenshots[1]) as img:
-                            img_width_px, img_height_px = img.size
-                        frame_width_cm = 16.0
+                        img_width_px, img_height_px = screenshot_size(kraft_screenshots[1])
+                        frame_width_cm = screenshot_frame_width(kraft_screenshots[1])
                         aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1
                         frame_height_cm = frame_width_cm * aspect_ratio
                         centered_p = P(stylename="CenterParagraph")
                         frame = Frame(name="KraftScreenshot2", width=f"{frame_width_cm}cm", height=f"{frame_height_cm}cm", anchortype="paragraph")
-                        href = doc.addPicture(kraft_screenshots[1])
+                        href = add_screenshot_picture(doc, kraft_screenshots[1])
                         if href:
                             frame.addElement(Image(href=href))
                             centered_p.addElement(frame)
@@ -2010,16 +4527,15 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                 doc.text.addElement(P(text=""))
 
                 # Main screenshot (index 2)
-                if kraft_screenshots[2] and os.path.exists(kraft_screenshots[2]):
+                if screenshot_available(kraft_screenshots[2]):
                     try:
-                        with PILImage.open(kraft_screenshots[2]) as img:
-                            img_width_px, img_height_px = img.size
-                        frame_width_cm = 16.0
+                        img_width_px, img_height_px = screenshot_size(kraft_screenshots[2])
+                        frame_width_cm = screenshot_frame_width(kraft_screenshots[2])
                         aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1
                         frame_height_cm = frame_width_cm * aspect_ratio
                         centered_p = P(stylename="CenterParagraph")
                         frame = Frame(name="KraftScreenshot3", width=f"{frame_width_cm}cm", height=f"{frame_height_cm}cm", anchortype="paragraph")
-                        href = doc.addPicture(kraft_screenshots[2])
+                        href = add_screenshot_picture(doc, kraft_screenshots[2])
                         if href:
                             frame.addElement(Image(href=href))
                             centered_p.addElement(frame)
@@ -2029,16 +4545,15 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                         print(f"Error adding kraft screenshot 3: {e}")
 
                 # Flat bottom screenshot (index 3)
-                if kraft_screenshots[3] and os.path.exists(kraft_screenshots[3]):
+                if screenshot_available(kraft_screenshots[3]):
                     try:
-                        with PILImage.open(kraft_screenshots[3]) as img:
-                            img_width_px, img_height_px = img.size
-                        frame_width_cm = 16.0
+                        img_width_px, img_height_px = screenshot_size(kraft_screenshots[3])
+                        frame_width_cm = screenshot_frame_width(kraft_screenshots[3])
                         aspect_ratio = img_height_px / img_width_px if img_width_px > 0 else 1
                         frame_height_cm = frame_width_cm * aspect_ratio
                         centered_p = P(stylename="CenterParagraph")
                         frame = Frame(name="KraftScreenshot4", width=f"{frame_width_cm}cm", height=f"{frame_height_cm}cm", anchortype="paragraph")
-                        href = doc.addPicture(kraft_screenshots[3])
+                        href = add_screenshot_picture(doc, kraft_screenshots[3])
                         if href:
                             frame.addElement(Image(href=href))
                             centered_p.addElement(frame)
@@ -2047,6 +4562,7 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
                     except Exception as e:
                         print(f"Error adding kraft screenshot 4: {e}")
 
+        sections.start("therapy recommendations")
         # Add new section: Therapieempfehlungen (last page)
         doc.text.addElement(P(text="Therapieempfehlungen", stylename="HeadingPageBreakStyle"))
         doc.text.addElement(P(text=""))
@@ -2091,8 +4607,14 @@ Ausdrücklich ist darauf hinzuweisen, dass die Bewegungsanalyse für eine schlü
 
     else:
         doc.text.addElement(P(text="Fehler beim Lesen der Messwerte aus der INI-Datei."))
+        warnings.append(f"INI Error: Could not read the measurement values from {ini_path}")
 
-    doc.save(odt_path)
+    sections.finish()
+
+    with trace_span("doc.save", "save") as span:
+        doc.save(odt_path)
+        span['bytes'] = os.path.getsize(odt_path)
+    return warnings
 
 
 class MeasurementTypeSelector:
@@ -3301,8 +5823,108 @@ class TextInputDialog:
     """Dialog for entering text with Back button support"""
     def __init__(self, parent, title, prompt, initial_value=""):
         self.parent = parent
-        self.result = None
-        self.went_back = False
+        self.result = None
+        self.went_back = False
+        self.top = tk.Toplevel(parent)
+        self.top.title(title)
+        self.top.configure(bg="#F5F5F5")
+        self.top.transient(parent)
+        self.top.grab_set()
+
+        main_frame = tk.Frame(self.top, bg="#F5F5F5")
+        main_frame.pack(fill=tk.BOTH, expand=True, padx=20, pady=15)
+
+        tk.Label(main_frame, text=title, font=("Helvetica", 14, "bold"), fg="#333333", bg="#F5F5F5").pack(pady=(0, 5))
+        # Teal-brown separator line
+        sep_frame = tk.Frame(main_frame, bg="#F5F5F5", height=3)
+        sep_frame.pack(fill=tk.X, pady=(5, 15))
+        tk.Frame(sep_frame, bg="#80afaa", height=3, width=1).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        tk.Frame(sep_frame, bg="#afa190", height=3, width=1).pack(side=tk.RIGHT, fill=tk.X, expand=True)
+        tk.Label(main_frame, text=prompt, font=("Helvetica", 11), fg="#333333", bg="#F5F5F5").pack(pady=(0, 15))
+
+        self.entry = tk.Entry(main_frame, width=45, font=("Helvetica", 11), relief=tk.SOLID, bd=1)
+        self.entry.pack(pady=10, padx=20)
+        if initial_value:
+            self.entry.insert(0, initial_value)
+        self.entry.focus_set()
+
+        button_frame = tk.Frame(main_frame, bg="#F5F5F5")
+        button_frame.pack(pady=20)
+
+        tk.Button(button_frame, text="Back", command=self._on_back, width=10, font=("Helvetica", 10),
+                 bg="#E57373", fg="#333333", activebackground="#EF5350", activeforeground="#333333",
+                 relief=tk.FLAT, cursor="hand2").pack(side="left", padx=5)
+        tk.Button(button_frame, text="OK", command=self._on_ok, width=10, font=("Helvetica", 10),
+                 bg="#4CAF50", fg="#FFFFFF", activebackground="#43A047", activeforeground="#FFFFFF",
+                 relief=tk.FLAT, cursor="hand2").pack(side="left", padx=5)
+        tk.Button(button_frame, text="Cancel", command=self._on_cancel, width=10, font=("Helvetica", 10),
+                 bg="#E57373", fg="#333333", activebackground="#EF5350", activeforeground="#333333",
+                 relief=tk.FLAT, cursor="hand2").pack(side="left", padx=5)
+
+        self.entry.bind("<Return>", lambda e: self._on_ok())
+        self._center_window()
+        self.top.protocol("WM_DELETE_WINDOW", self._on_cancel)
+
+    def _center_window(self):
+        self.top.update_idletasks()
+        self.top.minsize(450, 220)
+        screen_width = self.top.winfo_screenwidth()
+        screen_height = self.top.winfo_screenheight()
+        window_width = max(self.top.winfo_width(), 450)
+        window_height = max(self.top.winfo_height(), 220)
+        x = (screen_width // 2) - (window_width // 2)
+        y = (screen_height // 2) - (window_height // 2)
+        self.top.geometry(f"{window_width}x{window_height}+{x}+{y}")
+
+    def _on_ok(self):
+        self.result = self.entry.get().strip()
+        self.top.destroy()
+
+    def _on_cancel(self):
+        self.result = None
+        self.top.destroy()
+
+    def _on_back(self):
+        self.went_back = True
+        self.top.destroy()
+
+    def get_input(self):
+        self.parent.wait_window(self.top)
+        if self.went_back:
+            return "BACK"
+        return self.result
+
+
+class ProgressReporter:
+    """Thread-safe link from a worker thread to a ProgressDialog"""
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.cancel_event = threading.Event()
+
+    def stage(self, name, status):
+        """Update the status text of a stage ("Running...", "Done", ...)"""
+        print(f"{name}: {status}")
+        self.queue.put((name, status))
+
+    def check_cancelled(self):
+        """Raise ReportCancelled if the user pressed Cancel"""
+        if self.cancel_event.is_set():
+            raise ReportCancelled()
+
+
+class ProgressDialog:
+    """Dialog showing the status of each stage of a long-running job, with a Cancel button.
+
+    run() executes the job in a worker thread while the Tk main loop keeps running;
+    progress updates and worker messages arrive through queues polled with after().
+    """
+    POLL_MS = 100
+
+    def __init__(self, parent, title, stages):
+        self.parent = parent
+        self.stages = stages
+        self.reporter = ProgressReporter()
+        self._future = Future()
         self.top = tk.Toplevel(parent)
         self.top.title(title)
         self.top.configure(bg="#F5F5F5")
@@ -3318,59 +5940,74 @@ class TextInputDialog:
         sep_frame.pack(fill=tk.X, pady=(5, 15))
         tk.Frame(sep_frame, bg="#80afaa", height=3, width=1).pack(side=tk.LEFT, fill=tk.X, expand=True)
         tk.Frame(sep_frame, bg="#afa190", height=3, width=1).pack(side=tk.RIGHT, fill=tk.X, expand=True)
-        tk.Label(main_frame, text=prompt, font=("Helvetica", 11), fg="#333333", bg="#F5F5F5").pack(pady=(0, 15))
 
-        self.entry = tk.Entry(main_frame, width=45, font=("Helvetica", 11), relief=tk.SOLID, bd=1)
-        self.entry.pack(pady=10, padx=20)
-        if initial_value:
-            self.entry.insert(0, initial_value)
-        self.entry.focus_set()
+        self.status_labels = {}
+        for stage in stages:
+            frame = tk.Frame(main_frame, bg="#F5F5F5")
+            frame.pack(fill="x", padx=10, pady=3)
+            tk.Label(frame, text=stage, font=("Helvetica", 11), fg="#333333", bg="#F5F5F5").pack(side="left")
+            status_label = tk.Label(frame, text="Waiting", font=("Helvetica", 11), fg="#afa190", bg="#F5F5F5")
+            status_label.pack(side="right")
+            self.status_labels[stage] = status_label
 
         button_frame = tk.Frame(main_frame, bg="#F5F5F5")
         button_frame.pack(pady=20)
+        self.cancel_button = tk.Button(button_frame, text="Cancel", command=self._on_cancel, width=10,
+                                       font=("Helvetica", 10), bg="#E57373", fg="#333333",
+                                       activebackground="#EF5350", activeforeground="#333333",
+                                       relief=tk.FLAT, cursor="hand2")
+        self.cancel_button.pack(side="left", padx=5)
 
-        tk.Button(button_frame, text="Back", command=self._on_back, width=10, font=("Helvetica", 10),
-                 bg="#E57373", fg="#333333", activebackground="#EF5350", activeforeground="#333333",
-                 relief=tk.FLAT, cursor="hand2").pack(side="left", padx=5)
-        tk.Button(button_frame, text="OK", command=self._on_ok, width=10, font=("Helvetica", 10),
-                 bg="#4CAF50", fg="#FFFFFF", activebackground="#43A047", activeforeground="#FFFFFF",
-                 relief=tk.FLAT, cursor="hand2").pack(side="left", padx=5)
-        tk.Button(button_frame, text="Cancel", command=self._on_cancel, width=10, font=("Helvetica", 10),
-                 bg="#E57373", fg="#333333", activebackground="#EF5350", activeforeground="#333333",
-                 relief=tk.FLAT, cursor="hand2").pack(side="left", padx=5)
-
-        self.entry.bind("<Return>", lambda e: self._on_ok())
         self._center_window()
         self.top.protocol("WM_DELETE_WINDOW", self._on_cancel)
 
     def _center_window(self):
         self.top.update_idletasks()
-        self.top.minsize(450, 220)
+        self.top.minsize(400, 150 + len(self.stages) * 30)
         screen_width = self.top.winfo_screenwidth()
         screen_height = self.top.winfo_screenheight()
-        window_width = max(self.top.winfo_width(), 450)
-        window_height = max(self.top.winfo_height(), 220)
+        window_width = max(self.top.winfo_width(), 400)
+        window_height = max(self.top.winfo_height(), 150 + len(self.stages) * 30)
         x = (screen_width // 2) - (window_width // 2)
         y = (screen_height // 2) - (window_height // 2)
         self.top.geometry(f"{window_width}x{window_height}+{x}+{y}")
 
-    def _on_ok(self):
-        self.result = self.entry.get().strip()
-        self.top.destroy()
-
     def _on_cancel(self):
-        self.result = None
-        self.top.destroy()
-
-    def _on_back(self):
-        self.went_back = True
-        self.top.destroy()
+        self.reporter.cancel_event.set()
+        self.cancel_button.config(state=tk.DISABLED, text="Cancelling...")
 
-    def get_input(self):
+    def _work(self, job):
+        try:
+            self._future.set_result(job(self.reporter))
+        except BaseException as e:
+            self._future.set_exception(e)
+
+    def _poll(self):
+        # Checked before draining, so every message the job queued before it finished is shown here
+        done = self._future.done()
+        while not self.reporter.queue.empty():
+            stage, status = self.reporter.queue.get_nowait()
+            if stage in self.status_labels:
+                color = {"Done": "#4CAF50", "Failed": "#E57373"}.get(status, "#333333")
+                self.status_labels[stage].config(text=status, fg=color)
+        while not _worker_messages.empty():
+            kind, title, message = _worker_messages.get_nowait()
+            getattr(messagebox, kind)(title, message, parent=self.top)
+        if done:
+            self.top.destroy()
+        else:
+            self.top.after(self.POLL_MS, self._poll)
+
+    def run(self, job):
+        """Run job(reporter) in a worker thread and return its result (or raise its exception)"""
+        # Messages queued while no dialog was polling (e.g. by the background screenshot extraction)
+        # were printed by show_message already and are not about this job
+        while not _worker_messages.empty():
+            _worker_messages.get_nowait()
+        threading.Thread(target=self._work, args=(job,), daemon=True).start()
+        self.top.after(self.POLL_MS, self._poll)
         self.parent.wait_window(self.top)
-        if self.went_back:
-            return "BACK"
-        return self.result
+        return self._future.result()
 
 
 class CoordinateFinder:
@@ -3387,6 +6024,9 @@ class CoordinateFinder:
 
     def find_coordinates_from_path(self, pdf_path, page_num=1, screenshot_name="Screenshot"):
         """Find coordinates from a specific page of a PDF"""
+        from PIL import Image as PILImage, ImageTk
+        from pdf2image import convert_from_path
+
         try:
             print(f"Converting PDF page {page_num} to image...")
             images = convert_from_path(pdf_path, dpi=150, first_page=page_num, last_page=page_num)
@@ -3508,15 +6148,10 @@ class RunningCoordinateFinder:
     """Coordinate finder for running analysis screenshots from hp.pdf and ios.pdf"""
     def __init__(self, parent):
         self.parent = parent
+        # Pages and PDFs of the "laufen" section of the screenshot layout
         self.screenshots_config = [
-            {"name": "Running Screenshot 1", "page": 1, "pdf": "hp.pdf"},
-            {"name": "Running Screenshot 2", "page": 2, "pdf": "hp.pdf"},
-            {"name": "Running Screenshot 3", "page": 3, "pdf": "hp.pdf"},
-            {"name": "Running Screenshot 4", "page": 6, "pdf": "hp.pdf"},
-            {"name": "Running Screenshot 5", "page": 4, "pdf": "hp.pdf"},
-            {"name": "Running Screenshot 6", "page": 5, "pdf": "hp.pdf"},
-            {"name": "Running Screenshot 7", "page": 8, "pdf": "hp.pdf"},
-            {"name": "Running Screenshot 8", "page": 1, "pdf": "ios.pdf"},
+            {"name": f"Running Screenshot {i}", "index": i, "page": crop['page'], "pdf": crop['pdf']}
+            for i, crop in enumerate(load_screenshot_layout()['laufen']['crops'], 1)
         ]
         self.current_screenshot_index = 0
         self.all_coordinates = []
@@ -3559,6 +6194,7 @@ class RunningCoordinateFinder:
         if finder.final_coordinates:
             self.all_coordinates.append({
                 'screenshot': config['name'],
+                'index': config['index'],
                 'page': config['page'],
                 'pdf': config['pdf'],
                 'coordinates': finder.final_coordinates
@@ -3587,15 +6223,33 @@ class RunningCoordinateFinder:
 
         messagebox.showinfo("All Coordinates Found", result_text)
 
+        if self.all_coordinates and messagebox.askyesno(
+                "Save Coordinates", "Save these coordinates to the screenshot layout (laufen section)?"):
+            try:
+                for coord_data in self.all_coordinates:
+                    update_layout_crop("laufen", coord_data['index'], coord_data['coordinates'], coord_data['page'])
+            except (OSError, ValueError) as e:
+                messagebox.showerror("Error", f"Could not save the screenshot layout: {e}")
+                return
+            messagebox.showinfo("Saved", f"Coordinates saved to {get_screenshot_layout_path()}")
+
+
+def ensure_heavy_modules():
+    """Load the report modules on first use from the main menu, recording the import timings"""
+    if load_heavy_modules():
+        record_startup_timings("report modules loaded")
+
 
 def find_running_coordinates():
     """Helper function to find all running analysis coordinates"""
+    ensure_heavy_modules()
     finder = RunningCoordinateFinder(root)
     finder.find_all_coordinates()
 
 
 def find_coordinates():
     """Helper function to find coordinates from any PDF page"""
+    ensure_heavy_modules()
     # Ask user to select a PDF file
     pdf_path = filedialog.askopenfilename(
         title="Select PDF file",
@@ -3617,12 +6271,52 @@ def find_coordinates():
     # Open coordinate finder
     finder = CoordinateFinder(root)
     finder.find_coordinates_from_path(pdf_path, page_num, f"Page {page_num}")
+    finder.wait_for_completion()
+    if not finder.final_coordinates:
+        return
+
+    # Optionally store the coordinates in the screenshot layout instead of editing the code
+    while True:
+        target = simpledialog.askstring(
+            "Save to Screenshot Layout",
+            "Store these coordinates in the screenshot layout?\n\n"
+            "Enter the screenshot, e.g. 'statik 3' or 'kraft/Legs 2'\n"
+            f"Sections: {', '.join(load_screenshot_layout())}\n\n"
+            "Leave empty to skip.")
+        if not target or not target.strip():
+            return
+        try:
+            section_name, layout_name, index = parse_layout_target(target)
+            update_layout_crop(section_name, index, finder.final_coordinates, page_num, layout_name)
+        except (OSError, ValueError) as e:
+            messagebox.showerror("Error", f"Could not save the coordinates: {e}")
+            continue
+        messagebox.showinfo("Saved", f"Coordinates saved to {get_screenshot_layout_path()}")
+        return
 
 
 def generate_report():
+    ensure_heavy_modules()
     # Data dictionary to store all collected values
     data = {}
-
+    trace = start_trace("report")
+    try:
+        run_report_wizard(data)
+    finally:
+        # Screenshots still extracting when the wizard is left early are not needed anymore;
+        # the extraction is stopped before its PDF documents are closed below
+        screenshot_job = data.pop('screenshot_job', None)
+        if screenshot_job is not None:
+            screenshot_job.cancel()
+            screenshot_job.join()
+        # Only runs that got to creating the report are logged
+        if trace is not None:
+            trace.info.update({key: data.get(key) for key in ('measurement_type', 'export_format', 'save_path')})
+        finish_trace(trace, write='save_path' in data)
+        close_pdf_documents()
+
+
+def run_report_wizard(data):
     # Step index for navigation
     current_step = 0
 
@@ -3793,35 +6487,47 @@ def generate_report():
                     return
             data['folder_path'] = folder_path
 
-            # Process files from the folder (automatic, no user interaction)
-            # Auto-find .ini file containing "4D average" (case-insensitive)
-            ini_path = None
-            for filename in os.listdir(folder_path):
-                if filename.lower().endswith('.ini') and '4d average' in filename.lower():
-                    ini_path = os.path.join(folder_path, filename)
-                    break
-
-            if not ini_path:
-                messagebox.showerror("Error", "Could not find .ini file containing '4D average' in the selected folder.")
+            # List the folder once; every later step looks its files up in this manifest
+            try:
+                manifest = scan_measurement_folder(folder_path)
+            except OSError as e:
+                messagebox.showerror("Error", f"Could not read the folder {folder_path}:\n{e}")
+                continue
+            # Preflight: files, page counts and INI lines, all problems in one message before anything is rendered
+            issues = preflight_measurement_folder(folder_path, data['measurement_type'],
+                                                  data.get('strength_test_type', 'Torso + legs'),
+                                                  data.get('leg_length_selected'), manifest)
+            if any(issue['blocking'] for issue in issues):
+                messagebox.showerror("Folder Check",
+                    f"The selected folder can not be used:\n\n{format_preflight_issues(issues)}\n\n"
+                    "Please fix these files and select the folder again.")
                 # Let user select a different folder
                 continue
+            if issues and not messagebox.askyesno("Folder Check",
+                    f"Problems found in the selected folder:\n\n{format_preflight_issues(issues)}\n\n"
+                    "The affected parts of the report will be missing. Continue anyway?"):
+                continue
 
+            # Work on a local copy of folders on network shares; the report is still saved to folder_path
+            manifest = stage_measurement_folder(folder_path, manifest)
+            if manifest.folder_path != folder_path:
+                data['work_folder'] = manifest.folder_path
+            else:
+                data.pop('work_folder', None)
+
+            # Process files from the folder (automatic, no user interaction)
+            # .ini file containing "4D average" (case-insensitive)
+            ini_path = manifest.path("4d average ini")
             data['ini_path'] = ini_path
             print(f"Found .ini file: {ini_path}")
+            # Parse it once now, create_report and the pelvic drop step use the cached record
+            ini_record = read_ini_record(ini_path, "4d average")
+            if ini_record.error is None:
+                remember_ini_labels(ini_record)
 
             # Auto-detect which PDF to use: prioritize 4d_average.pdf, fallback to statik.pdf
-            pdf_path_4d = os.path.join(folder_path, "4d_average.pdf")
-            pdf_path_statik = os.path.join(folder_path, "statik.pdf")
-
-            if os.path.exists(pdf_path_4d):
-                pdf_path = pdf_path_4d
-                print(f"Using 4d_average.pdf for 4D Average screenshot: {pdf_path}")
-            elif os.path.exists(pdf_path_statik):
-                pdf_path = pdf_path_statik
-                print(f"4d_average.pdf not found, using statik.pdf for 4D Average screenshot: {pdf_path}")
-            else:
-                messagebox.showerror("Error", f"Could not find 4d_average.pdf or statik.pdf in {folder_path}")
-                continue
+            pdf_path = manifest.path("average pdf")
+            print(f"Using {os.path.basename(pdf_path)} for 4D Average screenshot: {pdf_path}")
 
             # Extract patient info from the selected PDF
             patient_name, patient_dob, measurement_date = extract_patient_info_from_pdf(pdf_path)
@@ -3844,97 +6550,23 @@ def generate_report():
                 messagebox.showerror("Error", "Could not extract measurement date from PDF")
                 continue
 
-            # Crop screenshot from the selected PDF (same coordinates, page 1)
-            screenshot_path = crop_pdf_screenshot(pdf_path)
-            if not screenshot_path:
-                messagebox.showerror("Error", "Failed to crop screenshot from PDF")
-                continue
-
-            data['screenshot_path'] = screenshot_path
-
-            # Auto-find and crop screenshots from statik.pdf
             measurement_type = data['measurement_type']
-            statik_pdf_path = os.path.join(folder_path, "statik.pdf")
-            statik_screenshots = []
-            if os.path.exists(statik_pdf_path):
-                print(f"Found statik.pdf: {statik_pdf_path}")
-                statik_screenshots = crop_statik_screenshots(statik_pdf_path)
-                if not statik_screenshots or len(statik_screenshots) < 7:
-                    print("Warning: Failed to crop all statik screenshots")
-            else:
-                print("Warning: statik.pdf not found in folder")
-            data['statik_screenshots'] = statik_screenshots
-
-            # Auto-find and crop screenshots based on measurement type
-            gehen_screenshots = []
-            ios_pedografie_screenshots = []
-            if measurement_type == "Gehen":
-                gehen_pdf_path = os.path.join(folder_path, "gehen.pdf")
-                if os.path.exists(gehen_pdf_path):
-                    print(f"Found gehen.pdf: {gehen_pdf_path}")
-                    gehen_screenshots = crop_gehen_screenshots(gehen_pdf_path)
-                    if not gehen_screenshots or len(gehen_screenshots) < 8:
-                        print("Warning: Failed to crop all gehen screenshots")
-                else:
-                    print("Warning: gehen.pdf not found in folder")
-            elif measurement_type == "Laufen":
-                hp_pdf_path = os.path.join(folder_path, "hp.pdf")
-                ios_pdf_path = os.path.join(folder_path, "ios.pdf")
-                if os.path.exists(hp_pdf_path) and os.path.exists(ios_pdf_path):
-                    print(f"Found hp.pdf: {hp_pdf_path}")
-                    print(f"Found ios.pdf: {ios_pdf_path}")
-                    gehen_screenshots = crop_laufen_screenshots(hp_pdf_path, ios_pdf_path)
-                    if not gehen_screenshots or len(gehen_screenshots) < 8:
-                        print("Warning: Failed to crop all laufen screenshots")
-                else:
-                    if not os.path.exists(hp_pdf_path):
-                        print("Warning: hp.pdf not found in folder")
-                    if not os.path.exists(ios_pdf_path):
-                        print("Warning: ios.pdf not found in folder")
-            elif measurement_type in ["Statik", "IOS"]:
-                ios_pdf_path = os.path.join(folder_path, "ios.pdf")
-                if os.path.exists(ios_pdf_path):
-                    print(f"Found ios.pdf: {ios_pdf_path}")
-                    ios_pedografie_screenshots = crop_ios_pedografie_screenshots(ios_pdf_path)
-                    if not ios_pedografie_screenshots or len(ios_pedografie_screenshots) < 2:
-                        print("Warning: Failed to crop all ios pedografie screenshots")
-                else:
-                    print("Warning: ios.pdf not found in folder")
 
-            data['gehen_screenshots'] = gehen_screenshots
-            data['ios_pedografie_screenshots'] = ios_pedografie_screenshots
-
-            # Auto-find and crop screenshots from kraft.pdf (not for IOS type)
-            kraft_pdf_path = os.path.join(folder_path, "kraft.pdf")
-            kraft_screenshots = []
-            if measurement_type != "IOS":
-                if os.path.exists(kraft_pdf_path):
-                    print(f"Found kraft.pdf: {kraft_pdf_path}")
-                    strength_test_type = data.get('strength_test_type', 'Torso + legs')
-                    kraft_screenshots = crop_kraft_screenshots(kraft_pdf_path, strength_test_type)
-                    expected_count = 6 if strength_test_type == "Torso + legs + shoulders" else 4
-                    if not kraft_screenshots or len(kraft_screenshots) < expected_count:
-                        print("Warning: Failed to crop all kraft screenshots")
-                else:
-                    print("Warning: kraft.pdf not found in folder")
-            data['kraft_screenshots'] = kraft_screenshots
-
-            # Process vgl.pdf for leg length examination (conditional)
-            vgl_screenshot = None
-            if data.get('leg_length_selected') == "Ja":
-                vgl_pdf_path = os.path.join(folder_path, "vgl.pdf")
-                if os.path.exists(vgl_pdf_path):
-                    print(f"Found vgl.pdf: {vgl_pdf_path}")
-                    vgl_screenshot = crop_vgl_screenshot(vgl_pdf_path)
-                    if not vgl_screenshot:
-                        print("Warning: Failed to crop vgl.pdf screenshot")
-                else:
-                    messagebox.showwarning("Missing File",
-                        "vgl.pdf not found in folder.\n\n"
-                        "Please add the vgl.pdf file to the folder and select the folder again.")
-                    # Go back to folder selection
-                    continue
-            data['vgl_screenshot'] = vgl_screenshot
+            # Start cropping all screenshots in the background (one worker process per PDF),
+            # they are collected right before the report is created
+            strength_test_type = data.get('strength_test_type', 'Torso + legs')
+            screenshot_tasks = plan_screenshot_tasks(manifest.folder_path, pdf_path, measurement_type,
+                                                     strength_test_type, data.get('leg_length_selected'))
+            screenshot_job = data.pop('screenshot_job', None)
+            if screenshot_job is not None and screenshot_job.tasks != screenshot_tasks:
+                # Folder or options changed since the last visit of this step
+                screenshot_job.cancel()
+                screenshot_job = None
+            if screenshot_job is None:
+                screenshot_job = ScreenshotExtraction(
+                    screenshot_tasks,
+                    collect_render_pages(screenshot_tasks))
+            data['screenshot_job'] = screenshot_job
 
             current_step += 1
 
@@ -3946,17 +6578,15 @@ def generate_report():
             data['pelvic_drop_sentence'] = None
 
             if measurement_type in ["Gehen", "Laufen"]:
-                motion_ini_path = None
-                for filename in os.listdir(folder_path):
-                    if filename.lower().endswith('.ini') and '4d motion' in filename.lower():
-                        motion_ini_path = os.path.join(folder_path, filename)
-                        break
-
+                motion_ini_path = get_folder_manifest(data.get('work_folder', folder_path)).path("4d motion ini")
                 if motion_ini_path:
                     print(f"Found motion .ini file: {motion_ini_path}")
-                    (kyphosis_angle, lordosis_angle, scoliosis_angle,
-                     surf_rot_left, surf_rot_right, lat_dev_left, lat_dev_right, sva_axis, beckenhochstand) = parse_ini_file(ini_path)
-                    motion_mean, motion_min, motion_max = parse_motion_ini_file(motion_ini_path)
+                    beckenhochstand = read_ini_record(ini_path, "4d average").beckenhochstand
+                    motion_record = read_ini_record(motion_ini_path, "4d motion")
+                    if motion_record.error is None:
+                        remember_ini_labels(motion_record)
+                    motion_mean, motion_min, motion_max = (motion_record.pelvic_drop_mean, motion_record.pelvic_drop_min,
+                                                           motion_record.pelvic_drop_max)
 
                     if beckenhochstand is not None and motion_mean is not None and motion_min is not None and motion_max is not None:
                         data['_beckenhochstand'] = beckenhochstand
@@ -4006,7 +6636,8 @@ def generate_report():
 
         elif current_step == 12:
             # Leg length examination textboxes (conditional)
-            if data.get('leg_length_selected') == "Ja" and data.get('vgl_screenshot'):
+            # vgl.pdf was checked in step 10, its screenshot may still be extracting
+            if data.get('leg_length_selected') == "Ja":
                 leg_length_dialog = BulletPointInputDialog(root, "Leg length examination findings", num_fields=2)
                 result = leg_length_dialog.get_texts()
 
@@ -4085,34 +6716,104 @@ def generate_report():
                 messagebox.showinfo("Cancelled", "Export format selection was cancelled.")
                 return
             data['export_format'] = result
+            if result != "ODT":
+                # Only now is it known that a PDF is needed: start LibreOffice so it is warm for
+                # the conversion after the screenshots (ODT-only reports never start it)
+                converter_pool = get_converter_pool()
+                if converter_pool is not None:
+                    converter_pool.start()
             current_step += 1
 
         elif current_step == 17:
             # Auto-generate save path using folder_path and patient last name
-            export_format = data['export_format']
-            folder_path = data['folder_path']
-            patient_name = data['patient_name']
+            data['save_path'] = report_save_path(data['folder_path'], data['patient_name'], data['export_format'])
+            # All steps completed, break the loop
+            break
 
-            # Extract last name (patient_name is in "Nachname, Vorname" format)
-            if ',' in patient_name:
-                last_name = patient_name.split(',')[0].strip()
-            else:
-                last_name = patient_name.strip()
+    # Build the report in a worker thread so the window stays responsive
+    stages = ["Screenshots", "Report document"]
+    if data['export_format'] in ["PDF", "BOTH"]:
+        stages.append("PDF conversion")
+    progress_dialog = ProgressDialog(root, "Creating Report", stages)
+    try:
+        success_message = progress_dialog.run(lambda reporter: build_report(data, reporter))
+    except ReportCancelled:
+        messagebox.showinfo("Cancelled", "Report creation was cancelled.")
+        return
+    except Exception as e:
+        messagebox.showerror("Error", f"An error occurred: {e}")
+        return
+    messagebox.showinfo("Success", success_message)
 
-            # Generate filename: "<YYYY-MM-DD> Motionlab Report <last name>"
-            current_date = datetime.now()
-            date_iso = current_date.strftime("%Y-%m-%d")
-            base_filename = f"{date_iso} Motionlab Report {last_name}"
 
-            if export_format == "ODT":
-                save_path = os.path.join(folder_path, f"{base_filename}.odt")
-            else:
-                save_path = os.path.join(folder_path, f"{base_filename}.pdf")
+def build_report(data, reporter=None):
+    """
+    Create the report from the collected wizard data: wait for the screenshot extraction,
+    write the ODT and convert it to PDF if requested.
+    Runs in a worker thread, so it must not touch Tk (messages go through show_message).
+    Returns the success message; raises ReportCancelled when cancelled through the reporter.
+    """
+    if reporter is None:
+        reporter = ProgressReporter()
+
+    # Wait for the background screenshot extraction started in step 10
+    reporter.stage("Screenshots", "Running...")
+    screenshot_job = data['screenshot_job']
+    with trace_span("wait for screenshots", "screenshots"):
+        while not screenshot_job.done():
+            if reporter.cancel_event.wait(0.2):
+                raise ReportCancelled()
+    try:
+        screenshots = screenshot_job.result()
+    except Exception:
+        reporter.stage("Screenshots", "Failed")
+        raise
+    del data['screenshot_job']
+    data.update(screenshots)
+
+    try:
+        # The 4D average screenshot is required for the report
+        if not screenshots['screenshot_path']:
+            reporter.stage("Screenshots", "Failed")
+            raise RuntimeError("Failed to crop screenshot from PDF")
+
+        for key, (expected_count, label) in expected_screenshot_counts(screenshot_job.tasks).items():
+            value = screenshots[key]
+            cropped_count = sum(1 for screenshot in (value if isinstance(value, list) else [value]) if screenshot)
+            if cropped_count < expected_count:
+                print(f"Warning: Failed to crop all {label.lower()}s ({cropped_count} of {expected_count})")
+        summarize_screenshot_encoding(screenshots)
+        reporter.stage("Screenshots", "Done")
+        reporter.check_cancelled()
+
+        return write_report_files(data, reporter)
+    finally:
+        # The screenshots are in the ODT now, free their memory
+        release_screenshots(data)
+
+
+def report_file_paths(export_format, save_path):
+    """Return (odt_path, pdf_path) for an export format; pdf_path is None for ODT only"""
+    if export_format == "ODT":
+        return save_path, None
+    elif export_format == "PDF":
+        # Create ODT in temp, then convert to PDF
+        odt_path = save_path.replace(".pdf", ".odt")
+        if odt_path == save_path:
+            odt_path = save_path + ".odt"
+        return odt_path, save_path
+    else:  # BOTH
+        if save_path.endswith(".pdf"):
+            return save_path.replace(".pdf", ".odt"), save_path
+        else:
+            return save_path, save_path.replace(".odt", ".pdf")
 
-            data['save_path'] = save_path
-            # All steps completed, break the loop
-            break
 
+def create_report_from_data(data, odt_path):
+    """
+    Write the ODT for the collected report data (wizard or batch answers, with screenshots) to odt_path.
+    Returns the warnings of create_report.
+    """
     # Extract all collected data
     measurement_type = data['measurement_type']
     measurement_date = data['measurement_date']
@@ -4121,7 +6822,6 @@ def generate_report():
     patient_name = data['patient_name']
     patient_dob = data['patient_dob']
     report_creator = data['report_creator']
-    folder_path = data['folder_path']
     ini_path = data['ini_path']
     screenshot_path = data['screenshot_path']
     statik_screenshots = data['statik_screenshots']
@@ -4139,8 +6839,6 @@ def generate_report():
     therapie_texts = data['therapie_texts']
     leg_length_texts = data.get('leg_length_texts')
     vgl_screenshot = data.get('vgl_screenshot')
-    export_format = data['export_format']
-    save_path = data['save_path']
 
     # Build patient full title
     salutation = "Herr" if gender == "Male" else "Frau"
@@ -4153,113 +6851,406 @@ def generate_report():
     logo_path = os.path.join(logo_folder, "logo_orthopassion.png")
     second_logo_path = os.path.join(logo_folder, "logo_2_orthopassion.png")
 
-    # Determine file paths
-    if export_format == "ODT":
-        odt_path = save_path
-        pdf_path = None
-    elif export_format == "PDF":
-        # Create ODT in temp, then convert to PDF
-        odt_path = save_path.replace(".pdf", ".odt")
-        if odt_path == save_path:
-            odt_path = save_path + ".odt"
-        pdf_path = save_path
-    else:  # BOTH
-        if save_path.endswith(".pdf"):
-            pdf_path = save_path
-            odt_path = save_path.replace(".pdf", ".odt")
-        else:
-            odt_path = save_path
-            pdf_path = save_path.replace(".odt", ".pdf")
+    return create_report(patient_full_title, patient_name, patient_dob, report_creator, odt_path, gender, ini_path,
+                         sim_performed, isg_right, isg_left, markers, logo_path, second_logo_path,
+                         screenshot_path, statik_screenshots, pelvic_drop_sentence, gehen_screenshots,
+                         kraft_screenshots, beinachsen_texts, ganganalyse_texts, therapie_texts, measurement_type,
+                         ios_pedografie_screenshots, measurement_date, leg_length_texts, vgl_screenshot,
+                         strength_test_type)
 
+
+def write_report_files(data, reporter):
+    """Write the ODT (and PDF) for build_report; returns the success message"""
+    export_format = data['export_format']
+    final_odt_path, final_pdf_path = report_file_paths(export_format, data['save_path'])
+    # Staged folders get their report written locally first and published when it is complete
+    odt_path = staging_output_path(data, final_odt_path)
+    pdf_path = staging_output_path(data, final_pdf_path)
+
+    reporter.stage("Report document", "Running...")
     try:
-        create_report(patient_full_title, patient_name, patient_dob, report_creator, odt_path, gender, ini_path,
-                      sim_performed, isg_right, isg_left, markers, logo_path, second_logo_path,
-                      screenshot_path, statik_screenshots, pelvic_drop_sentence, gehen_screenshots, kraft_screenshots,
-                      beinachsen_texts, ganganalyse_texts, therapie_texts, measurement_type, ios_pedografie_screenshots,
-                      measurement_date, leg_length_texts, vgl_screenshot, strength_test_type)
-
-        # Convert to PDF if needed
-        if export_format in ["PDF", "BOTH"]:
+        warnings = create_report_from_data(data, odt_path)
+    except Exception:
+        reporter.stage("Report document", "Failed")
+        raise
+    reporter.stage("Report document", "Done")
+    if warnings:
+        show_message("showwarning", "Report Warnings", "\n".join(warnings))
+
+    # Convert to PDF if needed
+    if export_format in ["PDF", "BOTH"]:
+        reporter.stage("PDF conversion", "Running...")
+        try:
+            with trace_span("pdf conversion", "conversion", odt_bytes=os.path.getsize(odt_path)) as span:
+                convert_odt_to_pdf(odt_path, pdf_path, reporter.cancel_event)
+                span['bytes'] = os.path.getsize(pdf_path)
+            print(f"PDF created: {pdf_path}")
+            reporter.stage("PDF conversion", "Done")
+
+            # Remove ODT if only PDF was requested
+            if export_format == "PDF" and os.path.exists(odt_path):
+                os.remove(odt_path)
+                print(f"Removed temporary ODT: {odt_path}")
+        except ReportCancelled:
+            # The ODT was only an intermediate file
+            if export_format == "PDF" and os.path.exists(odt_path):
+                os.remove(odt_path)
+            raise
+        except Exception as e:
+            print(f"Error converting to PDF: {e}")
+            reporter.stage("PDF conversion", "Failed")
+            show_message("showwarning", "PDF Conversion", f"PDF could not be created: {e}\nODT has been saved.")
+
+    publish_report_files({odt_path: final_odt_path, pdf_path: final_pdf_path})
+    odt_path, pdf_path = final_odt_path, final_pdf_path
+
+    # Success message
+    if export_format == "PDF":
+        return f"Report created:\n{pdf_path}"
+    elif export_format == "ODT":
+        return f"Report created:\n{odt_path}"
+    else:
+        return f"Reports created:\n{pdf_path}\n{odt_path}"
+
+
+# Batch mode: answers the wizard would ask for, with the choices of each dialog
+BATCH_ANSWER_CHOICES = {
+    'measurement_type': ["IOS", "Statik", "Gehen", "Laufen"],
+    'gender': ["Male", "Female"],
+    'academic_title': ["Prof Dr.", "Dr.", "None"],
+    'sim_performed': ["Ja", "Nein"],
+    'isg_right': ["Frei", "blockiert"],
+    'isg_left': ["Frei", "blockiert"],
+    'leg_length_selected': ["Ja", "Nein"],
+    'strength_test_type': list(DEFAULT_SCREENSHOT_LAYOUT['kraft']['layouts']),
+    'export_format': ["PDF", "ODT", "BOTH"],
+}
+
+# Answers that may be left out of the answers file (the preselected option of the dialog)
+BATCH_ANSWER_DEFAULTS = {
+    'academic_title': "None",
+    'markers': [],
+    'sim_performed': "Nein",
+    'isg_right': "Frei",
+    'isg_left': "Frei",
+    'leg_length_selected': "Nein",
+    'strength_test_type': "Torso + legs",
+    'pelvic_drop': None,
+    'leg_length_texts': [],
+    'beinachsen_texts': [],
+    'ganganalyse_texts': [],
+    'therapie_texts': [],
+    'export_format': "PDF",
+}
+
+
+def load_batch_answers(answers_path):
+    """
+    Load the answers file of a batch run (.json, or .yaml/.yml if PyYAML is installed).
+    Top-level keys are the wizard answers for all folders; an optional "folders" mapping of
+    folder name (or path) to answers overrides them for single folders, e.g. their texts.
+    """
+    with open(answers_path, 'r', encoding='utf-8') as f:
+        if answers_path.lower().endswith(('.yaml', '.yml')):
             try:
-                # Find LibreOffice executable
-                libreoffice_path = find_libreoffice()
-                if libreoffice_path is None:
-                    raise FileNotFoundError(
-                        "LibreOffice not found. Please install LibreOffice from https://www.libreoffice.org/download/download/"
-                    )
+                import yaml
+            except ImportError:
+                raise RuntimeError("YAML answers files need PyYAML (pip install pyyaml), or use JSON")
+            answers = yaml.safe_load(f)
+        else:
+            answers = json.load(f)
+    if not isinstance(answers, dict):
+        raise ValueError(f"{answers_path}: expected a mapping of answers")
+    return answers
+
+
+def batch_answers_for_folder(answers, folder_path):
+    """Return the answers for one folder: defaults, then the common answers, then the folder's own overrides"""
+    folder_answers = dict(BATCH_ANSWER_DEFAULTS)
+    folder_answers.update({key: value for key, value in answers.items() if key != 'folders'})
+    overrides = answers.get('folders') or {}
+    for name in (os.path.basename(os.path.normpath(folder_path)), folder_path):
+        if name in overrides:
+            folder_answers.update(overrides[name])
+            break
 
-                # Use LibreOffice to convert ODT to PDF
-                subprocess.run([
-                    libreoffice_path, "--headless", "--convert-to", "pdf",
-                    "--outdir", os.path.dirname(pdf_path) or ".",
-                    odt_path
-                ], check=True)
-
-                # Rename if needed (LibreOffice uses original filename)
-                converted_pdf = os.path.join(
-                    os.path.dirname(pdf_path) or ".",
-                    os.path.basename(odt_path).replace(".odt", ".pdf")
-                )
-                if converted_pdf != pdf_path and os.path.exists(converted_pdf):
-                    os.rename(converted_pdf, pdf_path)
+    for key in ('measurement_type', 'report_creator', 'gender'):
+        if not folder_answers.get(key):
+            raise ValueError(f"Answer '{key}' is missing")
+    for key, choices in BATCH_ANSWER_CHOICES.items():
+        if folder_answers[key] not in choices:
+            raise ValueError(f"Invalid answer {key}={folder_answers[key]!r}, expected one of {choices}")
+    return folder_answers
 
-                print(f"PDF created: {pdf_path}")
 
-                # Remove ODT if only PDF was requested
-                if export_format == "PDF" and os.path.exists(odt_path):
-                    os.remove(odt_path)
-                    print(f"Removed temporary ODT: {odt_path}")
-            except Exception as e:
-                print(f"Error converting to PDF: {e}")
-                messagebox.showwarning("PDF Conversion", f"PDF could not be created: {e}\nODT has been saved.")
-
-        # Show success message
-        if export_format == "PDF":
-            messagebox.showinfo("Success", f"Report created:\n{pdf_path}")
-        elif export_format == "ODT":
-            messagebox.showinfo("Success", f"Report created:\n{odt_path}")
+def preflight_batch(folder_paths, answers, issues_by_folder=None):
+    """
+    Run the folder preflight for every folder of a batch and print one report. Folders are checked in
+    parallel threads (with the pdfium backend their PDF page counts are still read one at a time).
+    The issues of every checked folder are stored in issues_by_folder if a dict is given, so the
+    batch workers do not check the folders again.
+    Returns {folder_path: error message} for the folders no report can be created for.
+    """
+    def check(folder_path):
+        folder_answers = batch_answers_for_folder(answers, folder_path)
+        measurement_type = folder_answers['measurement_type']
+        strength_test_type = folder_answers['strength_test_type'] if measurement_type != "IOS" else "Torso + legs"
+        try:
+            return preflight_measurement_folder(folder_path, measurement_type, strength_test_type,
+                                                folder_answers['leg_length_selected'],
+                                                scan_measurement_folder(folder_path))
+        finally:
+            # The reports are built in worker processes, do not keep the folder's PDFs open here
+            close_pdf_documents(folder_path)
+
+    failed = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(8, len(folder_paths)))) as executor:
+        futures = {folder_path: executor.submit(check, folder_path) for folder_path in folder_paths}
+    for folder_path, future in futures.items():
+        try:
+            issues = future.result()
+        except Exception as e:
+            failed[folder_path] = f"Folder check failed: {e}"
+            print(f"{folder_path}:\n  • {e}")
+            continue
+        if issues_by_folder is not None:
+            issues_by_folder[folder_path] = issues
+        if issues:
+            print(f"{folder_path}:\n{format_preflight_issues(issues)}")
+        if any(issue['blocking'] for issue in issues):
+            failed[folder_path] = "Folder check failed: " + "; ".join(
+                f"{issue['file']} {issue['message']}" for issue in issues if issue['blocking'])
+    print(f"Folder check: {len(folder_paths) - len(failed)} of {len(folder_paths)} folders can be used")
+    return failed
+
+
+def prepare_batch_report(folder_path, answers, preflight_issues=None):
+    """
+    Collect the report data for one measurement folder without dialogs (steps 0-17 of the wizard).
+    preflight_issues are the issues preflight_batch found for the folder; without them it is checked here.
+    Raises ValueError if a required file or value is missing.
+    """
+    folder_answers = batch_answers_for_folder(answers, folder_path)
+    measurement_type = folder_answers['measurement_type']
+
+    markers = folder_answers['markers'] or []
+    if isinstance(markers, list):
+        # List of selected marker keys, e.g. ["dl_dr", "ws"]
+        markers = {key: key in markers for key in ('dl_dr', 'ws', 'vp', 'keine')}
+
+    data = {
+        'measurement_type': measurement_type,
+        'report_creator': folder_answers['report_creator'],
+        'gender': folder_answers['gender'],
+        'academic_title': folder_answers['academic_title'],
+        'markers': markers,
+        'sim_performed': folder_answers['sim_performed'],
+        'isg_right': folder_answers['isg_right'] if folder_answers['sim_performed'] == "Ja" else None,
+        'isg_left': folder_answers['isg_left'] if folder_answers['sim_performed'] == "Ja" else None,
+        'leg_length_selected': folder_answers['leg_length_selected'],
+        'strength_test_type': folder_answers['strength_test_type'] if measurement_type != "IOS" else "Torso + legs",
+        'folder_path': folder_path,
+        'leg_length_texts': folder_answers['leg_length_texts'] if folder_answers['leg_length_selected'] == "Ja" else None,
+        'beinachsen_texts': folder_answers['beinachsen_texts'],
+        'ganganalyse_texts': folder_answers['ganganalyse_texts'] if measurement_type in ["Gehen", "Laufen"] else None,
+        'therapie_texts': folder_answers['therapie_texts'],
+        'export_format': folder_answers['export_format'],
+        'pelvic_drop_sentence': None,
+    }
+
+    manifest = scan_measurement_folder(folder_path)
+    issues = preflight_issues
+    if issues is None:
+        issues = preflight_measurement_folder(folder_path, measurement_type, data['strength_test_type'],
+                                              data['leg_length_selected'], manifest)
+    if any(issue['blocking'] for issue in issues):
+        raise ValueError("Folder check failed: " + "; ".join(f"{issue['file']} {issue['message']}"
+                                                             for issue in issues if issue['blocking']))
+    for issue in issues:
+        print(f"Warning ({folder_path}): {issue['file']} {issue['message']}")
+    # Other workers may be reading their staged folders, run_batch evicts before and after the run
+    manifest = stage_measurement_folder(folder_path, manifest, evict=False)
+    if manifest.folder_path != folder_path:
+        data['work_folder'] = manifest.folder_path
+    data['ini_path'] = manifest.path("4d average ini")
+    pdf_path = manifest.path("average pdf")
+    data['average_pdf_path'] = pdf_path
+
+    patient_name, patient_dob, measurement_date = extract_patient_info_from_pdf(pdf_path)
+    if not (patient_name and patient_dob and measurement_date):
+        raise ValueError(f"Could not extract patient name, date of birth and measurement date from {pdf_path}")
+    data['patient_name'] = patient_name
+    data['patient_dob'] = patient_dob
+    data['measurement_date'] = measurement_date
+
+    if measurement_type in ["Gehen", "Laufen"]:
+        pelvic_drop = folder_answers['pelvic_drop']
+        if pelvic_drop:
+            # Custom values as entered in CustomPelvicDropInputDialog
+            data['pelvic_drop_sentence'] = generate_pelvic_drop_sentence_from_custom(
+                float(pelvic_drop['right']), float(pelvic_drop['left']))
         else:
-            messagebox.showinfo("Success", f"Reports created:\n{pdf_path}\n{odt_path}")
+            motion_ini_path = manifest.path("4d motion ini")
+            if motion_ini_path:
+                beckenhochstand = read_ini_record(data['ini_path'], "4d average").beckenhochstand
+                motion_mean, motion_min, motion_max = parse_motion_ini_file(motion_ini_path)
+                if beckenhochstand is not None:
+                    data['pelvic_drop_sentence'] = calculate_pelvic_drop_sentence(
+                        beckenhochstand, motion_mean, motion_min, motion_max)
 
-        # Clean up temporary screenshot files
-        if screenshot_path and os.path.exists(screenshot_path):
-            try:
-                os.remove(screenshot_path)
-                print(f"Cleaned up temporary file: {screenshot_path}")
-            except:
-                pass
+    data['save_path'] = report_save_path(folder_path, patient_name, data['export_format'])
+    return data
 
-        # Clean up statik screenshot files
-        for i, screenshot_file in enumerate(statik_screenshots, 1):
-            if screenshot_file and os.path.exists(screenshot_file):
-                try:
-                    os.remove(screenshot_file)
-                    print(f"Cleaned up statik screenshot {i}: {screenshot_file}")
-                except:
-                    pass
 
-        # Clean up gehen screenshot files
-        for i, screenshot_file in enumerate(gehen_screenshots, 1):
-            if screenshot_file and os.path.exists(screenshot_file):
-                try:
-                    os.remove(screenshot_file)
-                    print(f"Cleaned up gehen screenshot {i}: {screenshot_file}")
-                except:
-                    pass
+def build_batch_report(folder_path, answers, preflight_issues=None):
+    """
+    Crop the screenshots and write the ODT for one folder of a batch run (runs in a worker process).
+    Returns (odt_path, pdf_path, export_format, trace spans, targets); the PDF conversion, publishing
+    the files of targets ({local path: final path}, for staged folders) with publish_report_files
+    and writing the timing log are left to the caller.
+    """
+    trace = start_trace("report")
+    try:
+        data = prepare_batch_report(folder_path, answers, preflight_issues)
+        measurement_type = data['measurement_type']
+        pdf_path = data['average_pdf_path']
+        tasks = plan_screenshot_tasks(data.get('work_folder', folder_path), pdf_path, measurement_type,
+                                      data['strength_test_type'], data['leg_length_selected'])
+        pages_by_pdf = collect_render_pages(tasks)
+        # The folders already run in parallel, so the PDFs of one folder share a renderer in this process
+        data.update(extract_screenshots(tasks, pages_by_pdf, max_workers=1))
+        try:
+            if not data['screenshot_path']:
+                raise RuntimeError("Failed to crop screenshot from PDF")
+            summarize_screenshot_encoding(data)
+            final_odt_path, final_pdf_path = report_file_paths(data['export_format'], data['save_path'])
+            # Staged folders get their report written locally first
+            odt_path = staging_output_path(data, final_odt_path)
+            report_pdf_path = staging_output_path(data, final_pdf_path)
+            for warning in create_report_from_data(data, odt_path):
+                print(f"Warning ({folder_path}): {warning}")
+        finally:
+            release_screenshots(data)
+        targets = {path: final_path for path, final_path in ((odt_path, final_odt_path),
+                                                             (report_pdf_path, final_pdf_path))
+                   if path != final_path}
+        if data['export_format'] == "ODT":
+            publish_report_files(targets)
+            odt_path, targets = final_odt_path, {}
+    finally:
+        close_pdf_documents()
+        finish_trace(trace, write=False)
+    return odt_path, report_pdf_path, data['export_format'], (trace.spans if trace is not None else []), targets
+
+
+def run_batch(folder_paths, answers, max_workers=None):
+    """
+    Generate the reports of several measurement folders without the wizard.
+    All folders are checked first (see preflight_batch); folders that fail the check are skipped.
+    Folders are processed in parallel worker processes (max_workers defaults to the "batch_workers"
+    setting, else the number of CPU cores); the ODTs are converted to PDF on the converter pool
+    while the remaining folders are still being built.
+    Returns dict {folder_path: error message or None}.
+    """
+    set_headless()
+    # Check all folders up front so unusable ones do not take a worker; the workers reuse the results
+    preflight_issues = {}
+    errors = preflight_batch(folder_paths, answers, preflight_issues)
+    for folder_path, error in errors.items():
+        print(f"FAILED {folder_path}: {error}")
+    folder_paths = [folder_path for folder_path in folder_paths if folder_path not in errors]
+    if not folder_paths:
+        return errors
+    # Staged folders are only evicted here in the parent, never while a worker may be reading one
+    evict_staging()
+
+    if max_workers is None:
+        max_workers = get_setting("batch_workers") or os.cpu_count() or 1
+    max_workers = limit_render_processes(max(1, min(int(max_workers), len(folder_paths))))
+
+    conversions = []
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=init_render_worker,
+                             initargs=(max_workers, True)) as executor:
+        futures = {executor.submit(build_batch_report, folder_path, answers, preflight_issues.get(folder_path)):
+                   folder_path for folder_path in folder_paths}
+        for future in as_completed(futures):
+            folder_path = futures[future]
+            try:
+                odt_path, pdf_path, export_format, spans, targets = future.result()
+            except Exception as e:
+                print(f"FAILED {folder_path}: {e}")
+                errors[folder_path] = str(e)
+                continue
+            errors[folder_path] = None
+            # Timing log of the folder: the spans of its worker plus the PDF conversion done here
+            trace = None
+            if spans:
+                trace = RunTrace("report")
+                trace.info.update({'folder_path': folder_path, 'export_format': export_format,
+                                   'save_path': targets.get(pdf_path or odt_path, pdf_path or odt_path)})
+                trace.extend(spans)
+            if export_format == "ODT":
+                print(f"Report created: {odt_path}")
+                finish_trace(trace)
+                continue
+            converter_pool = get_converter_pool()
+            if converter_pool is None:
+                errors[folder_path] = "LibreOffice not found, ODT has been saved"
+                print(f"FAILED {folder_path}: {errors[folder_path]}")
+                publish_report_files(targets)
+                finish_trace(trace)
+                continue
+            conversions.append((folder_path, odt_path, pdf_path, export_format, trace, targets,
+                                converter_pool.submit(odt_path, pdf_path, trace=trace)))
 
-        # Clean up kraft screenshot files
-        for i, screenshot_file in enumerate(kraft_screenshots, 1):
-            if screenshot_file and os.path.exists(screenshot_file):
-                try:
-                    os.remove(screenshot_file)
-                    print(f"Cleaned up kraft screenshot {i}: {screenshot_file}")
-                except:
-                    pass
-    except Exception as e:
-        messagebox.showerror("Error", f"An error occurred: {e}")
+    for folder_path, odt_path, pdf_path, export_format, trace, targets, future in conversions:
+        try:
+            future.result()
+        except Exception as e:
+            errors[folder_path] = f"PDF could not be created: {e}, ODT has been saved"
+            print(f"FAILED {folder_path}: {errors[folder_path]}")
+            publish_report_files(targets)
+            finish_trace(trace)
+            continue
+        if export_format == "PDF" and os.path.exists(odt_path):
+            os.remove(odt_path)
+        publish_report_files(targets)
+        finish_trace(trace)
+        print(f"Report created: {targets.get(pdf_path, pdf_path)}")
+    evict_staging()
+    return errors
+
+
+def batch_main(argv):
+    """Command line entry point: report_generator_v1.py --answers answers.json FOLDER [FOLDER ...]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Generate Motionlab reports for measurement folders without the wizard")
+    parser.add_argument("folders", nargs="+", help="measurement folders")
+    parser.add_argument("--answers", required=True,
+                        help="JSON (or YAML) file with the wizard answers, see load_batch_answers")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of folders processed in parallel (default: number of CPU cores)")
+    parser.add_argument("--check", action="store_true",
+                        help="only check the folders (files, page counts, INI lines), create no reports")
+    args = parser.parse_args(argv)
+
+    answers = load_batch_answers(args.answers)
+    if args.check:
+        return 1 if preflight_batch(args.folders, answers) else 0
+    errors = run_batch(args.folders, answers, args.workers)
+    failed = [folder_path for folder_path, error in errors.items() if error]
+    print(f"\n{len(errors) - len(failed)} of {len(errors)} reports created")
+    for folder_path in failed:
+        print(f"  {folder_path}: {errors[folder_path]}")
+    return 1 if failed else 0
 
 
 # Main application
+# Tk root window, created by run_gui(); the dialogs and the wizard need it
+root = None
+
 # Color scheme from logo
 COLOR_TURQUOISE = "#80afaa"
 COLOR_BROWN = "#afa190"
@@ -4411,67 +7402,68 @@ def show_needed_files_dialog():
     canvas.create_window((0, 0), window=scrollable_frame, anchor="nw")
     canvas.configure(yscrollcommand=scrollbar.set)
 
-    # File requirements data
-    file_requirements = {
-        "IOS": [
-            "4d_average.pdf  (fallback: statik.pdf)",
-            "statik.pdf",
-            "ios.pdf",
-            ".ini file containing '4D average'",
-            "vgl.pdf  (optional - for leg length examination)"
-        ],
-        "Statik": [
-            "4d_average.pdf  (fallback: statik.pdf)",
-            "statik.pdf",
-            "ios.pdf",
-            "kraft.pdf",
-            ".ini file containing '4D average'",
-            "vgl.pdf  (optional - for leg length examination)"
-        ],
-        "Walking (Gehen)": [
-            "4d_average.pdf  (fallback: statik.pdf)",
-            "statik.pdf",
-            "gehen.pdf",
-            "kraft.pdf",
-            ".ini file containing '4D average'",
-            ".ini file containing '4D motion'",
-            "vgl.pdf  (optional - for leg length examination)"
-        ],
-        "Running (Laufen)": [
-            "4d_average.pdf  (fallback: statik.pdf)",
-            "statik.pdf",
-            "hp.pdf",
-            "ios.pdf",
-            "kraft.pdf",
-            ".ini file containing '4D average'",
-            ".ini file containing '4D motion'",
-            "vgl.pdf  (optional - for leg length examination)"
-        ]
-    }
-
-    for report_type, files in file_requirements.items():
-        # Report type header
-        type_label = tk.Label(
-            scrollable_frame,
-            text=report_type,
-            font=("Helvetica", 12, "bold"),
-            fg=COLOR_BROWN,
-            bg=COLOR_BG,
-            anchor="w"
-        )
-        type_label.pack(fill="x", pady=(10, 5))
+    # File requirements from the screenshot layout spec, per report type
+    report_types = [("IOS", "IOS"), ("Statik", "Statik"), ("Walking (Gehen)", "Gehen"), ("Running (Laufen)", "Laufen")]
+    file_requirements = {title: needed_folder_files(measurement_type) for title, measurement_type in report_types}
 
-        # File list
-        for file_name in files:
-            file_label = tk.Label(
+    def fill_requirements(manifest=None):
+        """List the files of each report type, marked as found or missing if a folder has been checked"""
+        for child in scrollable_frame.winfo_children():
+            child.destroy()
+        if manifest is not None:
+            tk.Label(
                 scrollable_frame,
-                text=f"  • {file_name}",
-                font=("Helvetica", 10),
+                text=f"Checked folder: {manifest.folder_path}",
+                font=("Helvetica", 9),
                 fg=COLOR_TEXT,
                 bg=COLOR_BG,
+                anchor="w",
+                wraplength=480,
+                justify="left"
+            ).pack(fill="x", pady=(0, 5))
+
+        for report_type, files in file_requirements.items():
+            # Report type header
+            type_label = tk.Label(
+                scrollable_frame,
+                text=report_type,
+                font=("Helvetica", 12, "bold"),
+                fg=COLOR_BROWN,
+                bg=COLOR_BG,
                 anchor="w"
             )
-            file_label.pack(fill="x", padx=(10, 0))
+            type_label.pack(fill="x", pady=(10, 5))
+
+            # File list
+            for item in files:
+                marker, color = "•", COLOR_TEXT
+                if manifest is not None:
+                    if manifest.find(item['role']) is not None:
+                        marker, color = "✓", COLOR_GREEN
+                    elif item['required']:
+                        marker, color = "✗", COLOR_RED
+                    else:
+                        marker = "–"
+                file_label = tk.Label(
+                    scrollable_frame,
+                    text=f"  {marker} {item['label']}",
+                    font=("Helvetica", 10),
+                    fg=color,
+                    bg=COLOR_BG,
+                    anchor="w"
+                )
+                file_label.pack(fill="x", padx=(10, 0))
+
+    def check_folder():
+        folder_path = filedialog.askdirectory(parent=dialog, title="Select measurement folder to check")
+        if not folder_path:
+            return
+        try:
+            fill_requirements(scan_measurement_folder(folder_path))
+        except OSError as e:
+            messagebox.showerror("Error", f"Could not read the folder {folder_path}:\n{e}", parent=dialog)
+
+    fill_requirements()
 
     canvas.pack(side="left", fill="both", expand=True)
     scrollbar.pack(side="right", fill="y")
@@ -4493,9 +7485,28 @@ def show_needed_files_dialog():
         canvas.unbind_all("<Button-5>")
     dialog.bind("<Destroy>", _on_destroy)
 
+    button_frame = tk.Frame(dialog, bg=COLOR_BG)
+    button_frame.pack(pady=15)
+
+    # Check button: mark which files a measurement folder has
+    check_btn = tk.Button(
+        button_frame,
+        text="Check Folder...",
+        command=check_folder,
+        font=("Helvetica", 10),
+        width=14,
+        bg=COLOR_TURQUOISE,
+        fg=COLOR_TEXT,
+        activebackground=COLOR_BROWN,
+        activeforeground=COLOR_TEXT,
+        relief=tk.FLAT,
+        cursor="hand2"
+    )
+    check_btn.pack(side=tk.LEFT, padx=5)
+
     # Close button
     close_btn = tk.Button(
-        dialog,
+        button_frame,
         text="Close",
         command=dialog.destroy,
         font=("Helvetica", 10),
@@ -4507,7 +7518,7 @@ def show_needed_files_dialog():
         relief=tk.FLAT,
         cursor="hand2"
     )
-    close_btn.pack(pady=15)
+    close_btn.pack(side=tk.LEFT, padx=5)
 
 
 def show_release_notes():
@@ -4627,172 +7638,188 @@ def show_release_notes():
     close_btn.pack(pady=20)
 
 
-root = tk.Tk()
-root.title("Motionlab Report Creator")
-
-# Set window size and center on screen
-window_width = 550
-window_height = 580
-screen_width = root.winfo_screenwidth()
-screen_height = root.winfo_screenheight()
-center_x = int((screen_width - window_width) / 2)
-center_y = int((screen_height - window_height) / 2)
-root.geometry(f"{window_width}x{window_height}+{center_x}+{center_y}")
-root.configure(bg=COLOR_BG)
-root.resizable(True, True)
-root.minsize(400, 450)
-
-# Main container frame
-main_frame = tk.Frame(root, bg=COLOR_BG)
-main_frame.pack(fill=tk.BOTH, expand=True, padx=30, pady=20)
-
-# Header section with title
-header_frame = tk.Frame(main_frame, bg=COLOR_BG)
-header_frame.pack(fill=tk.X, pady=(0, 20))
-
-title_label = tk.Label(
-    header_frame,
-    text="Motionlab Report Creator",
-    font=("Helvetica", 22, "bold"),
-    fg=COLOR_TEXT,
-    bg=COLOR_BG
-)
-title_label.pack()
-
-# Subtitle/Version
-version_label = tk.Label(
-    header_frame,
-    text="Version 1.5",
-    font=("Helvetica", 10),
-    fg=COLOR_BROWN,
-    bg=COLOR_BG
-)
-version_label.pack(pady=(5, 0))
-
-# Separator line (left teal, right brown)
-sep_frame = tk.Frame(main_frame, bg=COLOR_BG, height=2)
-sep_frame.pack(fill=tk.X, pady=(0, 30))
-tk.Frame(sep_frame, bg=COLOR_TURQUOISE, height=2, width=1).pack(side=tk.LEFT, fill=tk.X, expand=True)
-tk.Frame(sep_frame, bg=COLOR_BROWN, height=2, width=1).pack(side=tk.RIGHT, fill=tk.X, expand=True)
-
-# Description
-desc_label = tk.Label(
-    main_frame,
-    text='Press "Create Report" to start analysis',
-    font=("Helvetica", 11),
-    fg=COLOR_TEXT,
-    bg=COLOR_BG
-)
-desc_label.pack(pady=(0, 30))
-
-# Buttons frame
-button_frame = tk.Frame(main_frame, bg=COLOR_BG)
-button_frame.pack(fill=tk.X, pady=10)
-
-# Style for buttons
-button_style = {
-    "font": ("Helvetica", 11),
-    "width": 20,
-    "height": 2,
-    "cursor": "hand2",
-    "relief": tk.FLAT,
-    "bd": 0
-}
+def run_gui():
+    """Create the main window and run the Tk main loop"""
+    global root
+
+    root = tk.Tk()
+    root.title("Motionlab Report Creator")
+
+    # Set window size and center on screen
+    window_width = 550
+    window_height = 580
+    screen_width = root.winfo_screenwidth()
+    screen_height = root.winfo_screenheight()
+    center_x = int((screen_width - window_width) / 2)
+    center_y = int((screen_height - window_height) / 2)
+    root.geometry(f"{window_width}x{window_height}+{center_x}+{center_y}")
+    root.configure(bg=COLOR_BG)
+    root.resizable(True, True)
+    root.minsize(400, 450)
+
+    # Main container frame
+    main_frame = tk.Frame(root, bg=COLOR_BG)
+    main_frame.pack(fill=tk.BOTH, expand=True, padx=30, pady=20)
+
+    # Header section with title
+    header_frame = tk.Frame(main_frame, bg=COLOR_BG)
+    header_frame.pack(fill=tk.X, pady=(0, 20))
+
+    title_label = tk.Label(
+        header_frame,
+        text="Motionlab Report Creator",
+        font=("Helvetica", 22, "bold"),
+        fg=COLOR_TEXT,
+        bg=COLOR_BG
+    )
+    title_label.pack()
+
+    # Subtitle/Version
+    version_label = tk.Label(
+        header_frame,
+        text="Version 1.5",
+        font=("Helvetica", 10),
+        fg=COLOR_BROWN,
+        bg=COLOR_BG
+    )
+    version_label.pack(pady=(5, 0))
+
+    # Separator line (left teal, right brown)
+    sep_frame = tk.Frame(main_frame, bg=COLOR_BG, height=2)
+    sep_frame.pack(fill=tk.X, pady=(0, 30))
+    tk.Frame(sep_frame, bg=COLOR_TURQUOISE, height=2, width=1).pack(side=tk.LEFT, fill=tk.X, expand=True)
+    tk.Frame(sep_frame, bg=COLOR_BROWN, height=2, width=1).pack(side=tk.RIGHT, fill=tk.X, expand=True)
+
+    # Description
+    desc_label = tk.Label(
+        main_frame,
+        text='Press "Create Report" to start analysis',
+        font=("Helvetica", 11),
+        fg=COLOR_TEXT,
+        bg=COLOR_BG
+    )
+    desc_label.pack(pady=(0, 30))
+
+    # Buttons frame
+    button_frame = tk.Frame(main_frame, bg=COLOR_BG)
+    button_frame.pack(fill=tk.X, pady=10)
+
+    # Style for buttons
+    button_style = {
+        "font": ("Helvetica", 11),
+        "width": 20,
+        "height": 2,
+        "cursor": "hand2",
+        "relief": tk.FLAT,
+        "bd": 0
+    }
+
+    # Create Report button (primary - turquoise)
+    create_btn = tk.Button(
+        button_frame,
+        text="Create Report",
+        command=generate_report,
+        bg=COLOR_TURQUOISE,
+        fg=COLOR_WHITE,
+        activebackground="#6d9994",
+        activeforeground=COLOR_WHITE,
+        **button_style
+    )
+    create_btn.pack(pady=8)
+
+    # Coordinate Finder button (secondary - brown)
+    coord_btn = tk.Button(
+        button_frame,
+        text="Coordinate Finder",
+        command=find_coordinates,
+        bg=COLOR_BROWN,
+        fg=COLOR_WHITE,
+        activebackground="#9e9180",
+        activeforeground=COLOR_WHITE,
+        **button_style
+    )
+    coord_btn.pack(pady=8)
+
+    # Needed Files button (info - lighter style)
+    files_btn = tk.Button(
+        button_frame,
+        text="Needed Files for each Report Type",
+        command=show_needed_files_dialog,
+        bg=COLOR_WHITE,
+        fg=COLOR_TEXT,
+        activebackground=COLOR_BG,
+        activeforeground=COLOR_TEXT,
+        font=("Helvetica", 10),
+        width=28,
+        height=2,
+        cursor="hand2",
+        relief=tk.SOLID,
+        bd=1
+    )
+    files_btn.pack(pady=8)
+
+    # Release Notes button
+    release_btn = tk.Button(
+        button_frame,
+        text="Release Notes",
+        command=show_release_notes,
+        bg=COLOR_WHITE,
+        fg=COLOR_TEXT,
+        activebackground=COLOR_BG,
+        activeforeground=COLOR_TEXT,
+        font=("Helvetica", 10),
+        width=28,
+        height=2,
+        cursor="hand2",
+        relief=tk.SOLID,
+        bd=1
+    )
+    release_btn.pack(pady=8)
+
+    # Footer with developer credit
+    footer_frame = tk.Frame(main_frame, bg=COLOR_BG)
+    footer_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(20, 0))
+
+    footer_separator = tk.Frame(footer_frame, height=1, bg=COLOR_BROWN)
+    footer_separator.pack(fill=tk.X, pady=(0, 10))
+
+    developer_label = tk.Label(
+        footer_frame,
+        text="Developed by Carlo Lade",
+        font=("Helvetica", 9),
+        fg=COLOR_BROWN,
+        bg=COLOR_BG
+    )
+    developer_label.pack()
+
+    # Clinic name with colored O's
+    clinic_frame = tk.Frame(footer_frame, bg=COLOR_BG)
+    clinic_frame.pack(pady=(5, 0))
+
+    # "orthopassion - Privatpraxis für regenerative Orthopädie und Osteopathie"
+    # First 'o' in orthopassion = teal, second 'o' in orthopassion = brown
+    # "Orthopädie und Osteopathie" in brown/tan color to match website
+    clinic_parts = [
+        ("o", COLOR_TURQUOISE), ("rth", COLOR_TEXT), ("o", COLOR_BROWN), ("passion - Privatpraxis für regenerative ", COLOR_TEXT),
+        ("O", COLOR_TURQUOISE), ("rthopädie ", COLOR_TURQUOISE), ("und ", COLOR_TEXT),
+        ("O", COLOR_BROWN), ("steopathie", COLOR_BROWN)
+    ]
+
+    for text, color in clinic_parts:
+        lbl = tk.Label(clinic_frame, text=text, font=("Helvetica", 10), fg=color, bg=COLOR_BG,
+                       borderwidth=0, highlightthickness=0, padx=0, pady=0)
+        lbl.pack(side=tk.LEFT, padx=0, ipadx=0)
+
+    root.after_idle(record_startup_timings, "first window")
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    # Needed for the extraction worker processes in the frozen Windows exe
+    multiprocessing.freeze_support()
+
+    # With command line arguments the reports are generated without the wizard
+    if len(sys.argv) > 1:
+        sys.exit(batch_main(sys.argv[1:]))
 
-# Create Report button (primary - turquoise)
-create_btn = tk.Button(
-    button_frame,
-    text="Create Report",
-    command=generate_report,
-    bg=COLOR_TURQUOISE,
-    fg=COLOR_WHITE,
-    activebackground="#6d9994",
-    activeforeground=COLOR_WHITE,
-    **button_style
-)
-create_btn.pack(pady=8)
-
-# Coordinate Finder button (secondary - brown)
-coord_btn = tk.Button(
-    button_frame,
-    text="Coordinate Finder",
-    command=find_coordinates,
-    bg=COLOR_BROWN,
-    fg=COLOR_WHITE,
-    activebackground="#9e9180",
-    activeforeground=COLOR_WHITE,
-    **button_style
-)
-coord_btn.pack(pady=8)
-
-# Needed Files button (info - lighter style)
-files_btn = tk.Button(
-    button_frame,
-    text="Needed Files for each Report Type",
-    command=show_needed_files_dialog,
-    bg=COLOR_WHITE,
-    fg=COLOR_TEXT,
-    activebackground=COLOR_BG,
-    activeforeground=COLOR_TEXT,
-    font=("Helvetica", 10),
-    width=28,
-    height=2,
-    cursor="hand2",
-    relief=tk.SOLID,
-    bd=1
-)
-files_btn.pack(pady=8)
-
-# Release Notes button
-release_btn = tk.Button(
-    button_frame,
-    text="Release Notes",
-    command=show_release_notes,
-    bg=COLOR_WHITE,
-    fg=COLOR_TEXT,
-    activebackground=COLOR_BG,
-    activeforeground=COLOR_TEXT,
-    font=("Helvetica", 10),
-    width=28,
-    height=2,
-    cursor="hand2",
-    relief=tk.SOLID,
-    bd=1
-)
-release_btn.pack(pady=8)
-
-# Footer with developer credit
-footer_frame = tk.Frame(main_frame, bg=COLOR_BG)
-footer_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(20, 0))
-
-footer_separator = tk.Frame(footer_frame, height=1, bg=COLOR_BROWN)
-footer_separator.pack(fill=tk.X, pady=(0, 10))
-
-developer_label = tk.Label(
-    footer_frame,
-    text="Developed by Carlo Lade",
-    font=("Helvetica", 9),
-    fg=COLOR_BROWN,
-    bg=COLOR_BG
-)
-developer_label.pack()
-
-# Clinic name with colored O's
-clinic_frame = tk.Frame(footer_frame, bg=COLOR_BG)
-clinic_frame.pack(pady=(5, 0))
-
-# "orthopassion - Privatpraxis für regenerative Orthopädie und Osteopathie"
-# First 'o' in orthopassion = teal, second 'o' in orthopassion = brown
-# "Orthopädie und Osteopathie" in brown/tan color to match website
-clinic_parts = [
-    ("o", COLOR_TURQUOISE), ("rth", COLOR_TEXT), ("o", COLOR_BROWN), ("passion - Privatpraxis für regenerative ", COLOR_TEXT),
-    ("O", COLOR_TURQUOISE), ("rthopädie ", COLOR_TURQUOISE), ("und ", COLOR_TEXT),
-    ("O", COLOR_BROWN), ("steopathie", COLOR_BROWN)
-]
-
-for text, color in clinic_parts:
-    lbl = tk.Label(clinic_frame, text=text, font=("Helvetica", 10), fg=color, bg=COLOR_BG,
-                   borderwidth=0, highlightthickness=0, padx=0, pady=0)
-    lbl.pack(side=tk.LEFT, padx=0, ipadx=0)
-
-root.mainloop()
+    run_gui()